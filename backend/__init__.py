@@ -1,24 +1,12 @@
-from .app import create_app
+from typing import Any
 
 __all__ = ["create_app"]
 
 
+def __getattr__(name: str) -> Any:
+  # IMPORTAÇÃO TARDIA: `import backend.<módulo>` NÃO CARREGA A APLICAÇÃO INTEIRA
+  if name == "create_app":
+    from .app import create_app
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    return create_app
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
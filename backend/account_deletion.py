@@ -0,0 +1,269 @@
+"""
+EXCLUSÃO DE CONTAS EM SEGUNDO PLANO E EM LOTES.
+
+EM VEZ DE CARREGAR TODOS OS DADOS DO USUÁRIO NA SESSÃO (CASCADE DO ORM), O JOB
+APAGA CADA TABELA EM LOTES DE ACCOUNT_DELETION_BATCH_SIZE LINHAS, UMA TRANSAÇÃO
+POR LOTE, E GRAVA O PROGRESSO EM account_deletions. A LINHA DO USUÁRIO É A
+ÚLTIMA A SER REMOVIDA. OS LOTES SÃO IDEMPOTENTES: UM JOB INTERROMPIDO PODE SER
+RETOMADO COM `flask process-account-deletions`.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional
+
+from flask import Flask, current_app
+from sqlalchemy import delete, func, insert, or_, select, update
+
+from .cache import cache
+from .extensions import db
+from .models import (
+    AccountDeletion,
+    Board,
+    BoardItem,
+    CareLink,
+    DeletionLog,
+    Entry,
+    Notification,
+    Routine,
+    RoutineStep,
+    Share,
+    ShareRequest,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _deletion_steps(user_id: int) -> list[tuple[str, type, object, tuple]]:
+    """
+    (ETAPA, MODELO, FILTRO, COLUNAS DOS DONOS) NA ORDEM DE EXCLUSÃO: FILHOS ANTES DOS PAIS.
+    CADA REGISTRO REMOVIDO GANHA UM TOMBSTONE POR DONO (VÍNCULOS TÊM DOIS; SHARES, O VIEWER,
+    COMO EM VISIBILITY_MODELS); SEM COLUNAS, O DONO É O PRÓPRIO USUÁRIO. OS TOMBSTONES DO USUÁRIO NÃO SÃO APAGADOS:
+    A SINCRONIZAÇÃO DOS VINCULADOS PRECISA DELES E purge_deletion_log OS EXPIRA.
+    """
+    routine_ids = select(Routine.id).where(Routine.user_id == user_id)
+    board_ids = select(Board.id).where(Board.user_id == user_id)
+    return [
+        ("routine_steps", RoutineStep, RoutineStep.routine_id.in_(routine_ids), ()),
+        ("routines", Routine, Routine.user_id == user_id, ()),
+        ("board_items", BoardItem, BoardItem.board_id.in_(board_ids), ()),
+        ("boards", Board, Board.user_id == user_id, ()),
+        ("entries", Entry, Entry.user_id == user_id, ()),
+        ("notifications", Notification, Notification.user_id == user_id, ()),
+        ("share_requests", ShareRequest, or_(ShareRequest.owner_id == user_id, ShareRequest.viewer_id == user_id), None),
+        ("shares", Share, or_(Share.owner_id == user_id, Share.viewer_id == user_id), (Share.viewer_id,)),
+        (
+            "care_links",
+            CareLink,
+            or_(CareLink.cuidador_id == user_id, CareLink.pessoa_tea_id == user_id),
+            (CareLink.cuidador_id, CareLink.pessoa_tea_id),
+        ),
+    ]
+
+
+def _tombstones(model, rows, user_id: int, owner_columns: Optional[tuple]) -> list[dict]:
+    """LINHAS DE deletion_log PARA UM LOTE (row = (id, *DONOS)); owner_columns=None: SEM TOMBSTONE."""
+    if owner_columns is None:
+        return []
+    now = datetime.utcnow()
+    return [
+        {
+            "table_name": model.__tablename__,
+            "record_id": row[0],
+            "user_id": owner_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for row in rows
+        for owner_id in (set(row[1:]) - {None} if owner_columns else {user_id})
+    ]
+
+
+def _linked_user_ids(user_id: int) -> set[int]:
+    """USUÁRIOS CUJOS CACHES DEPENDEM DOS DADOS DESTA CONTA."""
+    rows = db.session.execute(
+        select(CareLink.cuidador_id, CareLink.pessoa_tea_id).where(
+            or_(CareLink.cuidador_id == user_id, CareLink.pessoa_tea_id == user_id)
+        ).union_all(
+            select(Share.owner_id, Share.viewer_id).where(
+                or_(Share.owner_id == user_id, Share.viewer_id == user_id)
+            )
+        )
+    ).all()
+    return {uid for row in rows for uid in row if uid is not None}
+
+
+def _detach_references(user_id: int) -> None:
+    """
+    ZERA REFERÊNCIAS DE OUTROS USUÁRIOS PARA OS DADOS REMOVIDOS.
+    O BANCO JÁ FAZ ISSO (ON DELETE SET NULL); REPETIR AQUI MANTÉM O RESULTADO
+    EM BANCOS QUE NÃO APLICAM FKs (EX.: SQLITE SEM PRAGMA).
+    """
+    care_link_ids = select(CareLink.id).where(
+        or_(CareLink.cuidador_id == user_id, CareLink.pessoa_tea_id == user_id)
+    )
+    share_ids = select(Share.id).where(or_(Share.owner_id == user_id, Share.viewer_id == user_id))
+    db.session.execute(
+        update(Notification)
+        .where(Notification.care_link_id.in_(care_link_ids))
+        .values(care_link_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    db.session.execute(
+        update(Notification)
+        .where(Notification.share_id.in_(share_ids))
+        .values(share_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    db.session.execute(
+        update(Notification)
+        .where(Notification.remetente_id == user_id)
+        .values(remetente_id=None),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def request_account_deletion(user_id: int) -> AccountDeletion:
+    """CRIA (OU REAPROVEITA) O JOB DE EXCLUSÃO DA CONTA. NÃO INICIA A EXECUÇÃO."""
+    job = (
+        AccountDeletion.query
+        .filter(AccountDeletion.user_id == user_id, AccountDeletion.status.in_(("pending", "running")))
+        .first()
+    )
+    if job is None:
+        job = AccountDeletion(user_id=user_id, status="pending")
+        db.session.add(job)
+        db.session.commit()
+    return job
+
+
+def run_account_deletion(job_id: int, batch_size: Optional[int] = None) -> AccountDeletion:
+    """EXECUTA (OU RETOMA) UM JOB DE EXCLUSÃO, UM LOTE POR TRANSAÇÃO."""
+    batch_size = batch_size or current_app.config.get("ACCOUNT_DELETION_BATCH_SIZE", 500)
+    job = db.session.get(AccountDeletion, job_id)
+    if job is None or job.status == "done":
+        return job
+
+    user_id = job.user_id
+    steps = _deletion_steps(user_id)
+    try:
+        linked_ids = _linked_user_ids(user_id)
+
+        # TOTAL CALCULADO UMA ÚNICA VEZ; AO RETOMAR, O PROGRESSO CONTINUA DE ONDE PAROU
+        if job.status == "pending" or not job.total:
+            job.total = sum(
+                db.session.execute(select(func.count()).select_from(model).where(criterion)).scalar_one()
+                for _, model, criterion, _ in steps
+            ) + 1
+            job.removidos = 0
+        job.status = "running"
+        job.erro = None
+        db.session.commit()
+
+        _detach_references(user_id)
+        db.session.commit()
+
+        for etapa, model, criterion, owner_columns in steps:
+            job.etapa = etapa
+            db.session.commit()
+            rows_query = (
+                select(model.id, *(owner_columns or ()))
+                .where(criterion)
+                .order_by(model.id)
+                .limit(batch_size)
+            )
+            while True:
+                rows = db.session.execute(rows_query).all()
+                if not rows:
+                    break
+                ids = [row[0] for row in rows]
+                # DELETE EM MASSA NÃO PASSA PELO before_flush: TOMBSTONES NA MESMA TRANSAÇÃO DO LOTE
+                tombstones = _tombstones(model, rows, user_id, owner_columns)
+                if tombstones:
+                    db.session.execute(insert(DeletionLog), tombstones)
+                db.session.execute(
+                    delete(model).where(model.id.in_(ids)),
+                    execution_options={"synchronize_session": False},
+                )
+                job.removidos = min(job.removidos + len(ids), job.total)
+                db.session.commit()
+                if len(ids) < batch_size:
+                    break
+
+        job.etapa = "users"
+        db.session.execute(
+            delete(User).where(User.id == user_id),
+            execution_options={"synchronize_session": False},
+        )
+        job.removidos = job.total
+        job.etapa = None
+        job.status = "done"
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        logger.exception("Falha na exclusão da conta %s (job %s)", user_id, job_id)
+        job = db.session.get(AccountDeletion, job_id)
+        job.status = "failed"
+        job.erro = str(exc)
+        db.session.commit()
+        return job
+
+    for uid in linked_ids | {user_id}:
+        for namespace in ("routines", "shares", "care_links", "notifications"):
+            cache.invalidate_pattern(f"{namespace}:user:{uid}")
+    return job
+
+
+def deletion_progress(job: AccountDeletion) -> dict:
+    """REPRESENTAÇÃO DO PROGRESSO PARA A API."""
+    percent = 100 if job.status == "done" else (
+        round(100 * job.removidos / job.total, 1) if job.total else 0
+    )
+    return {
+        "id": job.id,
+        "status": job.status,
+        "etapa": job.etapa,
+        "total": job.total,
+        "removidos": job.removidos,
+        "progresso": percent,
+        "erro": job.erro,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+# ========== EXECUÇÃO EM SEGUNDO PLANO ==========
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = Lock()
+
+
+def _get_executor(workers: int) -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    # UM POOL POR PROCESSO (AS THREADS NÃO SOBREVIVEM A UM FORK)
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="account-deletion")
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _run_in_app_context(app: Flask, job_id: int) -> None:
+    with app.app_context():
+        run_account_deletion(job_id)
+
+
+def start_account_deletion(job: AccountDeletion) -> None:
+    """AGENDA O JOB NO POOL DE SEGUNDO PLANO (OU EXECUTA NA HORA SE ACCOUNT_DELETION_ASYNC=False)."""
+    config = current_app.config
+    if not config.get("ACCOUNT_DELETION_ASYNC", True):
+        run_account_deletion(job.id)
+        return
+    app = current_app._get_current_object()
+    _get_executor(config.get("ACCOUNT_DELETION_WORKERS", 1)).submit(_run_in_app_context, app, job.id)
@@ -1,27 +1,43 @@
 from __future__ import annotations
 
 import logging
+import os
 from typing import Any
 
 from flask import Flask, jsonify
 from flask_cors import CORS
 
+from .commands import init_commands
+from .compression import init_compression
 from .config import Config
-from .extensions import db, jwt, migrate
+from .extensions import db, jwt
+from .json_provider import FastJSONProvider
+from .metrics import init_metrics
+from .profiling import init_profiling
+from .request_timing import init_request_timing
 from .routes import api_bp
-from .seed import init_seed
 
 
 def create_app(config_class: type[Config] = Config) -> Flask:
+  """
+  FÁBRICA DA APLICAÇÃO. NÃO ACESSA O BANCO: O SCHEMA E O USUÁRIO ADMIN SÃO CRIADOS UMA VEZ
+  POR DEPLOY COM `flask db upgrade` E `flask seed` (OU `flask init-db` EM AMBIENTES SEM
+  MIGRAÇÕES, EX.: DEV/SQLITE).
+  """
   app = Flask(__name__)
   app.config.from_object(config_class)
 
   _configure_logging(app)
+  _configure_json(app)
   _register_extensions(app)
+  _register_metrics(app)
+  _register_request_timing(app)
+  _register_profiling(app)
   _register_blueprints(app)
   _register_healthcheck(app)
   _enable_cors(app)
-  _init_seed(app)
+  _register_compression(app)
+  _register_commands(app)
 
   return app
 
@@ -32,10 +48,42 @@ def _configure_logging(app: Flask) -> None:
   logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
 
+def _configure_json(app: Flask) -> None:
+  # ENCODER RÁPIDO (orjson QUANDO INSTALADO) COM SUPORTE NATIVO A datetime
+  app.json = FastJSONProvider(app)
+
+
 def _register_extensions(app: Flask) -> None:
   db.init_app(app)
-  migrate.init_app(app, db)
   jwt.init_app(app)
+  _register_migrations(app)
+
+
+def _register_migrations(app: Flask) -> None:
+  # flask_migrate IMPORTA O ALEMBIC INTEIRO, QUE SÓ É USADO PELOS COMANDOS `flask db`.
+  # WORKERS HTTP (GUNICORN) NÃO PAGAM ESSE CUSTO; O CLI DO FLASK DEFINE FLASK_RUN_FROM_CLI
+  if not (app.config.get("MIGRATIONS_ENABLED") or os.environ.get("FLASK_RUN_FROM_CLI") == "true"):
+    return
+  from flask_migrate import Migrate
+
+  Migrate(app, db)
+
+
+def _register_metrics(app: Flask) -> None:
+  # GET /metrics (PROMETHEUS). PRIMEIRO after_request REGISTRADO = ÚLTIMO A RODAR, ENTÃO A
+  # LATÊNCIA MEDIDA INCLUI OS DEMAIS HOOKS
+  init_metrics(app)
+
+
+def _register_request_timing(app: Flask) -> None:
+  # REGISTRADO ANTES DOS DEMAIS after_request (QUE RODAM EM ORDEM INVERSA), ENTÃO O
+  # Server-Timing INCLUI CORS E COMPRESSÃO
+  init_request_timing(app)
+
+
+def _register_profiling(app: Flask) -> None:
+  # PERFIL DE CPU DE UMA REQUISIÇÃO (ADMIN COM HEADER X-Profile OU PROFILE_USER_IDS)
+  init_profiling(app)
 
 
 def _register_blueprints(app: Flask) -> None:
@@ -62,37 +110,21 @@ def _enable_cors(app: Flask) -> None:
     return response
 
 
+def _register_compression(app: Flask) -> None:
+  # COMPRIMIR RESPOSTAS GRANDES (GZIP / BROTLI / ZSTD) CONFORME Accept-Encoding
+  init_compression(app)
+
+
+def _register_commands(app: Flask) -> None:
+  # CRIAÇÃO DO SCHEMA, SEED E TAREFAS DE MANUTENÇÃO (flask --app backend.app <comando>)
+  init_commands(app)
+
+
 def _register_healthcheck(app: Flask) -> None:
   @app.route("/health")
   def health() -> Any:
     return jsonify({"status": "ok"})
 
 
-def _init_seed(app: Flask) -> None:
-  """INICIALIZA OS SEEDS DO BANCO DE DADOS APÓS O APP SER CRIADO."""
-  with app.app_context():
-    # GARANTIR QUE AS TABELAS EXISTAM ANTES DE EXECUTAR O SEED
-    try:
-      db.create_all()
-      init_seed(app)
-    except Exception as e:
-      logging.warning(f"AVISO: NÃO FOI POSSÍVEL EXECUTAR SEED: {e}")
-
-
-app = create_app()
-
 if __name__ == "__main__":
-  app.run(debug=True)
-
-
-
-
-
-
-
-
-
-
-
-
-
+  create_app().run(debug=True)
@@ -0,0 +1 @@
+"""BENCHMARKS DE DESEMPENHO DO BACKEND. EXECUTE CADA MÓDULO COM `python -m backend.benchmarks.<nome>`."""
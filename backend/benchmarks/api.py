@@ -0,0 +1,365 @@
+"""
+BENCHMARK PONTA A PONTA DA API COM FLUXOS REALISTAS DE CLIENTES.
+
+USO:
+    python -m backend.benchmarks.api [--db bench.db] [--clients 6] [--rounds 5] [--threads 4]
+                                     [--json resultado.json] [--baseline base.json] [--max-regression 20]
+
+SOBE create_app(TestConfig) COM UM BANCO SQLITE EM ARQUIVO. SEM --db, UM BANCO
+TEMPORÁRIO É POPULADO COM O GERADOR SINTÉTICO (backend.synthetic, MESMA SEMENTE =
+MESMOS DADOS); COM --db, USA UM BANCO JÁ POPULADO POR `flask seed-synthetic`
+(O BENCHMARK CRIA REGISTROS NO DIÁRIO: USE UMA CÓPIA).
+
+CADA RODADA, --clients USUÁRIOS DE CADA PERFIL EXECUTAM UMA SESSÃO EM PARALELO
+(--threads):
+- PESSOA COM TEA: LOGIN, CARGA INICIAL DO APP, NOVO REGISTRO E RELATÓRIO SEMANAL;
+- CUIDADOR: O MESMO, MAIS DIÁRIO E RELATÓRIO DE CADA PESSOA VINCULADA;
+- PROFISSIONAL: LOGIN E PAINEL (SHARES, DIÁRIO DOS PACIENTES, NOTIFICAÇÕES).
+
+O RESULTADO TRAZ VAZÃO E p50/p95/p99 POR ENDPOINT, E A MÉDIA DE CONSULTAS SQL
+(LIDA DO HEADER Server-Timing). --json GRAVA O RESULTADO COMO BASELINE;
+--baseline COMPARA COM UMA EXECUÇÃO ANTERIOR E, COM --max-regression, TERMINA
+COM CÓDIGO 1 SE O p95 DE ALGUM ENDPOINT PIORAR MAIS QUE O PERCENTUAL INFORMADO.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from ..app import create_app
+from ..config import TestConfig
+from ..extensions import db
+from ..models import Entry, User
+from ..synthetic import generate_synthetic_dataset
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def _make_config(db_path: Path) -> type[TestConfig]:
+    class BenchConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        # A LATÊNCIA JÁ APARECE NO RELATÓRIO; O LOG DE LENTIDÃO SÓ POLUIRIA A SAÍDA
+        SLOW_REQUEST_MS = float("inf")
+        SLOW_QUERY_MS = float("inf")
+
+    return BenchConfig
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """PERCENTIL PELO POSTO MAIS PRÓXIMO (sorted_values JÁ ORDENADO E NÃO VAZIO)."""
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """ACUMULA LATÊNCIA, ERROS E CONSULTAS SQL POR ENDPOINT (MÉTODO + REGRA DA URL)."""
+
+    def __init__(self, app):
+        self._adapter = app.url_map.bind("localhost")
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.queries: dict[str, list[int]] = defaultdict(list)
+
+    def label(self, method: str, path: str) -> str:
+        try:
+            rule, _ = self._adapter.match(path.split("?", 1)[0], method, return_rule=True)
+            return f"{method} {rule.rule}"
+        except Exception:
+            return f"{method} {path}"
+
+    def request(self, client, method: str, path: str, **kwargs):
+        start = time.perf_counter()
+        response = client.open(path, method=method, **kwargs)
+        elapsed = time.perf_counter() - start
+        if self.enabled:
+            label = self.label(method, path)
+            match = _QUERIES_RE.search(response.headers.get("Server-Timing", ""))
+            with self._lock:
+                self.latencies[label].append(elapsed)
+                if response.status_code >= 400:
+                    self.errors[label] += 1
+                if match:
+                    self.queries[label].append(int(match.group(1)))
+        return response
+
+
+# ========== FLUXOS ==========
+
+class Session:
+    """SESSÃO DE UM USUÁRIO: LOGIN E CHAMADAS AUTENTICADAS PELO MESMO CLIENTE DE TESTE."""
+
+    def __init__(self, app, recorder: Recorder, email: str, password: str, reference: datetime):
+        self.client = app.test_client()
+        self.recorder = recorder
+        self.email = email
+        self.password = password
+        self.reference = reference
+        self.headers: dict[str, str] = {}
+
+    def login(self) -> None:
+        response = self.recorder.request(
+            self.client, "POST", "/api/auth/login", json={"email": self.email, "senha": self.password}
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"Login de {self.email} falhou ({response.status_code}).")
+        self.headers = {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+    def get(self, path: str, **params):
+        return self.recorder.request(self.client, "GET", path, headers=self.headers, query_string=params or None)
+
+    def post(self, path: str, payload: dict):
+        return self.recorder.request(self.client, "POST", path, headers=self.headers, json=payload)
+
+    def window(self, days: int) -> dict[str, str]:
+        return {
+            "from": (self.reference - timedelta(days=days)).isoformat(),
+            "to": self.reference.isoformat(),
+        }
+
+
+def _app_start(session: Session) -> list[dict]:
+    """O QUE A TELA INICIAL DO APLICATIVO CARREGA LOGO APÓS O LOGIN. RETORNA OS VÍNCULOS."""
+    for path in ("/api/routines", "/api/boards", "/api/notifications"):
+        session.get(path)
+    session.get("/api/entries", **session.window(30))
+    return session.get("/api/care-links").get_json() or []
+
+
+def _create_entry(session: Session, rng: random.Random) -> None:
+    session.post("/api/entries", {
+        "tipo": "diario",
+        "texto": f"Humor: {rng.choice(('Feliz', 'Neutro', 'Triste'))}\nSono: Bom",
+        "tags": ["benchmark"],
+    })
+
+
+def flow_pessoa_tea(session: Session, rng: random.Random) -> None:
+    session.login()
+    _app_start(session)
+    _create_entry(session, rng)
+    session.get("/api/reports/weekly", **session.window(7))
+
+
+def flow_cuidador(session: Session, rng: random.Random) -> None:
+    session.login()
+    links = _app_start(session)
+    _create_entry(session, rng)
+    session.get("/api/reports/weekly", **session.window(7))
+    for link in links:
+        if link.get("status") == "accepted":
+            session.get("/api/entries", pessoa_tea_id=link["pessoa_tea_id"], **session.window(30))
+            session.get("/api/reports/weekly", pessoa_tea_id=link["pessoa_tea_id"], **session.window(7))
+
+
+def flow_profissional(session: Session, rng: random.Random) -> None:
+    session.login()
+    session.get("/api/shares")
+    session.get("/api/entries", **session.window(30))
+    session.get("/api/notifications")
+
+
+FLOWS = {
+    "Pessoa com TEA": flow_pessoa_tea,
+    "Cuidador": flow_cuidador,
+    "Profissional": flow_profissional,
+}
+
+
+# ========== EXECUÇÃO ==========
+
+def prepare_database(app, args: argparse.Namespace, populate: bool) -> tuple[dict[str, list[str]], datetime]:
+    """POPULA O BANCO SE PRECISO E RETORNA (E-MAILS POR PERFIL, DATA DE REFERÊNCIA DOS DADOS)."""
+    with app.app_context():
+        if populate:
+            db.create_all()
+            generate_synthetic_dataset(
+                seed=args.seed,
+                pessoas_tea=args.pessoas_tea,
+                cuidadores=args.pessoas_tea,
+                profissionais=max(1, args.pessoas_tea // 10),
+                dias=args.dias,
+                email_domain=args.email_domain,
+                password=args.password,
+            )
+
+        emails: dict[str, list[str]] = {}
+        for perfil in FLOWS:
+            emails[perfil] = [
+                email
+                for (email,) in db.session.query(User.email)
+                .filter(User.perfil == perfil, User.email.like(f"%@{args.email_domain}"))
+                .order_by(User.id)
+            ]
+            if not emails[perfil]:
+                raise SystemExit(f"Nenhum usuário '{perfil}' @{args.email_domain} no banco.")
+        # JANELAS DE RELATÓRIO RELATIVAS AO REGISTRO MAIS RECENTE, NÃO AO RELÓGIO
+        reference = db.session.query(db.func.max(Entry.timestamp)).scalar() or datetime.utcnow()
+        db.session.remove()
+    return emails, reference
+
+
+def run_rounds(app, recorder: Recorder, emails, reference, args, rounds: int, rng: random.Random) -> float:
+    """EXECUTA AS RODADAS E RETORNA O TEMPO DE PAREDE EM SEGUNDOS."""
+    jobs = []
+    for _ in range(rounds):
+        for perfil, flow in FLOWS.items():
+            for email in rng.sample(emails[perfil], min(args.clients, len(emails[perfil]))):
+                jobs.append((flow, email, rng.randrange(2**32)))
+
+    def run(job) -> None:
+        flow, email, job_seed = job
+        flow(Session(app, recorder, email, args.password, reference), random.Random(job_seed))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(run, jobs))
+    return time.perf_counter() - start
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for label, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        queries = recorder.queries.get(label)
+        endpoints[label] = {
+            "count": len(values),
+            "errors": recorder.errors.get(label, 0),
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(_percentile(values, 50) * 1000, 2),
+            "p95_ms": round(_percentile(values, 95) * 1000, 2),
+            "p99_ms": round(_percentile(values, 99) * 1000, 2),
+            "queries_avg": round(statistics.mean(queries), 1) if queries else None,
+        }
+    total = sum(item["count"] for item in endpoints.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def print_summary(summary: dict) -> None:
+    print(f"{summary['requests']} requisições em {summary['elapsed_s']:.1f} s ({summary['rps']:.1f} req/s)\n")
+    print(f"{'endpoint':42s} {'n':>6s} {'req/s':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'sql':>6s} {'erros':>6s}")
+    for label, item in summary["endpoints"].items():
+        queries = f"{item['queries_avg']:.1f}" if item["queries_avg"] is not None else "-"
+        print(
+            f"{label:42s} {item['count']:6d} {item['rps']:8.1f} {item['p50_ms']:8.1f} "
+            f"{item['p95_ms']:8.1f} {item['p99_ms']:8.1f} {queries:>6s} {item['errors']:6d}"
+        )
+
+
+def compare(summary: dict, baseline: dict, max_regression: Optional[float]) -> bool:
+    """IMPRIME A VARIAÇÃO EM RELAÇÃO AO BASELINE. RETORNA False SE ALGUM p95 PASSOU DO LIMITE."""
+    def change(new: float, old: float) -> float:
+        return (new - old) / old * 100 if old else 0.0
+
+    print(f"\ncomparação com o baseline ({baseline.get('commit') or 'sem commit'}):")
+    print(f"{'endpoint':42s} {'p50':>16s} {'p95':>16s} {'sql':>12s}")
+    ok = True
+    for label, item in summary["endpoints"].items():
+        old = baseline.get("endpoints", {}).get(label)
+        if old is None:
+            print(f"{label:42s} (novo)")
+            continue
+        p95_change = change(item["p95_ms"], old["p95_ms"])
+        regressed = max_regression is not None and p95_change > max_regression
+        ok = ok and not regressed
+        queries = (
+            f"{old['queries_avg']:.0f}->{item['queries_avg']:.0f}"
+            if old.get("queries_avg") is not None and item["queries_avg"] is not None
+            else "-"
+        )
+        print(
+            f"{label:42s} {change(item['p50_ms'], old['p50_ms']):+15.1f}% {p95_change:+15.1f}% "
+            f"{queries:>12s}{'  <- REGRESSÃO' if regressed else ''}"
+        )
+    print(f"{'vazão total':42s} {change(summary['rps'], baseline.get('rps', 0)):+15.1f}%")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=None, help="Banco SQLite já populado (padrão: temporário).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--pessoas-tea", type=int, default=60, help="Tamanho da população no banco temporário.")
+    parser.add_argument("--dias", type=int, default=365, help="Dias de diário no banco temporário.")
+    parser.add_argument("--email-domain", default="synthetic.local")
+    parser.add_argument("--password", default="123456")
+    parser.add_argument("--clients", type=int, default=6, help="Usuários de cada perfil por rodada.")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1, help="Rodadas descartadas antes da medição.")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--json", type=Path, default=None, help="Grava o resultado (baseline) neste arquivo.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compara com um resultado anterior.")
+    parser.add_argument("--max-regression", type=float, default=None, help="Piora máxima do p95 (%%).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or Path(tmp) / "bench.db"
+        app = create_app(_make_config(db_path.resolve()))
+        emails, reference = prepare_database(app, args, populate=args.db is None)
+
+        recorder = Recorder(app)
+        rng = random.Random(args.seed)
+        recorder.enabled = False
+        run_rounds(app, recorder, emails, reference, args, args.warmup, rng)
+        recorder.enabled = True
+        elapsed = run_rounds(app, recorder, emails, reference, args, args.rounds, rng)
+
+        with app.app_context():
+            from ..passwords import get_hasher
+
+            get_hasher().shutdown()
+
+    summary = summarize(recorder, elapsed)
+    print_summary(summary)
+
+    result = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "params": {
+            key: getattr(args, key)
+            for key in ("seed", "pessoas_tea", "dias", "clients", "rounds", "warmup", "threads")
+        } | {"db": str(args.db) if args.db else None},
+        **summary,
+    }
+    if args.json is not None:
+        args.json.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+
+    ok = True
+    if args.baseline is not None:
+        ok = compare(summary, json.loads(args.baseline.read_text()), args.max_regression)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+COMPARA O TEMPO DE SERIALIZAÇÃO DE UM PAYLOAD COM 5.000 ENTRIES.
+
+USO:
+    python -m backend.benchmarks.json_encode [--entries 5000] [--repeat 20]
+
+COMPARA O PROVEDOR PADRÃO DO FLASK (COM .isoformat() MANUAL, COMO ERA ANTES),
+O FastJSONProvider NO MODO STDLIB E O FastJSONProvider COM orjson (SE INSTALADO).
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from .. import json_provider
+from ..json_provider import FastJSONProvider
+
+
+def build_payload(total: int) -> list[dict]:
+    """GERA ENTRIES NO MESMO FORMATO DE _entry_to_dict, COM datetime NATIVO."""
+    base = datetime(2025, 1, 1, 8, 0, 0)
+    return [
+        {
+            "id": i,
+            "user_id": i % 50,
+            "user_name": f"Usuário {i % 50}",
+            "tipo": ("humor", "sono", "crise", "alimentacao")[i % 4],
+            "texto": "Hoje foi um dia tranquilo, com algumas mudanças na rotina. " * 2,
+            "midia_url": None,
+            "tags": ["escola", "sono"] if i % 3 else [],
+            "timestamp": base + timedelta(minutes=37 * i),
+        }
+        for i in range(total)
+    ]
+
+
+def _with_isoformat(payload: list[dict]) -> list[dict]:
+    return [{**entry, "timestamp": entry["timestamp"].isoformat()} for entry in payload]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    payload = build_payload(args.entries)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+
+    results = {
+        "flask default + isoformat manual": timeit.timeit(
+            lambda: default_provider.dumps(_with_isoformat(payload)), number=args.repeat
+        ),
+    }
+
+    # FORÇA O FALLBACK PARA A STDLIB TEMPORARIAMENTE
+    orjson_module = json_provider.orjson
+    json_provider.orjson = None
+    try:
+        results["FastJSONProvider (stdlib)"] = timeit.timeit(lambda: fast_provider.dumps(payload), number=args.repeat)
+    finally:
+        json_provider.orjson = orjson_module
+
+    if orjson_module is not None:
+        results["FastJSONProvider (orjson)"] = timeit.timeit(lambda: fast_provider.dumps(payload), number=args.repeat)
+
+    print(f"payload: {args.entries} entries, {args.repeat} repetições")
+    if orjson_module is None:
+        print("orjson não instalado: caminho rápido não medido")
+
+    baseline = results["flask default + isoformat manual"]
+    for name, total in results.items():
+        per_call_ms = total / args.repeat * 1000
+        print(f"{name:<36} {per_call_ms:8.2f} ms/encode  ({baseline / total:5.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
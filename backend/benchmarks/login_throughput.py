@@ -0,0 +1,121 @@
+"""
+MEDE A VAZÃO DE LOGIN SOB CONCORRÊNCIA, COM HASH NA THREAD E NO POOL DE PROCESSOS.
+
+USO:
+    python -m backend.benchmarks.login_throughput [--users 20] [--logins 200] [--threads 8] [--workers 2]
+
+CADA CENÁRIO USA UM BANCO SQLITE TEMPORÁRIO EM ARQUIVO E DISPARA --logins
+CHAMADAS A POST /api/auth/login A PARTIR DE --threads THREADS. ENQUANTO ISSO,
+UMA THREAD EXTRA MEDE A LATÊNCIA DE /health PARA MOSTRAR O IMPACTO NAS DEMAIS ROTAS.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ..app import create_app
+from ..config import TestConfig
+from ..extensions import db
+from ..models import User
+
+
+def _make_config(db_path: Path, workers: int, method: str) -> type[TestConfig]:
+    class BenchConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        PASSWORD_HASH_WORKERS = workers
+        PASSWORD_HASH_METHOD = method
+
+    return BenchConfig
+
+
+def run_scenario(workers: int, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(_make_config(Path(tmp) / "bench.db", workers, args.method))
+
+        with app.app_context():
+            db.create_all()
+            password_hash = None
+            for i in range(args.users):
+                user = User(email=f"bench{i}@example.com", nome_completo=f"Bench {i}", perfil="Cuidador")
+                # UM ÚNICO HASH REAPROVEITADO PARA ACELERAR A PREPARAÇÃO
+                if password_hash is None:
+                    user.set_password("123456")
+                    password_hash = user.password_hash
+                user.password_hash = password_hash
+                db.session.add(user)
+            db.session.commit()
+
+        def login(i: int) -> float:
+            client = app.test_client()
+            start = time.perf_counter()
+            response = client.post(
+                "/api/auth/login",
+                json={"email": f"bench{i % args.users}@example.com", "senha": "123456"},
+            )
+            assert response.status_code == 200, response.get_json()
+            return time.perf_counter() - start
+
+        health_latencies: list[float] = []
+        stop = threading.Event()
+
+        def probe_health() -> None:
+            client = app.test_client()
+            while not stop.is_set():
+                start = time.perf_counter()
+                client.get("/health")
+                health_latencies.append(time.perf_counter() - start)
+                time.sleep(0.01)
+
+        probe = threading.Thread(target=probe_health)
+        probe.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            latencies = list(pool.map(login, range(args.logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        probe.join()
+
+        with app.app_context():
+            from ..passwords import get_hasher
+
+            get_hasher().shutdown()
+
+    latencies.sort()
+    return {
+        "workers": workers,
+        "logins_per_s": args.logins / elapsed,
+        "login_p50_ms": statistics.median(latencies) * 1000,
+        "login_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "health_p95_ms": (sorted(health_latencies)[int(len(health_latencies) * 0.95) - 1] * 1000)
+        if health_latencies
+        else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2, help="processos do pool de hash")
+    parser.add_argument("--method", default=TestConfig.PASSWORD_HASH_METHOD)
+    args = parser.parse_args()
+
+    print(f"{args.logins} logins, {args.threads} threads, método {args.method}")
+    for workers in (0, args.workers):
+        result = run_scenario(workers, args)
+        label = "inline" if workers == 0 else f"pool({workers})"
+        print(
+            f"{label:<10} {result['logins_per_s']:8.1f} logins/s  "
+            f"p50 {result['login_p50_ms']:7.1f} ms  p95 {result['login_p95_ms']:7.1f} ms  "
+            f"/health p95 {result['health_p95_ms']:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
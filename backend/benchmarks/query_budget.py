@@ -0,0 +1,205 @@
+"""
+ORÇAMENTO DE CONSULTAS SQL POR ENDPOINT (DETECTA N+1).
+
+USO:
+    python -m backend.benchmarks.query_budget [--seed 42] [--verbose]
+
+MONTA DOIS BANCOS SQLITE TEMPORÁRIOS COM O GERADOR SINTÉTICO: UM PEQUENO E UM
+COM MUITO MAIS VÍNCULOS, SHARES, ROTINAS, PRANCHAS E DIAS DE DIÁRIO POR USUÁRIO.
+CADA ENDPOINT DE BUDGETS É CHAMADO EM NOME DE USUÁRIOS DE CADA PERFIL NOS DOIS
+BANCOS, COM O CACHE VAZIO, CONTANDO OS COMANDOS SQL PELO EVENTO
+before_cursor_execute DO SQLALCHEMY.
+
+TERMINA COM CÓDIGO 1 (PARA USO NO CI) SE ALGUM ENDPOINT:
+- FIZER MAIS CONSULTAS NO BANCO GRANDE QUE NO PEQUENO (O NÚMERO CRESCE COM OS DADOS); OU
+- PASSAR DO ORÇAMENTO DECLARADO EM BUDGETS.
+
+AO CRIAR UMA ROTA DE LISTAGEM, DECLARE O ORÇAMENTO DELA AQUI.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from flask_jwt_extended import create_access_token
+
+from ..app import create_app
+from ..cache import cache
+from ..config import TestConfig
+from ..extensions import db
+from ..identity import identity_claims
+from ..models import CareLink, Share, User
+from ..request_timing import QueryCounter
+from ..synthetic import generate_synthetic_dataset
+
+# MÁXIMO DE COMANDOS SQL POR REQUISIÇÃO (PIOR PERFIL), COM O CACHE VAZIO
+BUDGETS: dict[str, int] = {
+    "GET /api/routines": 6,
+    "GET /api/entries": 4,
+    "GET /api/entries?pessoa_tea_id": 3,
+    "GET /api/boards": 2,
+    "GET /api/shares": 1,
+    "GET /api/care-links": 1,
+    "GET /api/notifications": 1,
+    "GET /api/reports/weekly": 2,
+    "GET /api/reports/weekly?pessoa_tea_id": 4,
+    "GET /api/sync": 10,
+}
+
+# MESMA POPULAÇÃO NOS DOIS BANCOS; O QUE MUDA É O VOLUME POR USUÁRIO
+POPULATION = {"pessoas_tea": 12, "cuidadores": 12, "profissionais": 4}
+DATA_SIZES = {
+    "pequeno": {
+        "cuidadores_por_pessoa": 1, "pacientes_por_profissional": 2, "rotinas_por_pessoa": 1,
+        "passos_por_rotina": 2, "pranchas_por_pessoa": 1, "itens_por_prancha": 2,
+        "dias": 20, "notificacoes_por_usuario": 2,
+    },
+    "grande": {
+        "cuidadores_por_pessoa": 4, "pacientes_por_profissional": 8, "rotinas_por_pessoa": 5,
+        "passos_por_rotina": 8, "pranchas_por_pessoa": 4, "itens_por_prancha": 10,
+        "dias": 120, "notificacoes_por_usuario": 20,
+    },
+}
+
+# USUÁRIOS DE CADA PERFIL MEDIDOS EM CADA BANCO (VALE O MAIOR NÚMERO DE CONSULTAS)
+USERS_PER_PERFIL = 3
+END_DATE = datetime(2026, 1, 1)
+
+
+def _make_config(db_path: Path) -> type[TestConfig]:
+    class BudgetConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+
+    return BudgetConfig
+
+
+@contextmanager
+def _populated_app(tmp: str, name: str, seed: int) -> Iterator:
+    app = create_app(_make_config(Path(tmp) / f"{name}.db"))
+    with app.app_context():
+        db.create_all()
+        generate_synthetic_dataset(seed=seed, end_date=END_DATE, **POPULATION, **DATA_SIZES[name])
+        db.session.remove()
+    yield app
+
+
+def _requests_for(user: User) -> Iterator[tuple[str, str]]:
+    """(ENDPOINT DE BUDGETS, URL) CHAMADOS EM NOME DO USUÁRIO."""
+    for path in ("/api/routines", "/api/entries", "/api/boards", "/api/shares", "/api/care-links",
+                 "/api/notifications", "/api/reports/weekly", "/api/sync"):
+        yield f"GET {path}", path
+
+    if user.perfil == "Cuidador":
+        link = CareLink.query.filter_by(cuidador_id=user.id, status="accepted").first()
+        if link is not None:
+            yield "GET /api/entries?pessoa_tea_id", f"/api/entries?pessoa_tea_id={link.pessoa_tea_id}"
+            yield "GET /api/reports/weekly?pessoa_tea_id", f"/api/reports/weekly?pessoa_tea_id={link.pessoa_tea_id}"
+
+
+def _heaviest_users(perfil: str) -> list[User]:
+    """USUÁRIOS DO PERFIL COM MAIS VÍNCULOS/SHARES, ONDE UM N+1 APARECE PRIMEIRO."""
+    if perfil == "Profissional":
+        fan_out = db.session.query(db.func.count(Share.id)).filter(Share.viewer_id == User.id)
+    elif perfil == "Cuidador":
+        fan_out = db.session.query(db.func.count(CareLink.id)).filter(CareLink.cuidador_id == User.id)
+    else:
+        fan_out = db.session.query(db.func.count(CareLink.id)).filter(CareLink.pessoa_tea_id == User.id)
+    return (
+        User.query.filter_by(perfil=perfil)
+        .order_by(fan_out.scalar_subquery().desc(), User.id)
+        .limit(USERS_PER_PERFIL)
+        .all()
+    )
+
+
+def measure(app) -> dict[str, tuple[int, str, list[str]]]:
+    """RETORNA {ENDPOINT: (MAIOR NÚMERO DE CONSULTAS, QUEM, COMANDOS)} NO BANCO DA APLICAÇÃO."""
+    results: dict[str, tuple[int, str, list[str]]] = {}
+    client = app.test_client()
+    with app.app_context():
+        calls = []
+        for perfil in ("Pessoa com TEA", "Cuidador", "Profissional"):
+            for user in _heaviest_users(perfil):
+                token = create_access_token(identity=str(user.id), additional_claims=identity_claims(user))
+                calls.extend((endpoint, url, user.email, token) for endpoint, url in _requests_for(user))
+        engine = db.engine
+        db.session.remove()
+
+    for endpoint, url, email, token in calls:
+        cache.clear()
+        with QueryCounter(engine) as counter:
+            response = client.get(url, headers={"Authorization": f"Bearer {token}"})
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} em nome de {email} retornou {response.status_code}.")
+        if endpoint not in results or counter.count > results[endpoint][0]:
+            results[endpoint] = (counter.count, email, counter.statements)
+    return results
+
+
+def measure_all(tmp: str, seed: int) -> dict[str, dict[str, tuple[int, str, list[str]]]]:
+    """MEDE TODOS OS ENDPOINTS EM CADA BANCO DE DATA_SIZES, CRIADOS DENTRO DE tmp."""
+    results = {}
+    for name in DATA_SIZES:
+        with _populated_app(tmp, name, seed) as app:
+            results[name] = measure(app)
+            with app.app_context():
+                db.engine.dispose()
+    return results
+
+
+def check(
+    small: dict[str, tuple[int, str, list[str]]],
+    large: dict[str, tuple[int, str, list[str]]],
+    verbose: bool = False,
+) -> list[str]:
+    """IMPRIME O RELATÓRIO E RETORNA AS FALHAS."""
+    failures: list[str] = []
+    print(f"{'endpoint':40s} {'pequeno':>8s} {'grande':>8s} {'orçamento':>10s}")
+    for endpoint in sorted(set(small) | set(large) | set(BUDGETS)):
+        budget: Optional[int] = BUDGETS.get(endpoint)
+        small_count = small.get(endpoint, (0, "", []))[0]
+        large_count, email, statements = large.get(endpoint, (0, "", []))
+        status = ""
+        if budget is None:
+            failures.append(f"{endpoint}: sem orçamento declarado em BUDGETS")
+            status = "SEM ORÇAMENTO"
+        elif endpoint not in large:
+            failures.append(f"{endpoint}: não foi exercitado")
+            status = "NÃO EXERCITADO"
+        elif large_count > small_count:
+            failures.append(f"{endpoint}: {small_count} -> {large_count} consultas com mais dados ({email})")
+            status = "CRESCE COM OS DADOS"
+        elif large_count > budget:
+            failures.append(f"{endpoint}: {large_count} consultas, orçamento {budget} ({email})")
+            status = "ACIMA DO ORÇAMENTO"
+        print(f"{endpoint:40s} {small_count:8d} {large_count:8d} {budget if budget is not None else '-':>10} {status}")
+        if verbose or (status and statements):
+            for statement in statements:
+                print(f"    {statement[:160]}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="Lista os comandos SQL de cada endpoint.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = measure_all(tmp, args.seed)
+
+    failures = check(results["pequeno"], results["grande"], args.verbose)
+    if failures:
+        print("\nFALHA:")
+        for failure in failures:
+            print(f"  {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
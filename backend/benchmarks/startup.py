@@ -0,0 +1,129 @@
+"""
+MEDE O TEMPO DE INICIALIZAÇÃO A FRIO DO BACKEND (IMPORTAÇÃO + create_app).
+
+USO:
+    python -m backend.benchmarks.startup [--repeat 5] [--top 15] [--json startup.json] [--max-import-ms 1500]
+
+CADA RODADA É UM PROCESSO NOVO COM `python -X importtime`, ENTÃO NADA FICA EM
+CACHE DE UMA RODADA PARA OUTRA (EXCETO O .pyc E O CACHE DE DISCO DO SO). O
+RESULTADO MOSTRA A MEDIANA DO TEMPO DE IMPORTAÇÃO DE backend.app, O TEMPO DE
+create_app() E OS MÓDULOS COM MAIOR TEMPO PRÓPRIO DE IMPORTAÇÃO.
+
+COM --max-import-ms OU --max-create-ms O COMANDO TERMINA COM CÓDIGO 1 QUANDO O
+LIMITE É ULTRAPASSADO, PARA SER USADO COMO VERIFICAÇÃO NO CI.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# IMPORTA O MÓDULO E CRIA A APLICAÇÃO, IMPRIMINDO O TEMPO DE create_app EM MS
+PROBE = (
+    "import time\n"
+    "from backend.app import create_app\n"
+    "start = time.perf_counter()\n"
+    "create_app()\n"
+    "print((time.perf_counter() - start) * 1000)\n"
+)
+
+
+def _parse_importtime(stderr: str) -> tuple[dict[str, int], dict[str, int]]:
+    """RETORNA (TEMPO PRÓPRIO, TEMPO CUMULATIVO) EM MICROSSEGUNDOS POR MÓDULO."""
+    self_us: dict[str, int] = {}
+    cumulative_us: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # FORMATO: "import time:   self |   cumulative | <indentação>módulo"
+        self_part, cumulative_part, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        self_us[module] = int(self_part)
+        cumulative_us[module] = int(cumulative_part)
+    return self_us, cumulative_us
+
+
+def run_once() -> dict:
+    env = dict(os.environ)
+    # A CONFIGURAÇÃO EXIGE ESTAS VARIÁVEIS; O BANCO NÃO É ACESSADO NA INICIALIZAÇÃO
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "startup-benchmark")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao iniciar o backend:\n{result.stderr[-2000:]}")
+
+    self_us, cumulative_us = _parse_importtime(result.stderr)
+    return {
+        "import_ms": cumulative_us.get("backend.app", 0) / 1000,
+        "create_app_ms": float(result.stdout.strip().splitlines()[-1]),
+        "self_us": self_us,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", type=Path, default=None, help="Grava o resultado neste arquivo.")
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-create-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.repeat)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    create_ms = statistics.median(run["create_app_ms"] for run in runs)
+
+    # MEDIANA DO TEMPO PRÓPRIO DE CADA MÓDULO ENTRE AS RODADAS
+    samples: dict[str, list[int]] = defaultdict(list)
+    for run in runs:
+        for module, value in run["self_us"].items():
+            samples[module].append(value)
+    slowest = sorted(
+        ((module, statistics.median(values) / 1000) for module, values in samples.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )[: args.top]
+
+    print(f"import backend.app: {import_ms:8.1f} ms (mediana de {args.repeat})")
+    print(f"create_app():       {create_ms:8.1f} ms")
+    print("\nmódulos mais lentos (tempo próprio):")
+    for module, ms in slowest:
+        print(f"  {ms:8.1f} ms  {module}")
+
+    if args.json is not None:
+        args.json.write_text(json.dumps({
+            "python": sys.version.split()[0],
+            "repeat": args.repeat,
+            "import_ms": round(import_ms, 1),
+            "create_app_ms": round(create_ms, 1),
+            "slowest_modules": [{"module": module, "self_ms": round(ms, 1)} for module, ms in slowest],
+        }, indent=2))
+
+    failed = False
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"\nFALHA: importação levou {import_ms:.1f} ms (limite {args.max_import_ms:.1f} ms)")
+        failed = True
+    if args.max_create_ms is not None and create_ms > args.max_create_ms:
+        print(f"\nFALHA: create_app levou {create_ms:.1f} ms (limite {args.max_create_ms:.1f} ms)")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
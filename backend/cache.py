@@ -4,7 +4,7 @@ CACHE SIMPLES EM MEMÓRIA COM TTL (TIME TO LIVE) PARA DADOS ESTÁTICOS.
 from __future__ import annotations
 
 import time
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from threading import Lock
 
 
@@ -21,6 +21,8 @@ class SimpleCache:
         self._cache: dict[str, tuple[Any, float]] = {}
         self._lock = Lock()
         self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -34,6 +36,7 @@ class SimpleCache:
         """
         with self._lock:
             if key not in self._cache:
+                self.misses += 1
                 return None
             
             value, expiry = self._cache[key]
@@ -41,8 +44,10 @@ class SimpleCache:
             # VERIFICAR SE EXPIROU
             if time.time() > expiry:
                 del self._cache[key]
+                self.misses += 1
                 return None
             
+            self.hits += 1
             return value
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
@@ -86,6 +91,31 @@ class SimpleCache:
             for key in keys_to_delete:
                 del self._cache[key]
     
+    def namespace_counts(self) -> dict[str, int]:
+        """
+        NÚMERO DE ENTRADAS POR NAMESPACE (PREFIXO ANTES DO PRIMEIRO ":", EX.: routines).
+        """
+        counts: dict[str, int] = {}
+        with self._lock:
+            for key in self._cache:
+                namespace = key.split(":", 1)[0]
+                counts[namespace] = counts.get(namespace, 0) + 1
+        return counts
+    
+    def namespace_usage(self, sizeof: Callable[[Any], int]) -> dict[str, dict[str, int]]:
+        """
+        ENTRADAS E BYTES (MEDIDOS POR `sizeof`) POR NAMESPACE.
+        OS TAMANHOS SÃO CALCULADOS FORA DO LOCK, SOBRE UMA CÓPIA DAS ENTRADAS.
+        """
+        with self._lock:
+            items = [(key, value) for key, (value, _) in self._cache.items()]
+        usage: dict[str, dict[str, int]] = {}
+        for key, value in items:
+            stats = usage.setdefault(key.split(":", 1)[0], {"entries": 0, "bytes": 0})
+            stats["entries"] += 1
+            stats["bytes"] += sizeof(value)
+        return usage
+    
     def cleanup_expired(self) -> None:
         """REMOVE ENTRADAS EXPIRADAS DO CACHE."""
         with self._lock:
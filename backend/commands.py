@@ -0,0 +1,163 @@
+"""
+COMANDOS DE LINHA DE COMANDO DA APLICAÇÃO (flask --app backend.app <comando>).
+
+OS MÓDULOS USADOS APENAS PELOS COMANDOS SÃO IMPORTADOS DENTRO DE CADA UM, PARA
+NÃO PESAR NA INICIALIZAÇÃO DOS WORKERS HTTP.
+"""
+from __future__ import annotations
+
+import click
+from flask import Flask
+
+from .extensions import db
+
+
+def init_commands(app: Flask) -> None:
+    """REGISTRA OS COMANDOS NO CLI DA APLICAÇÃO."""
+
+    @app.cli.command("init-db")
+    @click.option("--skip-seed", is_flag=True, help="Não cria o usuário admin.")
+    def init_db_command(skip_seed: bool) -> None:
+        """CRIA AS TABELAS AUSENTES E O USUÁRIO ADMIN (AMBIENTES SEM MIGRAÇÕES, EX.: DEV/SQLITE)."""
+        from .seed import seed_admin_user
+
+        db.create_all()
+        click.echo("Tabelas criadas.")
+        if not skip_seed:
+            seed_admin_user()
+
+    @app.cli.command("seed")
+    def seed_command() -> None:
+        """CRIA O USUÁRIO ADMIN SE AINDA NÃO EXISTIR."""
+        from .seed import seed_admin_user
+
+        seed_admin_user()
+
+    @app.cli.command("purge-notifications")
+    @click.option("--days", type=int, default=None, help="Idade mínima (dias) das notificações lidas removidas.")
+    @click.option("--batch-size", type=int, default=None, help="Linhas removidas por transação.")
+    @click.option("--max-batches", type=int, default=None, help="Interrompe após N lotes (execuções incrementais).")
+    def purge_notifications_command(days, batch_size, max_batches) -> None:
+        """REMOVE NOTIFICAÇÕES LIDAS ANTIGAS E TOMBSTONES EXPIRADOS EM LOTES."""
+        from .maintenance import purge_deletion_log, purge_read_notifications
+
+        days = days if days is not None else app.config["NOTIFICATION_RETENTION_DAYS"]
+        batch_size = batch_size or app.config["NOTIFICATION_PURGE_BATCH_SIZE"]
+        removed = purge_read_notifications(days, batch_size=batch_size, max_batches=max_batches)
+        tombstones = purge_deletion_log(app.config["SYNC_TOMBSTONE_RETENTION_DAYS"])
+        click.echo(f"{removed} notificações removidas, {tombstones} tombstones expirados removidos.")
+
+    @app.cli.command("process-account-deletions")
+    @click.option("--batch-size", type=int, default=None, help="Linhas removidas por transação.")
+    def process_account_deletions_command(batch_size) -> None:
+        """EXECUTA OU RETOMA OS JOBS DE EXCLUSÃO DE CONTA PENDENTES, INTERROMPIDOS OU COM FALHA."""
+        from .account_deletion import run_account_deletion
+        from .models import AccountDeletion
+
+        job_ids = [
+            job_id
+            for (job_id,) in db.session.query(AccountDeletion.id)
+            .filter(AccountDeletion.status.in_(("pending", "running", "failed")))
+            .order_by(AccountDeletion.id)
+        ]
+        for job_id in job_ids:
+            job = run_account_deletion(job_id, batch_size=batch_size)
+            click.echo(f"job {job.id} (usuário {job.user_id}): {job.status}, {job.removidos}/{job.total} registros")
+
+    @app.cli.command("memory-profile")
+    @click.option("--email", required=True, help="Usuário em nome do qual as requisições são feitas.")
+    @click.option("--path", "paths", multiple=True, default=("/api/routines",), show_default=True,
+                  help="GET executado a cada rodada (pode repetir a opção).")
+    @click.option("--repeat", type=int, default=100, show_default=True, help="Rodadas entre os dois snapshots.")
+    @click.option("--top", type=int, default=15, show_default=True, help="Locais de alocação listados.")
+    @click.option("--group-by", type=click.Choice(["lineno", "filename", "traceback"]), default="lineno")
+    def memory_profile_command(email, paths, repeat, top, group_by) -> None:
+        """
+        EXECUTA GETs DA API NESTE PROCESSO ENTRE DOIS SNAPSHOTS DO tracemalloc E MOSTRA
+        ONDE A MEMÓRIA CRESCEU, O USO DO CACHE POR NAMESPACE E O RSS.
+        """
+        import gc
+
+        from flask_jwt_extended import create_access_token
+
+        from . import memory
+        from .identity import identity_claims
+        from .models import User
+
+        user = User.query.filter_by(email=email.strip().lower()).first()
+        if user is None:
+            raise click.ClickException(f"Usuário {email} não encontrado.")
+        token = create_access_token(identity=str(user.id), additional_claims=identity_claims(user))
+        headers = {"Authorization": f"Bearer {token}"}
+        client = app.test_client()
+
+        memory.start_tracing(app.config.get("MEMORY_TRACE_FRAMES", 1))
+        # UMA RODADA ANTES DO PRIMEIRO SNAPSHOT PARA NÃO CONTAR IMPORTS E CACHES DE PRIMEIRA EXECUÇÃO
+        for path in paths:
+            client.get(path, headers=headers)
+        gc.collect()
+        rss_before = memory.rss_bytes()
+        before = memory.get_snapshot(memory.take_snapshot())
+
+        for _ in range(repeat):
+            for path in paths:
+                response = client.get(path, headers=headers)
+                if response.status_code >= 400:
+                    raise click.ClickException(f"GET {path} retornou {response.status_code}.")
+        gc.collect()
+        after = memory.get_snapshot(memory.take_snapshot())
+        rss_after = memory.rss_bytes()
+
+        click.echo(f"{repeat} rodadas de {', '.join(paths)}")
+        if rss_before is not None and rss_after is not None:
+            click.echo(f"RSS: {rss_before / 2**20:.1f} MiB -> {rss_after / 2**20:.1f} MiB")
+        click.echo("\ncrescimento por local de alocação:")
+        for site in memory.diff_sites(before, after, top, group_by):
+            click.echo(f"  {site['size_diff_kib']:+10.1f} KiB {site['count_diff']:+8d}  {site['site']}")
+        click.echo("\ncache por namespace:")
+        for namespace, usage in sorted(memory.cache_usage().items()):
+            click.echo(f"  {namespace:20s} {usage['entries']:6d} entradas {usage['bytes'] / 1024:10.1f} KiB")
+        memory.stop_tracing()
+
+
+    @app.cli.command("seed-synthetic")
+    @click.option("--seed", type=int, default=42, show_default=True, help="Semente do gerador (mesma semente, mesmos dados).")
+    @click.option("--pessoas-tea", type=int, default=1000, show_default=True)
+    @click.option("--cuidadores", type=int, default=1000, show_default=True)
+    @click.option("--profissionais", type=int, default=100, show_default=True)
+    @click.option("--cuidadores-por-pessoa", type=float, default=2, show_default=True, help="Média de vínculos por pessoa com TEA.")
+    @click.option("--pacientes-por-profissional", type=float, default=20, show_default=True, help="Média de shares por profissional.")
+    @click.option("--rotinas-por-pessoa", type=float, default=3, show_default=True)
+    @click.option("--passos-por-rotina", type=float, default=5, show_default=True)
+    @click.option("--pranchas-por-pessoa", type=float, default=2, show_default=True)
+    @click.option("--itens-por-prancha", type=float, default=8, show_default=True)
+    @click.option("--dias", type=int, default=730, show_default=True, help="Período coberto pelos registros do diário.")
+    @click.option("--entradas-por-dia", type=float, default=1.0, show_default=True,
+                  help="Média diária por pessoa com TEA (cuidadores escrevem metade).")
+    @click.option("--notificacoes-por-usuario", type=float, default=20, show_default=True)
+    @click.option("--end-date", type=click.DateTime(["%Y-%m-%d"]), default=None,
+                  help="Último dia dos dados (padrão: hoje). Fixe para reproduzir o mesmo banco.")
+    @click.option("--email-domain", default="synthetic.local", show_default=True)
+    @click.option("--password", default="123456", show_default=True, help="Senha de todos os usuários gerados.")
+    @click.option("--batch-size", type=int, default=5000, show_default=True, help="Linhas por INSERT/transação.")
+    def seed_synthetic_command(**options) -> None:
+        """
+        POPULA O BANCO COM DADOS SINTÉTICOS PARA TESTES DE CARGA (USUÁRIOS, VÍNCULOS,
+        SHARES, ROTINAS, PRANCHAS, ANOS DE DIÁRIO E NOTIFICAÇÕES). RODAR init-db ANTES.
+        """
+        import time
+
+        from .synthetic import generate_synthetic_dataset
+
+        def progress(table: str, written: int) -> None:
+            if written % (options["batch_size"] * 20) < options["batch_size"]:
+                click.echo(f"  {table}: {written}")
+
+        started = time.perf_counter()
+        try:
+            counts = generate_synthetic_dataset(progress=progress, **options)
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from exc
+        for table, count in counts.items():
+            click.echo(f"{table:20s} {count:10d}")
+        click.echo(f"Concluído em {time.perf_counter() - started:.1f} s.")
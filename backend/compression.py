@@ -0,0 +1,149 @@
+"""
+COMPRESSÃO DE RESPOSTAS (GZIP, BROTLI E ZSTD) COM NEGOCIAÇÃO VIA Accept-Encoding.
+
+BROTLI E ZSTD SÃO OPCIONAIS: SÓ SÃO OFERECIDOS SE OS PACOTES `brotli` E
+`zstandard` ESTIVEREM INSTALADOS. GZIP SEMPRE ESTÁ DISPONÍVEL.
+"""
+from __future__ import annotations
+
+import gzip
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - DEPENDÊNCIA OPCIONAL
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - DEPENDÊNCIA OPCIONAL
+    zstandard = None
+
+
+# TIPOS QUE VALEM A PENA COMPRIMIR (IMAGENS, ÁUDIO, ZIP ETC. JÁ SÃO COMPRIMIDOS)
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "text/xml",
+}
+
+
+def _gzip(data: bytes, config: dict) -> bytes:
+    return gzip.compress(data, compresslevel=config["COMPRESSION_GZIP_LEVEL"], mtime=0)
+
+
+def _brotli(data: bytes, config: dict) -> bytes:
+    return brotli.compress(data, quality=config["COMPRESSION_BROTLI_QUALITY"])
+
+
+def _zstd(data: bytes, config: dict) -> bytes:
+    return zstandard.ZstdCompressor(level=config["COMPRESSION_ZSTD_LEVEL"]).compress(data)
+
+
+def available_encodings() -> dict[str, Callable[[bytes, dict], bytes]]:
+    """RETORNA OS ALGORITMOS DISPONÍVEIS, EM ORDEM DE PREFERÊNCIA DO SERVIDOR."""
+    encoders: dict[str, Callable[[bytes, dict], bytes]] = {}
+    if brotli is not None:
+        encoders["br"] = _brotli
+    if zstandard is not None:
+        encoders["zstd"] = _zstd
+    encoders["gzip"] = _gzip
+    return encoders
+
+
+class EncodedBody:
+    """
+    CORPO JSON JÁ SERIALIZADO, PRONTO PARA SER GUARDADO NO CACHE.
+    AS VERSÕES COMPRIMIDAS SÃO CALCULADAS UMA VEZ POR ALGORITMO E REAPROVEITADAS
+    ENQUANTO O VALOR ESTIVER NO CACHE.
+    """
+
+    def __init__(self, data: bytes, mimetype: str = "application/json"):
+        self.data = data
+        self.mimetype = mimetype
+        self._variants: dict[str, bytes] = {}
+        self._lock = Lock()
+
+    @classmethod
+    def from_json(cls, payload: Any) -> "EncodedBody":
+        """SERIALIZA O PAYLOAD COM O PROVEDOR JSON DA APLICAÇÃO."""
+        return cls(f"{current_app.json.dumps(payload)}\n".encode("utf-8"))
+
+    @property
+    def nbytes(self) -> int:
+        """BYTES OCUPADOS PELO CORPO E PELAS VERSÕES COMPRIMIDAS JÁ CALCULADAS."""
+        with self._lock:
+            return len(self.data) + sum(len(variant) for variant in self._variants.values())
+
+    def variant(self, encoding: str, encoder: Callable[[bytes, dict], bytes], config: dict) -> bytes:
+        """RETORNA O CORPO COMPRIMIDO, CALCULANDO APENAS NA PRIMEIRA VEZ."""
+        with self._lock:
+            compressed = self._variants.get(encoding)
+            if compressed is None:
+                compressed = encoder(self.data, config)
+                self._variants[encoding] = compressed
+            return compressed
+
+    def to_response(self, status: int = 200) -> Response:
+        """CRIA UMA RESPOSTA A PARTIR DO CORPO PRÉ-SERIALIZADO."""
+        response = Response(self.data, status=status, mimetype=self.mimetype)
+        response.encoded_body = self
+        return response
+
+
+def _should_compress(response: Response, config: dict) -> bool:
+    if not config.get("COMPRESSION_ENABLED", True):
+        return False
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if "Content-Encoding" in response.headers:
+        return False
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    return response.content_length is None or response.content_length >= config["COMPRESSION_MIN_SIZE"]
+
+
+def _negotiate_encoding(encoders: dict) -> Optional[str]:
+    return request.accept_encodings.best_match(list(encoders.keys()))
+
+
+def compress_response(response: Response) -> Response:
+    """COMPRIME A RESPOSTA SE O CLIENTE ACEITAR E ELA FOR GRANDE O SUFICIENTE."""
+    config = current_app.config
+    if not _should_compress(response, config):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    encoders = available_encodings()
+    encoding = _negotiate_encoding(encoders)
+    if encoding is None:
+        return response
+
+    encoded_body: Optional[EncodedBody] = getattr(response, "encoded_body", None)
+    if encoded_body is not None:
+        compressed = encoded_body.variant(encoding, encoders[encoding], config)
+    else:
+        data = response.get_data()
+        if len(data) < config["COMPRESSION_MIN_SIZE"]:
+            return response
+        compressed = encoders[encoding](data, config)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """REGISTRA A COMPRESSÃO COMO after_request DA APLICAÇÃO."""
+    app.after_request(compress_response)
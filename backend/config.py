@@ -26,6 +26,35 @@ def _get_secret_key() -> str:
   return _get_required_env("SECRET_KEY")
 
 
+def _get_engine_options(database_url: str) -> dict:
+  """
+  OPÇÕES DO POOL DE CONEXÕES (SQLALCHEMY_ENGINE_OPTIONS) A PARTIR DO AMBIENTE.
+  SQLITE USA OS POOLS PADRÃO DO FLASK-SQLALCHEMY, QUE NÃO ACEITAM ESTES PARÂMETROS.
+  """
+  if database_url.startswith("sqlite"):
+    return {}
+
+  from .db_pool import InstrumentedQueuePool
+
+  return {
+    "poolclass": InstrumentedQueuePool,
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    # ABAIXO DO wait_timeout DO MYSQL PARA NÃO REUTILIZAR CONEXÕES FECHADAS PELO SERVIDOR
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+  }
+
+
+def _get_binds() -> dict:
+  """BINDS ADICIONAIS: "replica" (SOMENTE LEITURA) QUANDO DATABASE_REPLICA_URL ESTÁ DEFINIDA."""
+  replica_url = os.getenv("DATABASE_REPLICA_URL")
+  if not replica_url:
+    return {}
+  return {"replica": {"url": replica_url, **_get_engine_options(replica_url)}}
+
+
 class Config:
   """Base configuration for the Flask application."""
 
@@ -36,12 +65,97 @@ class Config:
   JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY") or _get_secret_key()
   
   SQLALCHEMY_TRACK_MODIFICATIONS = False
+  # POOL DE CONEXÕES: DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+  SQLALCHEMY_ENGINE_OPTIONS = _get_engine_options(SQLALCHEMY_DATABASE_URI)
+  # RÉPLICA DE LEITURA OPCIONAL PARA OS GETs MARCADOS COM @replica_read. DEPOIS DE ESCREVER, O USUÁRIO
+  # LÊ DO PRIMÁRIO POR DB_REPLICA_MAX_LAG_SECONDS, QUE TAMBÉM LIMITA O TTL DO CACHE DE LEITURAS DA RÉPLICA
+  SQLALCHEMY_BINDS = _get_binds()
+  DB_REPLICA_MAX_LAG_SECONDS = int(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
 
   # VARIÁVEIS OPCIONAIS COM VALORES PADRÃO
   JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTES", "30")))
   JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv("JWT_REFRESH_DAYS", "7")))
   LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+  # REGISTRA O FLASK-MIGRATE FORA DO CLI DO FLASK (EX.: SCRIPTS QUE CHAMAM flask_migrate.upgrade)
+  MIGRATIONS_ENABLED = os.getenv("MIGRATIONS_ENABLED", "false").lower() == "true"
+
+  # TEMPO POR REQUISIÇÃO (HEADER Server-Timing) E LOG DE REQUISIÇÕES / CONSULTAS SQL LENTAS
+  REQUEST_TIMING_ENABLED = os.getenv("REQUEST_TIMING_ENABLED", "true").lower() == "true"
+  SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+  SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", "100"))
+  # PICO DE MEMÓRIA POR REQUISIÇÃO NO Server-Timing (LIGA O tracemalloc: SÓ DURANTE INVESTIGAÇÕES)
+  REQUEST_TIMING_MEMORY = os.getenv("REQUEST_TIMING_MEMORY", "false").lower() == "true"
+
+  # SNAPSHOTS DO tracemalloc (/api/admin/memory E flask memory-profile): QUANTOS GUARDAR E FRAMES POR ALOCAÇÃO
+  MEMORY_SNAPSHOT_LIMIT = int(os.getenv("MEMORY_SNAPSHOT_LIMIT", "5"))
+  MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", "1"))
+
+  # MÉTRICAS DO PROMETHEUS EM GET /metrics (DESLIGADAS POR PADRÃO: A ROTA EXPÕE ENDPOINTS E VOLUMES).
+  # COM VÁRIOS WORKERS, METRICS_DIR (ESVAZIADO A CADA DEPLOY) RECEBE UM ARQUIVO POR PROCESSO E A
+  # RESPOSTA SOMA TODOS. COM METRICS_TOKEN, EXIGE "Authorization: Bearer <token>"
+  METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+  METRICS_DIR = os.getenv("METRICS_DIR") or None
+  METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+  METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "2"))
+
+  # PERFILAMENTO SOB DEMANDA (profiling.py): ADMIN COM HEADER "X-Profile: cprofile|sampling" OU
+  # REQUISIÇÕES DOS USUÁRIOS EM PROFILE_USER_IDS (IDS SEPARADOS POR VÍRGULA). ARQUIVOS EM PROFILE_DIR
+  PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+  PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/clareza-profiles")
+  PROFILE_MODE = os.getenv("PROFILE_MODE", "cprofile")
+  PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+  PROFILE_USER_IDS = {int(value) for value in os.getenv("PROFILE_USER_IDS", "").split(",") if value.strip()}
+
+  # SINCRONIZAÇÃO INCREMENTAL: MARGEM (EM SEGUNDOS) SUBTRAÍDA DO TOKEN PARA NÃO PERDER
+  # ESCRITAS CONCORRENTES OU TRUNCADAS PARA SEGUNDOS PELO BANCO
+  SYNC_OVERLAP_SECONDS = int(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+
+  # TOMBSTONES MAIS ANTIGOS QUE ISTO SÃO REMOVIDOS; UM TOKEN ANTERIOR AO HORIZONTE RECEBE O ESTADO COMPLETO
+  SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+  # RETENÇÃO DE NOTIFICAÇÕES LIDAS (flask purge-notifications) E LIMITE DE PUT /api/notifications/read
+  NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+  NOTIFICATION_PURGE_BATCH_SIZE = int(os.getenv("NOTIFICATION_PURGE_BATCH_SIZE", "500"))
+  NOTIFICATION_READ_MAX_IDS = int(os.getenv("NOTIFICATION_READ_MAX_IDS", "500"))
+
+  # HASH DE SENHAS: MÉTODO DO WERKZEUG (FORMA COMPLETA, EX.: scrypt:32768:8:1 OU pbkdf2:sha256:600000)
+  # E POOL DE PROCESSOS LIMITADO. HASHES COM OUTRO MÉTODO SÃO REFEITOS NO PRÓXIMO LOGIN.
+  PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+  PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+  PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+  PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+  # TOQUES REPETIDOS NO BOTÃO DE AJUDA DENTRO DESTA JANELA (SEGUNDOS) VIRAM UMA NOTIFICAÇÃO COM CONTADOR
+  HELP_REQUEST_COALESCE_SECONDS = int(os.getenv("HELP_REQUEST_COALESCE_SECONDS", "120"))
+
+  # NOTIFICAÇÕES EM TEMPO REAL (SSE). memory:// ENTREGA APENAS NO MESMO PROCESSO;
+  # COM VÁRIOS WORKERS USE UM ARQUIVO COMPARTILHADO, EX.: sqlite:////tmp/notification_events.db
+  NOTIFICATION_BROKER_URL = os.getenv("NOTIFICATION_BROKER_URL", "memory://")
+  NOTIFICATION_BROKER_POLL_INTERVAL = float(os.getenv("NOTIFICATION_BROKER_POLL_INTERVAL", "0.25"))
+  NOTIFICATION_STREAM_HEARTBEAT = int(os.getenv("NOTIFICATION_STREAM_HEARTBEAT", "15"))
+  NOTIFICATION_STREAM_MAX_SECONDS = int(os.getenv("NOTIFICATION_STREAM_MAX_SECONDS", "300"))
+  NOTIFICATION_STREAM_RETRY_MS = int(os.getenv("NOTIFICATION_STREAM_RETRY_MS", "3000"))
+  NOTIFICATION_STREAM_RESUME_LIMIT = int(os.getenv("NOTIFICATION_STREAM_RESUME_LIMIT", "100"))
+
+  # EXCLUSÃO DE CONTA EM SEGUNDO PLANO: LINHAS REMOVIDAS POR TRANSAÇÃO E THREADS DO POOL
+  ACCOUNT_DELETION_ASYNC = os.getenv("ACCOUNT_DELETION_ASYNC", "true").lower() == "true"
+  ACCOUNT_DELETION_BATCH_SIZE = int(os.getenv("ACCOUNT_DELETION_BATCH_SIZE", "500"))
+  ACCOUNT_DELETION_WORKERS = int(os.getenv("ACCOUNT_DELETION_WORKERS", "1"))
+
+  # NÚMERO MÁXIMO DE SUB-REQUISIÇÕES ACEITAS EM POST /api/batch
+  BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+
+  # NÚMERO MÁXIMO DE ITENS EM POST /api/boards/<id>/items/bulk
+  BOARD_ITEMS_BULK_MAX = int(os.getenv("BOARD_ITEMS_BULK_MAX", "200"))
+
+  # COMPRESSÃO DE RESPOSTAS (BROTLI/ZSTD SÓ SE OS PACOTES ESTIVEREM INSTALADOS)
+  COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+  COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+  COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+  COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+  COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
   BASE_DIR = Path(__file__).resolve().parent
 
 
@@ -50,9 +164,16 @@ class TestConfig(Config):
   TESTING = True
   # SOBRESCREVE AS VARIÁVEIS OBRIGATÓRIAS COM VALORES SEGUROS PARA TESTES
   SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+  SQLALCHEMY_ENGINE_OPTIONS: dict = {}
+  SQLALCHEMY_BINDS: dict = {}
+  METRICS_DIR = None
+  METRICS_TOKEN = None
   SECRET_KEY = "test-secret-key-for-testing-only"
   JWT_SECRET_KEY = SECRET_KEY
   JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+  # HASH NA PRÓPRIA THREAD PARA NÃO SUBIR PROCESSOS NOS TESTES
+  PASSWORD_HASH_WORKERS = 0
+  ACCOUNT_DELETION_ASYNC = False
 
 
 
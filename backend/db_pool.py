@@ -0,0 +1,130 @@
+"""
+POOL DE CONEXÕES INSTRUMENTADO.
+
+InstrumentedQueuePool É UM QueuePool QUE MEDE QUANTO TEMPO CADA CHECKOUT
+ESPEROU POR UMA CONEXÃO (HISTOGRAMA), QUANTAS VEZES FOI PRECISO ABRIR UMA
+CONEXÃO DE OVERFLOW E QUANTOS CHECKOUTS ESTOURARAM O TIMEOUT. COM ESSES DADOS
+E OS VALORES ATUAIS DO POOL (EM USO, LIVRES, OVERFLOW) DÁ PARA DIMENSIONAR
+DB_POOL_SIZE / DB_MAX_OVERFLOW POR WORKER A PARTIR DE MEDIÇÕES.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# LIMITES SUPERIORES (EM SEGUNDOS) DOS BUCKETS DO HISTOGRAMA DE ESPERA NO CHECKOUT
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolStats:
+    """CONTADORES DO POOL NESTE PROCESSO (THREAD-SAFE)."""
+
+    def __init__(self, buckets: tuple[float, ...] = CHECKOUT_WAIT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            # UMA POSIÇÃO POR BUCKET + A ÚLTIMA PARA "ACIMA DO MAIOR LIMITE" (+Inf)
+            self._bucket_counts = [0] * (len(self.buckets) + 1)
+            self.wait_sum = 0.0
+            self.checkouts = 0
+            self.overflow_events = 0
+            self.timeouts = 0
+
+    def record_checkout(self, waited: float, overflow: bool) -> None:
+        with self._lock:
+            self._bucket_counts[bisect_left(self.buckets, waited)] += 1
+            self.wait_sum += waited
+            self.checkouts += 1
+            if overflow:
+                self.overflow_events += 1
+
+    def record_timeout(self, waited: float) -> None:
+        with self._lock:
+            self._bucket_counts[bisect_left(self.buckets, waited)] += 1
+            self.wait_sum += waited
+            self.timeouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """HISTOGRAMA NO FORMATO CUMULATIVO DO PROMETHEUS (le -> CONTAGEM ATÉ O LIMITE)."""
+        with self._lock:
+            cumulative = []
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), self._bucket_counts):
+                running += count
+                cumulative.append({"le": "+Inf" if bound == float("inf") else bound, "count": running})
+            return {
+                "checkouts": self.checkouts,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "checkout_wait_seconds": {
+                    "buckets": cumulative,
+                    "sum": round(self.wait_sum, 6),
+                    "count": running,
+                },
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool QUE REGISTRA O TEMPO DE ESPERA DE CADA CHECKOUT EM pool_stats."""
+
+    _depth = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get CHAMA A SI MESMO EM ALGUNS CAMINHOS; MEDIR SÓ A CHAMADA EXTERNA
+        if getattr(self._depth, "active", False):
+            return super()._do_get()
+
+        self._depth.active = True
+        self._depth.overflow = False
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_timeout(time.perf_counter() - start)
+            raise
+        finally:
+            self._depth.active = False
+
+        pool_stats.record_checkout(time.perf_counter() - start, self._depth.overflow)
+        return entry
+
+    def _inc_overflow(self) -> bool:
+        # MESMA LÓGICA DO QueuePool._inc_overflow, MAS DECIDINDO SOB O LOCK SE A CONEXÃO QUE ESTA
+        # THREAD VAI CRIAR PASSA DO pool_size (LER self._overflow DEPOIS CONFUNDIRIA AS THREADS)
+        with self._overflow_lock:
+            if self._max_overflow != -1 and self._overflow >= self._max_overflow:
+                return False
+            self._overflow += 1
+            self._depth.overflow = self._overflow > 0
+            return True
+
+
+def pool_status(engine: Optional[Engine]) -> dict[str, Any]:
+    """ESTADO ATUAL DO POOL DO ENGINE MAIS OS CONTADORES ACUMULADOS."""
+    status: dict[str, Any] = {"pool_class": None}
+    pool = engine.pool if engine is not None else None
+    if pool is not None:
+        status["pool_class"] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    status.update(pool_stats.snapshot())
+    return status
@@ -1,9 +1,21 @@
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .read_replica import RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+# RoutingSession ENVIA AS LEITURAS DOS HANDLERS @replica_read PARA O BIND "replica"
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 jwt = JWTManager()
 
 
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+  # SQLITE SÓ APLICA FOREIGN KEYS (E ON DELETE CASCADE / SET NULL) COM ESTE PRAGMA
+  if isinstance(dbapi_connection, sqlite3.Connection):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
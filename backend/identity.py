@@ -0,0 +1,60 @@
+"""
+IDENTIDADE DO USUÁRIO EMBUTIDA NO TOKEN JWT.
+
+OS TOKENS DE ACESSO CARREGAM AS INFORMAÇÕES IMUTÁVEIS QUE AS ROTAS PRECISAM
+(ID, NOME, PERFIL E BITMASK DE PAPÉIS), ENTÃO A MAIORIA DAS REQUISIÇÕES NÃO
+PRECISA BUSCAR O USUÁRIO NO BANCO.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from .models import User, role_flags_from_perfil
+
+
+def identity_claims(user: User) -> dict[str, Any]:
+    """CLAIMS ADICIONAIS GRAVADAS NO TOKEN DE ACESSO."""
+    return {
+        "nome": user.nome_completo,
+        "perfil": user.perfil,
+        "role": user.role,
+        "roles": user.role_flags,
+    }
+
+
+class CurrentUser:
+    """
+    USUÁRIO DA REQUISIÇÃO MONTADO A PARTIR DAS CLAIMS DO TOKEN.
+
+    ATRIBUTOS PRESENTES NO TOKEN SÃO RESPONDIDOS SEM CONSULTA. QUALQUER OUTRO
+    ATRIBUTO (EMAIL, RELACIONAMENTOS, check_password...) CARREGA A LINHA DO
+    BANCO NA PRIMEIRA VEZ QUE FOR ACESSADO. TOKENS ANTIGOS, SEM AS CLAIMS,
+    CAEM SEMPRE NO CAMINHO DO BANCO.
+    """
+
+    def __init__(self, user_id: int, claims: dict[str, Any]):
+        self.id = user_id
+        self._row: Optional[User] = None
+        if "nome" in claims and "perfil" in claims:
+            self.nome_completo = claims["nome"]
+            self.perfil = claims["perfil"]
+            self.role = claims.get("role")
+            # TOKENS EMITIDOS ANTES DO BITMASK NÃO TÊM "roles"
+            self.role_flags = claims.get("roles", role_flags_from_perfil(self.perfil))
+
+    def has_role(self, flag: int) -> bool:
+        """TESTA UMA FLAG DE PAPEL (ROLE_*) SEM CONSULTAR O BANCO QUANDO O TOKEN TEM AS CLAIMS."""
+        return bool((self.role_flags or 0) & flag)
+
+    @property
+    def row(self) -> User:
+        """LINHA DO USUÁRIO NO BANCO (CARREGADA SOB DEMANDA)."""
+        if self._row is None:
+            self._row = User.query.get_or_404(self.id)
+        return self._row
+
+    def __getattr__(self, name: str) -> Any:
+        # SÓ É CHAMADO PARA ATRIBUTOS QUE NÃO VIERAM NO TOKEN
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.row, name)
@@ -0,0 +1,54 @@
+"""
+PROVEDOR JSON DA APLICAÇÃO.
+
+USA `orjson` QUANDO ESTIVER INSTALADO E CAI PARA A BIBLIOTECA PADRÃO CASO CONTRÁRIO.
+EM AMBOS OS CASOS datetime/date SÃO SERIALIZADOS EM ISO 8601, ENTÃO OS
+SERIALIZADORES DAS ROTAS PODEM DEVOLVER OS OBJETOS DIRETAMENTE.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - DEPENDÊNCIA OPCIONAL
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """CONVERTE TIPOS NÃO SUPORTADOS NATIVAMENTE PELO ENCODER."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSONProvider QUE PREFERE orjson E TRATA datetime NATIVAMENTE."""
+
+    default = staticmethod(_default)
+
+    # PARÂMETROS QUE O CAMINHO orjson SABE TRADUZIR; QUALQUER OUTRO USA A STDLIB
+    _ORJSON_KWARGS = {"default", "sort_keys", "indent", "ensure_ascii", "separators"}
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or not set(kwargs) <= self._ORJSON_KWARGS:
+            kwargs.setdefault("default", self.default)
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
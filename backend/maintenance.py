@@ -0,0 +1,111 @@
+"""
+TAREFAS DE MANUTENÇÃO DO BANCO (RETENÇÃO DE NOTIFICAÇÕES E TOMBSTONES).
+
+AS EXCLUSÕES SÃO FEITAS EM LOTES PEQUENOS, CADA UM EM SUA PRÓPRIA TRANSAÇÃO,
+PARA NÃO SEGURAR LOCKS NEM CRESCER O LOG DE TRANSAÇÕES DO BANCO. COMO SÃO
+DELETEs EM MASSA (FORA DO ORM), OS TOMBSTONES DA SINCRONIZAÇÃO SÃO GRAVADOS
+AQUI EXPLICITAMENTE.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, delete, exists, insert, select
+
+from .extensions import db
+from .models import DeletionLog, Notification, ShareRequest
+
+
+def purge_read_notifications(
+    older_than_days: int,
+    batch_size: int = 500,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    REMOVE NOTIFICAÇÕES LIDAS CRIADAS HÁ MAIS DE older_than_days DIAS.
+    NOTIFICAÇÕES LIGADAS A UMA SOLICITAÇÃO DE ACESSO AINDA PENDENTE SÃO MANTIDAS.
+    RETORNA O NÚMERO DE NOTIFICAÇÕES REMOVIDAS.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    pending_share_request = exists().where(
+        and_(
+            ShareRequest.notification_id == Notification.id,
+            ShareRequest.status == "pending",
+        )
+    )
+    candidates = (
+        select(Notification.id, Notification.user_id)
+        .where(
+            Notification.lida.is_(True),
+            Notification.created_at < cutoff,
+            ~pending_share_request,
+        )
+        .order_by(Notification.id)
+        .limit(batch_size)
+    )
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = db.session.execute(candidates).all()
+        if not rows:
+            break
+
+        now = datetime.utcnow()
+        ids = [row.id for row in rows]
+        db.session.execute(
+            insert(DeletionLog),
+            [
+                {
+                    "table_name": Notification.__tablename__,
+                    "record_id": row.id,
+                    "user_id": row.user_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for row in rows
+            ],
+        )
+        db.session.execute(
+            delete(Notification).where(Notification.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.commit()
+
+        total += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+
+    return total
+
+
+def purge_deletion_log(older_than_days: int, batch_size: int = 1000) -> int:
+    """
+    REMOVE TOMBSTONES ANTIGOS. CLIENTES COM TOKEN DE SINCRONIZAÇÃO ANTERIOR AO
+    HORIZONTE RECEBEM O ESTADO COMPLETO (VER SYNC_TOMBSTONE_RETENTION_DAYS).
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    candidates = (
+        select(DeletionLog.id)
+        .where(DeletionLog.created_at < cutoff)
+        .order_by(DeletionLog.id)
+        .limit(batch_size)
+    )
+
+    total = 0
+    while True:
+        ids = db.session.execute(candidates).scalars().all()
+        if not ids:
+            break
+        db.session.execute(
+            delete(DeletionLog).where(DeletionLog.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.commit()
+        total += len(ids)
+        if len(ids) < batch_size:
+            break
+
+    return total
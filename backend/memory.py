@@ -0,0 +1,158 @@
+"""
+INSTRUMENTAÇÃO DE MEMÓRIA DOS WORKERS (tracemalloc).
+
+OS SNAPSHOTS FICAM NO PRÓPRIO PROCESSO (NO MÁXIMO MEMORY_SNAPSHOT_LIMIT) E SÃO
+COMPARADOS DOIS A DOIS PARA MOSTRAR ONDE A MEMÓRIA CRESCEU. O tracemalloc SÓ É
+LIGADO QUANDO O PRIMEIRO SNAPSHOT É PEDIDO (OU COM REQUEST_TIMING_MEMORY), POIS
+DEIXA AS ALOCAÇÕES MAIS LENTAS; stop_tracing DESLIGA E DESCARTA OS SNAPSHOTS.
+
+USADO POR /api/admin/memory* E PELO COMANDO `flask memory-profile`.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Any, Optional
+
+from .cache import cache
+
+# ALOCAÇÕES DO PRÓPRIO tracemalloc E DO IMPORT NÃO INTERESSAM NO RELATÓRIO
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_snapshots: dict[int, tuple[datetime, tracemalloc.Snapshot]] = {}
+_next_id = 1
+
+
+def rss_bytes() -> Optional[int]:
+    """MEMÓRIA RESIDENTE ATUAL DO PROCESSO (LINUX), OU O PICO NOS DEMAIS SISTEMAS."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - WINDOWS
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss É EM KB NO LINUX E EM BYTES NO MACOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def start_tracing(frames: int = 1) -> bool:
+    """LIGA O tracemalloc. RETORNA True SE ELE FOI LIGADO AGORA."""
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(frames)
+    return True
+
+
+def stop_tracing() -> None:
+    """DESLIGA O tracemalloc E DESCARTA OS SNAPSHOTS GUARDADOS."""
+    with _lock:
+        _snapshots.clear()
+    tracemalloc.stop()
+
+
+def take_snapshot(limit: int = 5, frames: int = 1) -> int:
+    """TIRA UM SNAPSHOT (LIGANDO O tracemalloc SE PRECISO) E RETORNA O ID. GUARDA OS `limit` MAIS RECENTES."""
+    global _next_id
+    start_tracing(frames)
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    with _lock:
+        snapshot_id = _next_id
+        _next_id += 1
+        _snapshots[snapshot_id] = (datetime.utcnow(), snapshot)
+        for old_id in sorted(_snapshots)[:-limit]:
+            del _snapshots[old_id]
+    return snapshot_id
+
+
+def get_snapshot(snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+    with _lock:
+        entry = _snapshots.get(snapshot_id)
+    return entry[1] if entry else None
+
+
+def list_snapshots() -> list[dict[str, Any]]:
+    with _lock:
+        return [{"id": snapshot_id, "taken_at": taken_at} for snapshot_id, (taken_at, _) in sorted(_snapshots.items())]
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, limit: int = 20, group_by: str = "lineno") -> list[dict[str, Any]]:
+    """LOCAIS QUE MAIS ALOCARAM MEMÓRIA AINDA VIVA NO SNAPSHOT."""
+    return [
+        {
+            "site": _format_traceback(stat.traceback),
+            "size_kib": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics(group_by)[:limit]
+    ]
+
+
+def diff_sites(
+    older: tracemalloc.Snapshot,
+    newer: tracemalloc.Snapshot,
+    limit: int = 20,
+    group_by: str = "lineno",
+) -> list[dict[str, Any]]:
+    """LOCAIS COM MAIOR CRESCIMENTO ENTRE DOIS SNAPSHOTS."""
+    return [
+        {
+            "site": _format_traceback(stat.traceback),
+            "size_diff_kib": round(stat.size_diff / 1024, 1),
+            "size_kib": round(stat.size / 1024, 1),
+            "count_diff": stat.count_diff,
+        }
+        for stat in newer.compare_to(older, group_by)[:limit]
+    ]
+
+
+def _format_traceback(traceback: tracemalloc.Traceback) -> str:
+    # MAIS DE UM FRAME SÓ COM MEMORY_TRACE_FRAMES > 1 E group_by=traceback
+    return " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in traceback)
+
+
+def _approx_size(value: Any, depth: int = 0) -> int:
+    """TAMANHO APROXIMADO DE UM VALOR DO CACHE (CORPOS PRÉ-SERIALIZADOS E COLEÇÕES RASAS)."""
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if depth < 3:
+        if isinstance(value, dict):
+            size += sum(_approx_size(k, depth + 1) + _approx_size(v, depth + 1) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set)):
+            size += sum(_approx_size(item, depth + 1) for item in value)
+    return size
+
+
+def cache_usage() -> dict[str, dict[str, int]]:
+    """ENTRADAS E BYTES APROXIMADOS DO CACHE EM MEMÓRIA POR NAMESPACE."""
+    return cache.namespace_usage(_approx_size)
+
+
+def memory_status() -> dict[str, Any]:
+    """RESUMO DA MEMÓRIA DO PROCESSO PARA A API E O CLI."""
+    current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {
+        "pid": os.getpid(),
+        "rss_bytes": rss_bytes(),
+        "tracing": tracemalloc.is_tracing(),
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "snapshots": list_snapshots(),
+        "cache": cache_usage(),
+    }
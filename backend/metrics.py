@@ -0,0 +1,369 @@
+"""
+MÉTRICAS NO FORMATO DE TEXTO DO PROMETHEUS (GET /metrics).
+
+DESLIGADAS POR PADRÃO: ATIVE COM METRICS_ENABLED=true E, FORA DE UMA REDE
+INTERNA, DEFINA METRICS_TOKEN PARA EXIGIR "Authorization: Bearer <token>".
+
+CADA PROCESSO MANTÉM OS CONTADORES E HISTOGRAMAS EM MEMÓRIA. COM VÁRIOS WORKERS
+(GUNICORN), DEFINA METRICS_DIR: CADA WORKER GRAVA UM ARQUIVO metrics-<pid>.json
+NESSE DIRETÓRIO (NO MÁXIMO A CADA METRICS_FLUSH_INTERVAL SEGUNDOS) E QUEM
+RESPONDE /metrics SOMA OS ARQUIVOS DE TODOS OS WORKERS. CONTADORES DE WORKERS
+QUE JÁ TERMINARAM CONTINUAM NA SOMA; GAUGES (POOL, CACHE) SÓ DE PROCESSOS VIVOS.
+O DIRETÓRIO DEVE SER ESVAZIADO A CADA DEPLOY, ANTES DE SUBIR OS WORKERS.
+
+MÉTRICAS:
+- http_requests_total / http_request_duration_seconds POR endpoint, method E status
+- db_pool_* (ESTADO DO POOL E ESPERA NO CHECKOUT, VER db_pool.py)
+- cache_entries POR namespace, cache_hits_total, cache_misses_total
+- notifications_created_total POR tipo E notifications_coalesced_total
+- password_hash_queue_depth E password_hash_rejected_total (VER passwords.py)
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Iterable, Optional
+
+from flask import Flask, Response, current_app, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .cache import cache
+from .db_pool import CHECKOUT_WAIT_BUCKETS, pool_stats
+from .models import Notification
+from .passwords import hasher_stats
+
+# LIMITES (SEGUNDOS) DOS BUCKETS DE LATÊNCIA DAS REQUISIÇÕES
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# NOME -> (TIPO, DESCRIÇÃO)
+METRICS = {
+    "http_requests_total": ("counter", "Requisições HTTP atendidas."),
+    "http_request_duration_seconds": ("histogram", "Duração das requisições HTTP em segundos."),
+    "notifications_created_total": ("counter", "Notificações criadas."),
+    "notifications_coalesced_total": ("counter", "Pedidos de ajuda agrupados em uma notificação existente."),
+    "cache_hits_total": ("counter", "Leituras do cache em memória que encontraram o valor."),
+    "cache_misses_total": ("counter", "Leituras do cache em memória sem valor (ausente ou expirado)."),
+    "cache_entries": ("gauge", "Entradas no cache em memória por namespace."),
+    "db_pool_size": ("gauge", "Tamanho configurado do pool de conexões."),
+    "db_pool_checked_out": ("gauge", "Conexões em uso."),
+    "db_pool_checked_in": ("gauge", "Conexões livres no pool."),
+    "db_pool_overflow": ("gauge", "Conexões de overflow abertas."),
+    "db_pool_checkouts_total": ("counter", "Checkouts de conexão concluídos."),
+    "db_pool_overflow_total": ("counter", "Checkouts que abriram uma conexão de overflow."),
+    "db_pool_timeouts_total": ("counter", "Checkouts que estouraram DB_POOL_TIMEOUT."),
+    "db_pool_checkout_wait_seconds": ("histogram", "Espera por uma conexão livre no checkout, em segundos."),
+    "password_hash_queue_depth": ("gauge", "Hashes de senha em andamento ou aguardando um processo do pool."),
+    "password_hash_rejected_total": ("counter", "Hashes de senha recusados com o pool saturado (PasswordHashBusy)."),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """CONTADORES E HISTOGRAMAS DESTE PROCESSO (THREAD-SAFE)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        # (NOME, LABELS) -> (LIMITES, CONTAGEM POR BUCKET + "+Inf", SOMA)
+        self._histograms: dict[tuple[str, Labels], tuple[tuple[float, ...], list[int], float]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, buckets: tuple[float, ...], **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = (buckets, [0] * (len(buckets) + 1), 0.0)
+            bounds, counts, total = entry
+            counts[bisect_left(bounds, value)] += 1
+            self._histograms[key] = (bounds, counts, total + value)
+
+    def samples(self) -> dict[str, list]:
+        """VALORES ATUAIS, COM HISTOGRAMAS CUMULATIVOS (FORMATO GRAVADO EM METRICS_DIR)."""
+        with self._lock:
+            counters = [[name, list(labels), value] for (name, labels), value in self._counters.items()]
+            histograms = [
+                [name, list(labels), list(bounds), _cumulative(counts), total]
+                for (name, labels), (bounds, counts, total) in self._histograms.items()
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+
+registry = MetricsRegistry()
+
+
+def _cumulative(counts: Iterable[int]) -> list[int]:
+    result, running = [], 0
+    for count in counts:
+        running += count
+        result.append(running)
+    return result
+
+
+def record_notifications(tipo: str, created: int = 0, coalesced: int = 0) -> None:
+    """CONTA NOTIFICAÇÕES CRIADAS FORA DO FLUSH DO ORM (EX.: INSERT EM LOTE DO PEDIDO DE AJUDA)."""
+    if created:
+        registry.inc("notifications_created_total", created, tipo=tipo)
+    if coalesced:
+        registry.inc("notifications_coalesced_total", coalesced, tipo=tipo)
+
+
+# ========== MÉTRICAS CALCULADAS NA COLETA (POOL E CACHE) ==========
+
+def _process_samples() -> dict[str, list]:
+    """MÉTRICAS DO REGISTRO MAIS AS LIDAS NA HORA DO POOL E DO CACHE."""
+    from .db_pool import pool_status
+    from .extensions import db
+
+    data = registry.samples()
+    gauges: list = []
+
+    for bind, engine in db.engines.items():
+        status = pool_status(engine)
+        if "size" not in status:
+            continue
+        labels = [["bind", bind or "default"]]
+        gauges.extend([
+            ["db_pool_size", labels, status["size"]],
+            ["db_pool_checked_out", labels, status["checked_out"]],
+            ["db_pool_checked_in", labels, status["checked_in"]],
+            ["db_pool_overflow", labels, status["overflow"]],
+        ])
+
+    snapshot = pool_stats.snapshot()
+    data["counters"].extend([
+        ["db_pool_checkouts_total", [], snapshot["checkouts"]],
+        ["db_pool_overflow_total", [], snapshot["overflow_events"]],
+        ["db_pool_timeouts_total", [], snapshot["timeouts"]],
+        ["cache_hits_total", [], cache.hits],
+        ["cache_misses_total", [], cache.misses],
+    ])
+    wait = snapshot["checkout_wait_seconds"]
+    data["histograms"].append([
+        "db_pool_checkout_wait_seconds",
+        [],
+        list(CHECKOUT_WAIT_BUCKETS),
+        [bucket["count"] for bucket in wait["buckets"]],
+        wait["sum"],
+    ])
+
+    gauges.extend(
+        ["cache_entries", [["namespace", namespace]], count]
+        for namespace, count in cache.namespace_counts().items()
+    )
+    hashing = hasher_stats()
+    data["counters"].append(["password_hash_rejected_total", [], hashing["rejected_total"]])
+    gauges.append(["password_hash_queue_depth", [], hashing["queue_depth"]])
+
+    data["gauges"] = gauges
+    return data
+
+
+# ========== AGREGAÇÃO ENTRE WORKERS (METRICS_DIR) ==========
+
+_last_flush = 0.0
+
+
+def _process_file(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics-{pid}.json")
+
+
+def flush_to_dir(directory: str) -> None:
+    """GRAVA AS MÉTRICAS DESTE PROCESSO EM METRICS_DIR (ESCRITA ATÔMICA)."""
+    global _last_flush
+    os.makedirs(directory, exist_ok=True)
+    path = _process_file(directory, os.getpid())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump({"pid": os.getpid(), **_process_samples()}, fh)
+    os.replace(tmp_path, path)
+    _last_flush = time.monotonic()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _load_all(directory: str) -> list[dict]:
+    results = []
+    for path in glob.glob(os.path.join(directory, "metrics-*.json")):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                results.append(json.load(fh))
+        except (OSError, ValueError):
+            # ARQUIVO REMOVIDO OU SENDO SUBSTITUÍDO NESTE INSTANTE
+            continue
+    return results
+
+
+def _aggregate(processes: list[dict]) -> dict[str, dict]:
+    counters: dict[tuple[str, Labels], float] = {}
+    gauges: dict[tuple[str, Labels], float] = {}
+    histograms: dict[tuple[str, Labels], list] = {}
+
+    for data in processes:
+        alive = data.get("pid") == os.getpid() or _pid_alive(data.get("pid", 0))
+        for name, labels, value in data.get("counters", []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0) + value
+        if alive:
+            for name, labels, value in data.get("gauges", []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                gauges[key] = gauges.get(key, 0) + value
+        for name, labels, bounds, cumulative, total in data.get("histograms", []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            current = histograms.get(key)
+            if current is None:
+                histograms[key] = [bounds, list(cumulative), total]
+            else:
+                current[1] = [a + b for a, b in zip(current[1], cumulative)]
+                current[2] += total
+
+    return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+
+# ========== FORMATO DE TEXTO ==========
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(aggregated: dict[str, dict]) -> str:
+    by_name: dict[str, list[str]] = {}
+
+    for (name, labels), value in sorted(aggregated["counters"].items()):
+        by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    for (name, labels), value in sorted(aggregated["gauges"].items()):
+        by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    for (name, labels), (bounds, cumulative, total) in sorted(aggregated["histograms"].items()):
+        lines = by_name.setdefault(name, [])
+        for bound, count in zip(list(bounds) + ["+Inf"], cumulative):
+            le = bound if bound == "+Inf" else _format_value(bound)
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative[-1] if cumulative else 0}")
+
+    output = []
+    for name in sorted(by_name):
+        kind, description = METRICS.get(name, ("untyped", ""))
+        output.append(f"# HELP {name} {description}")
+        output.append(f"# TYPE {name} {kind}")
+        output.extend(by_name[name])
+    return "\n".join(output) + "\n"
+
+
+def collect() -> str:
+    """TEXTO DO /metrics: ESTE PROCESSO OU A SOMA DE TODOS OS WORKERS EM METRICS_DIR."""
+    directory = current_app.config.get("METRICS_DIR")
+    if directory:
+        flush_to_dir(directory)
+        return render(_aggregate(_load_all(directory)))
+    return render(_aggregate([{"pid": os.getpid(), **_process_samples()}]))
+
+
+# ========== HOOKS ==========
+
+_METRICS_START_KEY = "metrics.start"
+
+
+def _start_request() -> None:
+    request.environ[_METRICS_START_KEY] = time.perf_counter()
+
+
+def _record_request(response: Response) -> Response:
+    start = request.environ.get(_METRICS_START_KEY)
+    if start is None:
+        return response
+    endpoint = request.endpoint or "unmatched"
+    status = str(response.status_code)
+    registry.inc("http_requests_total", endpoint=endpoint, method=request.method, status=status)
+    registry.observe(
+        "http_request_duration_seconds",
+        time.perf_counter() - start,
+        REQUEST_DURATION_BUCKETS,
+        endpoint=endpoint,
+        method=request.method,
+        status=status,
+    )
+
+    config = current_app.config
+    directory = config.get("METRICS_DIR")
+    if directory and time.monotonic() - _last_flush >= config.get("METRICS_FLUSH_INTERVAL", 2.0):
+        try:
+            flush_to_dir(directory)
+        except OSError:
+            current_app.logger.exception("Falha ao gravar métricas em %s", directory)
+    return response
+
+
+def _collect_created_notifications(session, flush_context):
+    tipos = [obj.tipo for obj in session.new if isinstance(obj, Notification)]
+    if tipos:
+        session.info.setdefault("notifications_created", []).extend(tipos)
+
+
+def _count_created_notifications(session):
+    for tipo in session.info.pop("notifications_created", ()):
+        registry.inc("notifications_created_total", tipo=tipo)
+
+
+def _discard_created_notifications(session):
+    session.info.pop("notifications_created", None)
+
+
+_SESSION_LISTENERS = (
+    ("after_flush", _collect_created_notifications),
+    ("after_commit", _count_created_notifications),
+    ("after_rollback", _discard_created_notifications),
+)
+
+
+def _register_session_listeners() -> None:
+    # LISTENERS DA CLASSE Session VALEM PARA O PROCESSO: REGISTRAR UMA ÚNICA VEZ
+    for identifier, listener in _SESSION_LISTENERS:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
+
+
+def init_metrics(app: Flask) -> None:
+    """REGISTRA OS HOOKS E A ROTA GET /metrics SE METRICS_ENABLED ESTIVER ATIVO (DESLIGADO POR PADRÃO)."""
+    if not app.config.get("METRICS_ENABLED", False):
+        return
+
+    _register_session_listeners()
+    app.before_request(_start_request)
+    app.after_request(_record_request)
+
+    @app.route("/metrics")
+    def metrics() -> Any:
+        token = current_app.config.get("METRICS_TOKEN")
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")
+        return Response(collect(), mimetype="text/plain; version=0.0.4; charset=utf-8")
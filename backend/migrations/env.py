@@ -97,6 +97,11 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # NO SQLITE AS MIGRAÇÕES EM MODO batch RECRIAM TABELAS; COM FKs ATIVAS O DROP
+        # DISPARARIA ON DELETE CASCADE / SET NULL NAS TABELAS DEPENDENTES
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -0,0 +1,100 @@
+"""add ON DELETE rules to foreign keys and account_deletions table
+
+Revision ID: cascade_fks_account_del
+Revises: help_request_coalesce
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'cascade_fks_account_del'
+down_revision = 'help_request_coalesce'
+branch_labels = None
+depends_on = None
+
+
+# (TABELA, COLUNA, TABELA REFERENCIADA, ON DELETE)
+FOREIGN_KEYS = [
+    ('routines', 'user_id', 'users', 'CASCADE'),
+    ('routine_steps', 'routine_id', 'routines', 'CASCADE'),
+    ('entries', 'user_id', 'users', 'CASCADE'),
+    ('boards', 'user_id', 'users', 'CASCADE'),
+    ('board_items', 'board_id', 'boards', 'CASCADE'),
+    ('shares', 'owner_id', 'users', 'CASCADE'),
+    ('shares', 'viewer_id', 'users', 'CASCADE'),
+    ('care_links', 'cuidador_id', 'users', 'CASCADE'),
+    ('care_links', 'pessoa_tea_id', 'users', 'CASCADE'),
+    ('notifications', 'user_id', 'users', 'CASCADE'),
+    ('notifications', 'care_link_id', 'care_links', 'SET NULL'),
+    ('notifications', 'share_id', 'shares', 'SET NULL'),
+    ('share_requests', 'owner_id', 'users', 'CASCADE'),
+    ('share_requests', 'viewer_id', 'users', 'CASCADE'),
+]
+
+# NOME USADO PELO batch DO SQLITE PARA FKs CRIADAS SEM NOME
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _fk_name(inspector, table, column, referred_table):
+    for fk in inspector.get_foreign_keys(table):
+        if fk['constrained_columns'] == [column] and fk['referred_table'] == referred_table:
+            return fk['name'] or f'fk_{table}_{column}_{referred_table}'
+    return None
+
+
+def _replace_foreign_keys(ondelete_enabled):
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    tables = []
+    for table, *_ in FOREIGN_KEYS:
+        if table not in tables:
+            tables.append(table)
+
+    for table in tables:
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for fk_table, column, referred_table, ondelete in FOREIGN_KEYS:
+                if fk_table != table:
+                    continue
+                name = _fk_name(inspector, table, column, referred_table)
+                if name is not None:
+                    batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(
+                    f'fk_{table}_{column}_{referred_table}',
+                    referred_table,
+                    [column],
+                    ['id'],
+                    ondelete=ondelete if ondelete_enabled else None,
+                )
+
+
+def upgrade() -> None:
+    _replace_foreign_keys(ondelete_enabled=True)
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'account_deletions' not in inspector.get_table_names():
+        op.create_table(
+            'account_deletions',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('etapa', sa.String(length=50), nullable=True),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.Column('removidos', sa.Integer(), nullable=False),
+            sa.Column('erro', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index('ix_account_deletions_user_id', 'account_deletions', ['user_id'])
+        op.create_index('ix_account_deletions_updated_at', 'account_deletions', ['updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_account_deletions_updated_at', table_name='account_deletions')
+    op.drop_index('ix_account_deletions_user_id', table_name='account_deletions')
+    op.drop_table('account_deletions')
+
+    _replace_foreign_keys(ondelete_enabled=False)
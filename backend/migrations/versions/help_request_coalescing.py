@@ -0,0 +1,41 @@
+"""add remetente_id and contador to notifications for help request coalescing
+
+Revision ID: help_request_coalesce
+Revises: share_requests_table
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'help_request_coalesce'
+down_revision = 'share_requests_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('notifications')]
+
+    with op.batch_alter_table('notifications') as batch_op:
+        if 'remetente_id' not in columns:
+            batch_op.add_column(sa.Column('remetente_id', sa.Integer(), nullable=True))
+            batch_op.create_index('ix_notifications_remetente_id', ['remetente_id'])
+            batch_op.create_foreign_key(
+                'fk_notifications_remetente_id', 'users', ['remetente_id'], ['id'], ondelete='SET NULL'
+            )
+        if 'contador' not in columns:
+            batch_op.add_column(
+                sa.Column('contador', sa.Integer(), nullable=False, server_default='1')
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('notifications') as batch_op:
+        batch_op.drop_column('contador')
+        batch_op.drop_constraint('fk_notifications_remetente_id', type_='foreignkey')
+        batch_op.drop_index('ix_notifications_remetente_id')
+        batch_op.drop_column('remetente_id')
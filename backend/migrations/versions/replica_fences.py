@@ -0,0 +1,30 @@
+"""add replica_fences table for read-your-writes with a read replica
+
+Revision ID: replica_fences
+Revises: cascade_fks_account_del
+Create Date: 2026-10-19 16:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'replica_fences'
+down_revision = 'cascade_fks_account_del'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'replica_fences' not in inspector.get_table_names():
+        op.create_table(
+            'replica_fences',
+            sa.Column('user_id', sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column('written_at', sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('replica_fences')
@@ -0,0 +1,150 @@
+"""add share_requests table and backfill it from share_request notifications
+
+Revision ID: share_requests_table
+Revises: users_role_flags
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'share_requests_table'
+down_revision = 'users_role_flags'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+
+# FORMATOS ANTIGOS GRAVADOS NA MENSAGEM DA NOTIFICAÇÃO
+VIEWER_ID_PATTERNS = [
+    re.compile(r'\|\|\|VIEWER_ID:(\d+)'),
+    re.compile(r'\[VIEWER_ID:(\d+)\]'),
+]
+EMAIL_PATTERN = re.compile(r'\(([^)]+@[^)]+)\)')
+
+notifications = sa.table(
+    'notifications',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('tipo', sa.String),
+    sa.column('mensagem', sa.Text),
+    sa.column('lida', sa.Boolean),
+    sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime),
+)
+users = sa.table('users', sa.column('id', sa.Integer), sa.column('email', sa.String))
+shares = sa.table('shares', sa.column('owner_id', sa.Integer), sa.column('viewer_id', sa.Integer))
+
+
+def _parse_viewer_id(bind, mensagem, email_cache):
+    for pattern in VIEWER_ID_PATTERNS:
+        match = pattern.search(mensagem)
+        if match:
+            return int(match.group(1))
+    match = EMAIL_PATTERN.search(mensagem)
+    if not match:
+        return None
+    email = match.group(1)
+    if email not in email_cache:
+        email_cache[email] = bind.execute(
+            sa.select(users.c.id).where(users.c.email == email)
+        ).scalar()
+    return email_cache[email]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if 'share_requests' not in inspector.get_table_names():
+        op.create_table(
+            'share_requests',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('viewer_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('status', sa.String(length=50), nullable=False, server_default='pending'),
+            sa.Column(
+                'notification_id',
+                sa.Integer(),
+                sa.ForeignKey('notifications.id', ondelete='SET NULL'),
+                nullable=True,
+            ),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.UniqueConstraint('owner_id', 'viewer_id', name='unique_share_request'),
+        )
+        op.create_index('ix_share_requests_viewer_id', 'share_requests', ['viewer_id'])
+        op.create_index('ix_share_requests_notification_id', 'share_requests', ['notification_id'])
+        op.create_index('ix_share_requests_updated_at', 'share_requests', ['updated_at'])
+
+    share_requests = sa.table(
+        'share_requests',
+        sa.column('owner_id', sa.Integer),
+        sa.column('viewer_id', sa.Integer),
+        sa.column('status', sa.String),
+        sa.column('notification_id', sa.Integer),
+        sa.column('created_at', sa.DateTime),
+        sa.column('updated_at', sa.DateTime),
+    )
+
+    accepted_pairs = {
+        (row.owner_id, row.viewer_id)
+        for row in bind.execute(sa.select(shares.c.owner_id, shares.c.viewer_id))
+        if row.viewer_id is not None
+    }
+    existing_pairs = {
+        (row.owner_id, row.viewer_id)
+        for row in bind.execute(sa.select(share_requests.c.owner_id, share_requests.c.viewer_id))
+    }
+
+    # PERCORRER AS NOTIFICAÇÕES EM LOTES (KEYSET POR id); A MAIS RECENTE DE CADA PAR PREVALECE
+    pending_rows = {}
+    email_cache = {}
+    last_id = 0
+    while True:
+        batch = bind.execute(
+            sa.select(notifications)
+            .where(notifications.c.tipo == 'share_request', notifications.c.id > last_id)
+            .order_by(notifications.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        for notif in batch:
+            viewer_id = _parse_viewer_id(bind, notif.mensagem or '', email_cache)
+            if viewer_id is None:
+                continue
+            pair = (notif.user_id, viewer_id)
+            if pair in existing_pairs:
+                continue
+            if pair in accepted_pairs:
+                status = 'accepted'
+            elif notif.lida:
+                status = 'rejected'
+            else:
+                status = 'pending'
+            pending_rows[pair] = {
+                'owner_id': notif.user_id,
+                'viewer_id': viewer_id,
+                'status': status,
+                'notification_id': notif.id,
+                'created_at': notif.created_at,
+                'updated_at': notif.updated_at,
+            }
+
+    rows = list(pending_rows.values())
+    for start in range(0, len(rows), BATCH_SIZE):
+        op.bulk_insert(share_requests, rows[start:start + BATCH_SIZE])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_share_requests_updated_at', table_name='share_requests')
+    op.drop_index('ix_share_requests_notification_id', table_name='share_requests')
+    op.drop_index('ix_share_requests_viewer_id', table_name='share_requests')
+    op.drop_table('share_requests')
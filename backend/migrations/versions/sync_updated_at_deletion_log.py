@@ -0,0 +1,65 @@
+"""add updated_at indexes and deletion_log table for delta sync
+
+Revision ID: sync_updated_at_idx
+Revises: add_share_id_notif
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'sync_updated_at_idx'
+down_revision = 'add_share_id_notif'
+branch_labels = None
+depends_on = None
+
+
+TABLES = [
+    'users',
+    'routines',
+    'routine_steps',
+    'entries',
+    'boards',
+    'board_items',
+    'shares',
+    'care_links',
+    'notifications',
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # Índices em updated_at para consultas "alterados desde"
+    for table in TABLES:
+        existing_indexes = [idx['name'] for idx in inspector.get_indexes(table)]
+        index_name = f'ix_{table}_updated_at'
+        if index_name not in existing_indexes:
+            op.create_index(index_name, table, ['updated_at'])
+
+    # Tabela de tombstones para registros removidos
+    if 'deletion_log' not in inspector.get_table_names():
+        op.create_table(
+            'deletion_log',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('table_name', sa.String(length=50), nullable=False),
+            sa.Column('record_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index('ix_deletion_log_updated_at', 'deletion_log', ['updated_at'])
+        op.create_index(
+            'ix_deletion_log_user_id_created_at', 'deletion_log', ['user_id', 'created_at']
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_deletion_log_user_id_created_at', table_name='deletion_log')
+    op.drop_index('ix_deletion_log_updated_at', table_name='deletion_log')
+    op.drop_table('deletion_log')
+
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
@@ -0,0 +1,49 @@
+"""add indexed role_flags bitmask to users, backfilled from perfil
+
+Revision ID: users_role_flags
+Revises: sync_updated_at_idx
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'users_role_flags'
+down_revision = 'sync_updated_at_idx'
+branch_labels = None
+depends_on = None
+
+
+# MESMOS VALORES DE models.ROLE_* (NÃO IMPORTAR MODELS EM MIGRAÇÕES)
+ROLE_FLAGS = [
+    ('cuidador', 1),
+    ('tea', 2),
+    ('profissional', 4),
+    ('administrador', 8),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('users')]
+
+    if 'role_flags' not in columns:
+        op.add_column(
+            'users',
+            sa.Column('role_flags', sa.Integer(), nullable=False, server_default='0'),
+        )
+        op.create_index('ix_users_role_flags', 'users', ['role_flags'])
+
+    # BACKFILL EM UM ÚNICO UPDATE, COM A MESMA REGRA DE SUBSTRING DE role_flags_from_perfil
+    flags_expr = ' + '.join(
+        f"(CASE WHEN LOWER(perfil) LIKE '%{term}%' THEN {flag} ELSE 0 END)"
+        for term, flag in ROLE_FLAGS
+    )
+    op.execute(f"UPDATE users SET role_flags = {flags_expr} WHERE perfil IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_role_flags', table_name='users')
+    op.drop_column('users', 'role_flags')
@@ -1,9 +1,11 @@
 from datetime import datetime
 from typing import List, Optional
 
-from werkzeug.security import check_password_hash, generate_password_hash
-
+from sqlalchemy import event, select
+from sqlalchemy.ext.hybrid import hybrid_method
+from sqlalchemy.orm import Session, validates
 from .extensions import db
+from .passwords import hash_password, needs_rehash, verify_password
 
 
 class BaseModel(db.Model):
@@ -12,10 +14,32 @@ class BaseModel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True
     )
 
 
+# FLAGS DE PAPEL (BITMASK EM users.role_flags), DERIVADAS DO TEXTO LIVRE DE users.perfil
+ROLE_CUIDADOR = 1
+ROLE_PESSOA_TEA = 2
+ROLE_PROFISSIONAL = 4
+ROLE_ADMIN = 8
+
+
+def role_flags_from_perfil(perfil: Optional[str]) -> int:
+    """CONVERTE O PERFIL EM BITMASK. MANTÉM A MESMA REGRA DE SUBSTRING USADA ANTES NAS ROTAS."""
+    perfil_lower = (perfil or "").lower()
+    flags = 0
+    if "cuidador" in perfil_lower:
+        flags |= ROLE_CUIDADOR
+    if "tea" in perfil_lower:
+        flags |= ROLE_PESSOA_TEA
+    if "profissional" in perfil_lower:
+        flags |= ROLE_PROFISSIONAL
+    if "administrador" in perfil_lower:
+        flags |= ROLE_ADMIN
+    return flags
+
+
 class User(BaseModel):
     __tablename__ = "users"
 
@@ -24,53 +48,107 @@ class User(BaseModel):
     role = db.Column(db.String(50), nullable=False, default="viewer")
     nome_completo = db.Column(db.String(255), nullable=False)
     perfil = db.Column(db.String(100))
+    role_flags = db.Column(db.Integer, nullable=False, default=0, server_default="0", index=True)
     preferencias_sensoriais = db.Column(db.Text)
 
-    routines = db.relationship("Routine", back_populates="user", cascade="all, delete-orphan")
-    entries = db.relationship("Entry", back_populates="user", cascade="all, delete-orphan")
-    boards = db.relationship("Board", back_populates="user", cascade="all, delete-orphan")
+    routines = db.relationship(
+        "Routine",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    entries = db.relationship(
+        "Entry",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    boards = db.relationship(
+        "Board",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     shares_owned = db.relationship(
         "Share",
         foreign_keys="Share.owner_id",
         back_populates="owner",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     shares_received = db.relationship(
         "Share",
         foreign_keys="Share.viewer_id",
         back_populates="viewer",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     care_links_as_cuidador = db.relationship(
         "CareLink",
         foreign_keys="CareLink.cuidador_id",
         back_populates="cuidador",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     care_links_as_pessoa_tea = db.relationship(
         "CareLink",
         foreign_keys="CareLink.pessoa_tea_id",
         back_populates="pessoa_tea",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    share_requests_owned = db.relationship(
+        "ShareRequest",
+        foreign_keys="ShareRequest.owner_id",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    share_requests_sent = db.relationship(
+        "ShareRequest",
+        foreign_keys="ShareRequest.viewer_id",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     notifications = db.relationship(
         "Notification",
         back_populates="user",
+        foreign_keys="Notification.user_id",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="Notification.created_at.desc()",
     )
 
+    @validates("perfil")
+    def _sync_role_flags(self, key: str, perfil: Optional[str]) -> Optional[str]:
+        # MANTER role_flags SEMPRE CONSISTENTE COM perfil
+        self.role_flags = role_flags_from_perfil(perfil)
+        return perfil
+
+    @hybrid_method
+    def has_role(self, flag: int) -> bool:
+        """TESTA UMA FLAG DE PAPEL. TAMBÉM FUNCIONA EM CONSULTAS: User.has_role(ROLE_CUIDADOR)."""
+        return bool((self.role_flags or 0) & flag)
+
+    @has_role.expression
+    def has_role(cls, flag: int):
+        return cls.role_flags.op("&")(flag) != 0
+
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return needs_rehash(self.password_hash)
 
 
 class Routine(BaseModel):
     __tablename__ = "routines"
 
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     titulo = db.Column(db.String(255), nullable=False)
     lembrete = db.Column(db.String(120))
 
@@ -79,6 +157,7 @@ class Routine(BaseModel):
         "RoutineStep",
         back_populates="routine",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="RoutineStep.ordem",
     )
 
@@ -86,7 +165,9 @@ class Routine(BaseModel):
 class RoutineStep(BaseModel):
     __tablename__ = "routine_steps"
 
-    routine_id = db.Column(db.Integer, db.ForeignKey("routines.id"), nullable=False, index=True)
+    routine_id = db.Column(
+        db.Integer, db.ForeignKey("routines.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     descricao = db.Column(db.String(500), nullable=False)
     duracao = db.Column(db.Integer)
     ordem = db.Column(db.Integer, nullable=False, default=0)
@@ -97,7 +178,9 @@ class RoutineStep(BaseModel):
 class Entry(BaseModel):
     __tablename__ = "entries"
 
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     tipo = db.Column(db.String(50), nullable=False)
     texto = db.Column(db.Text, nullable=False)
     midia_url = db.Column(db.String(255))
@@ -121,17 +204,26 @@ class Entry(BaseModel):
 class Board(BaseModel):
     __tablename__ = "boards"
 
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     nome = db.Column(db.String(255), nullable=False)
 
     user = db.relationship("User", back_populates="boards")
-    items = db.relationship("BoardItem", back_populates="board", cascade="all, delete-orphan")
+    items = db.relationship(
+        "BoardItem",
+        back_populates="board",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
 
 class BoardItem(BaseModel):
     __tablename__ = "board_items"
 
-    board_id = db.Column(db.Integer, db.ForeignKey("boards.id"), nullable=False, index=True)
+    board_id = db.Column(
+        db.Integer, db.ForeignKey("boards.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     texto = db.Column(db.String(500), nullable=False)
     img_url = db.Column(db.String(255))
     audio_url = db.Column(db.String(255))
@@ -144,8 +236,10 @@ class BoardItem(BaseModel):
 class Share(BaseModel):
     __tablename__ = "shares"
 
-    owner_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
-    viewer_id = db.Column(db.Integer, db.ForeignKey("users.id"), index=True)
+    owner_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    viewer_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), index=True)
     viewer_email = db.Column(db.String(255), nullable=False)
     escopo = db.Column(db.String(50), nullable=False, default="read")
     expira_em = db.Column(db.DateTime)
@@ -157,12 +251,16 @@ class Share(BaseModel):
 class CareLink(BaseModel):
     __tablename__ = "care_links"
 
-    cuidador_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
-    pessoa_tea_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    cuidador_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    pessoa_tea_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     status = db.Column(db.String(50), nullable=False, default="pending")  # pending, accepted, rejected
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True
     )
 
     cuidador = db.relationship("User", foreign_keys=[cuidador_id], back_populates="care_links_as_cuidador")
@@ -176,20 +274,177 @@ class CareLink(BaseModel):
 class Notification(BaseModel):
     __tablename__ = "notifications"
 
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     tipo = db.Column(db.String(50), nullable=False)  # care_link_request, care_link_accepted, share_request, share_accepted, etc.
     titulo = db.Column(db.String(255), nullable=False)
     mensagem = db.Column(db.Text, nullable=False)
     lida = db.Column(db.Boolean, default=False, nullable=False)
-    care_link_id = db.Column(db.Integer, db.ForeignKey("care_links.id"), nullable=True, index=True)
-    share_id = db.Column(db.Integer, db.ForeignKey("shares.id"), nullable=True, index=True)
+    care_link_id = db.Column(
+        db.Integer, db.ForeignKey("care_links.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    share_id = db.Column(
+        db.Integer, db.ForeignKey("shares.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    # QUEM GEROU A NOTIFICAÇÃO (USADO PARA AGRUPAR PEDIDOS DE AJUDA REPETIDOS)
+    remetente_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    contador = db.Column(db.Integer, nullable=False, default=1, server_default="1")
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True
     )
 
-    user = db.relationship("User", back_populates="notifications")
+    user = db.relationship("User", back_populates="notifications", foreign_keys=[user_id])
     care_link = db.relationship("CareLink", foreign_keys=[care_link_id])
     share = db.relationship("Share", foreign_keys=[share_id])
 
 
+
+
+class ShareRequest(BaseModel):
+    """
+    SOLICITAÇÃO DE ACESSO DE UM PROFISSIONAL (viewer) AOS DADOS DE UM CUIDADOR/PESSOA COM TEA (owner).
+    UMA LINHA POR PAR; NOVAS SOLICITAÇÕES APÓS REJEIÇÃO REUTILIZAM A MESMA LINHA.
+    """
+    __tablename__ = "share_requests"
+
+    owner_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    viewer_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status = db.Column(db.String(50), nullable=False, default="pending")  # pending, accepted, rejected
+    notification_id = db.Column(
+        db.Integer, db.ForeignKey("notifications.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+
+    owner = db.relationship("User", foreign_keys=[owner_id], overlaps="share_requests_owned")
+    viewer = db.relationship("User", foreign_keys=[viewer_id], overlaps="share_requests_sent")
+    notification = db.relationship("Notification", foreign_keys=[notification_id])
+
+    __table_args__ = (
+        db.UniqueConstraint("owner_id", "viewer_id", name="unique_share_request"),
+    )
+
+
+class DeletionLog(BaseModel):
+    """
+    REGISTRO DE EXCLUSÕES (TOMBSTONES) USADO PELA SINCRONIZAÇÃO INCREMENTAL.
+    user_id É O DONO DO REGISTRO REMOVIDO (SEM FK PARA SOBREVIVER À EXCLUSÃO DO USUÁRIO).
+    """
+    __tablename__ = "deletion_log"
+
+    table_name = db.Column(db.String(50), nullable=False)
+    record_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_deletion_log_user_id_created_at", "user_id", "created_at"),
+    )
+
+
+class AccountDeletion(BaseModel):
+    """
+    JOB DE EXCLUSÃO DE CONTA EXECUTADO EM LOTES (VER backend/account_deletion.py).
+    user_id SEM FK: O REGISTRO SOBREVIVE À EXCLUSÃO DO USUÁRIO PARA CONSULTA DO PROGRESSO.
+    """
+    __tablename__ = "account_deletions"
+
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default="pending")  # pending, running, done, failed
+    etapa = db.Column(db.String(50))  # TABELA SENDO PROCESSADA NO MOMENTO
+    total = db.Column(db.Integer, nullable=False, default=0)
+    removidos = db.Column(db.Integer, nullable=False, default=0)
+    erro = db.Column(db.Text)
+
+
+class ReplicaFence(db.Model):
+    """
+    MOMENTO DA ÚLTIMA ESCRITA DE CADA USUÁRIO, GRAVADO NO PRIMÁRIO NA MESMA TRANSAÇÃO.
+    COMPARTILHADO POR TODOS OS WORKERS: ENQUANTO ESTIVER DENTRO DA JANELA DE ATRASO DA
+    RÉPLICA, AS LEITURAS DO USUÁRIO FICAM NO PRIMÁRIO (VER backend/read_replica.py).
+    SÓ É USADO COM DATABASE_REPLICA_URL DEFINIDA.
+    """
+    __tablename__ = "replica_fences"
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    written_at = db.Column(db.DateTime, nullable=False)
+
+
+def _deleted_record_owner_id(obj) -> Optional[int]:
+    """RETORNA O ID DO USUÁRIO DONO DE UM REGISTRO SINCRONIZÁVEL."""
+    if isinstance(obj, RoutineStep):
+        routine = obj.routine
+        return routine.user_id if routine else None
+    if isinstance(obj, BoardItem):
+        board = obj.board
+        return board.user_id if board else None
+    return obj.user_id
+
+
+SYNC_TRACKED_MODELS = (Routine, RoutineStep, Board, BoardItem, Entry, Notification)
+
+
+# VÍNCULOS QUE DEFINEM QUAIS DONOS CADA USUÁRIO ENXERGA NO SYNC: AO REMOVER UM, QUEM PERDE
+# ACESSO RECEBE UM TOMBSTONE E O PRÓXIMO SYNC DELE VOLTA COM O ESTADO COMPLETO
+VISIBILITY_MODELS = {
+    CareLink: ("cuidador_id", "pessoa_tea_id"),
+    Share: ("viewer_id",),
+}
+
+# FILHOS REMOVIDOS PELO BANCO (ON DELETE CASCADE) QUANDO O PAI É REMOVIDO VIA ORM
+PASSIVE_CHILDREN = {
+    "routines": (RoutineStep, "routine_id"),
+    "boards": (BoardItem, "board_id"),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _record_deletions(session, flush_context, instances) -> None:
+    """GRAVA UM TOMBSTONE PARA CADA REGISTRO SINCRONIZÁVEL OU VÍNCULO REMOVIDO VIA ORM."""
+    with session.no_autoflush:
+        deleted = [obj for obj in session.deleted if isinstance(obj, SYNC_TRACKED_MODELS)]
+        recorded = {(obj.__tablename__, obj.id) for obj in deleted}
+        for obj in deleted:
+            owner_id = _deleted_record_owner_id(obj)
+            if owner_id is None:
+                continue
+            session.add(
+                DeletionLog(
+                    table_name=obj.__tablename__,
+                    record_id=obj.id,
+                    user_id=owner_id,
+                )
+            )
+
+            # COM passive_deletes OS FILHOS NÃO CARREGADOS NÃO PASSAM PELA SESSÃO;
+            # BUSCAR APENAS OS IDS PARA GRAVAR OS TOMBSTONES DELES TAMBÉM
+            child = PASSIVE_CHILDREN.get(obj.__tablename__)
+            if child is None:
+                continue
+            child_model, fk_name = child
+            child_ids = session.execute(
+                select(child_model.id).where(getattr(child_model, fk_name) == obj.id)
+            ).scalars()
+            for child_id in child_ids:
+                if (child_model.__tablename__, child_id) in recorded:
+                    continue
+                session.add(
+                    DeletionLog(
+                        table_name=child_model.__tablename__,
+                        record_id=child_id,
+                        user_id=owner_id,
+                    )
+                )
+
+        for obj in session.deleted:
+            participant_columns = VISIBILITY_MODELS.get(type(obj))
+            if participant_columns is None:
+                continue
+            participant_ids = {getattr(obj, column) for column in participant_columns} - {None}
+            session.add_all(
+                DeletionLog(table_name=obj.__tablename__, record_id=obj.id, user_id=participant_id)
+                for participant_id in participant_ids
+            )
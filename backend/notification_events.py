@@ -0,0 +1,306 @@
+"""
+ENTREGA DE NOTIFICAÇÕES EM TEMPO REAL (SERVER-SENT EVENTS).
+
+AS ROTAS PUBLICAM CADA NOTIFICAÇÃO CRIADA OU ATUALIZADA EM UM BROKER, E
+GET /api/notifications/stream REPASSA OS EVENTOS DO USUÁRIO PARA O CLIENTE.
+
+BROKERS DISPONÍVEIS (NOTIFICATION_BROKER_URL):
+- memory://                 FILA EM MEMÓRIA; SÓ ENTREGA DENTRO DO MESMO PROCESSO.
+- sqlite:///caminho/db      ARQUIVO SQLITE COMPARTILHADO; PERMITE VÁRIOS WORKERS NA
+                            MESMA MÁQUINA (SUBSTITUTO LOCAL DE UM PUB/SUB EXTERNO).
+
+O ID DE CADA EVENTO É DERIVADO DE (updated_at, id) DA NOTIFICAÇÃO, ENTÃO UM
+CLIENTE QUE RECONECTA COM Last-Event-ID RECEBE DO BANCO O QUE PERDEU, INCLUSIVE
+INCREMENTOS DE contador EM NOTIFICAÇÕES JÁ ENVIADAS. O updated_at DO ID É
+TRUNCADO NO SEGUNDO: O DATETIME DO MYSQL NÃO GUARDA MICROSSEGUNDOS (E ARREDONDA),
+ENTÃO O VALOR EM MEMÓRIA NÃO É O QUE O BANCO TEM.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .models import Notification
+
+EVENT_ID_FORMAT = "%Y%m%dT%H%M%S"
+# IDS ANTIGOS TINHAM MICROSSEGUNDOS NO FIM; SÓ O PREFIXO ATÉ O SEGUNDO É LIDO
+_EVENT_ID_STAMP_LEN = len("20260101T000000")
+
+
+def notification_to_dict(notif: Notification) -> dict[str, Any]:
+    """SERIALIZAÇÃO PADRÃO DE UMA NOTIFICAÇÃO (LISTAGEM, SYNC E STREAM)."""
+    return {
+        "id": notif.id,
+        "tipo": notif.tipo,
+        "titulo": notif.titulo,
+        "mensagem": notif.mensagem,
+        "lida": notif.lida,
+        "care_link_id": notif.care_link_id,
+        "share_id": notif.share_id,
+        "contador": notif.contador,
+        "created_at": notif.created_at,
+    }
+
+
+def make_event_id(updated_at: datetime, notification_id: int) -> str:
+    """ID DO EVENTO: updated_at TRUNCADO NO SEGUNDO + ID DA NOTIFICAÇÃO."""
+    return f"{updated_at.strftime(EVENT_ID_FORMAT)}-{notification_id}"
+
+
+def parse_event_id(value: Optional[str]) -> Optional[tuple[datetime, int]]:
+    """
+    CONVERTE UM Last-Event-ID EM (SEGUNDO DO updated_at, id). VALORES INVÁLIDOS SÃO
+    IGNORADOS. O SEGUNDO É UM LIMITE INFERIOR DO VALOR GRAVADO NO BANCO (TRUNCADO AQUI,
+    ARREDONDADO OU COMPLETO LÁ), ENTÃO A RETOMADA DEVE REENVIAR O SEGUNDO INTEIRO.
+    """
+    if not value:
+        return None
+    try:
+        stamp, notification_id = value.strip().rsplit("-", 1)
+        return datetime.strptime(stamp[:_EVENT_ID_STAMP_LEN], EVENT_ID_FORMAT), int(notification_id)
+    except ValueError:
+        return None
+
+
+def build_event(notif: Notification) -> dict[str, Any]:
+    """MONTA O EVENTO JÁ SERIALIZADO (TEXTO) PARA PODER CRUZAR PROCESSOS."""
+    return {
+        "id": make_event_id(notif.updated_at, notif.id),
+        "event": "notification",
+        "data": current_app.json.dumps(notification_to_dict(notif)),
+    }
+
+
+def format_sse(evt: dict[str, Any]) -> str:
+    return f"id: {evt['id']}\nevent: {evt['event']}\ndata: {evt['data']}\n\n"
+
+
+# ========== BROKERS ==========
+
+class Subscription:
+    """FILA DE EVENTOS DE UM CLIENTE CONECTADO."""
+
+    def __init__(self, broker: "MemoryBroker", user_id: int, max_size: int = 256):
+        self.broker = broker
+        self.user_id = user_id
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+
+    def put(self, evt: dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(evt)
+        except queue.Full:
+            # CLIENTE LENTO: DESCARTA; ELE RECUPERA PELO Last-Event-ID AO RECONECTAR
+            pass
+
+    def get(self, timeout: float) -> Optional[dict[str, Any]]:
+        """AGUARDA O PRÓXIMO EVENTO; RETORNA None SE O TEMPO ACABAR (HORA DO HEARTBEAT)."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class MemoryBroker:
+    """PUB/SUB EM MEMÓRIA, POR USUÁRIO. BASE DOS DEMAIS BROKERS (DISTRIBUIÇÃO LOCAL)."""
+
+    def __init__(self):
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: int, evt: dict[str, Any]) -> None:
+        self._deliver(user_id, evt)
+
+    def _deliver(self, user_id: int, evt: dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.put(evt)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def close(self) -> None:
+        with self._lock:
+            self._subscribers.clear()
+
+
+class SQLiteBroker(MemoryBroker):
+    """
+    BROKER ENTRE PROCESSOS USANDO UM ARQUIVO SQLITE COMO LOG DE EVENTOS.
+    publish GRAVA UMA LINHA; UMA ÚNICA THREAD POR PROCESSO LÊ AS LINHAS NOVAS
+    E DISTRIBUI PARA OS ASSINANTES LOCAIS.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.25, retention_seconds: int = 300):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._local = threading.local()
+        self._poller: Optional[threading.Thread] = None
+        self._poller_pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self) -> None:
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " user_id INTEGER NOT NULL,"
+            " event_id TEXT NOT NULL,"
+            " event TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+
+    def publish(self, user_id: int, evt: dict[str, Any]) -> None:
+        self._connect().execute(
+            "INSERT INTO events (user_id, event_id, event, data, created) VALUES (?, ?, ?, ?, ?)",
+            (user_id, evt["id"], evt["event"], evt["data"], time.time()),
+        )
+
+    def subscribe(self, user_id: int) -> Subscription:
+        self._ensure_poller()
+        return super().subscribe(user_id)
+
+    def _ensure_poller(self) -> None:
+        # A THREAD NÃO SOBREVIVE A UM FORK (EX.: WORKERS DO GUNICORN); RECRIAR POR PROCESSO
+        with self._lock:
+            if self._poller is not None and self._poller_pid == os.getpid() and self._poller.is_alive():
+                return
+            self._stop.clear()
+            self._poller = threading.Thread(target=self._poll_loop, name="notification-broker", daemon=True)
+            self._poller_pid = os.getpid()
+            self._poller.start()
+
+    def _poll_loop(self) -> None:
+        conn = self._connect()
+        # SÓ EVENTOS PUBLICADOS A PARTIR DE AGORA; O HISTÓRICO VEM DO BANCO VIA Last-Event-ID
+        last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+        last_prune = time.monotonic()
+        while not self._stop.wait(self.poll_interval):
+            try:
+                rows = conn.execute(
+                    "SELECT seq, user_id, event_id, event, data FROM events WHERE seq > ? ORDER BY seq",
+                    (last_seq,),
+                ).fetchall()
+                for seq, user_id, event_id, event_name, data in rows:
+                    last_seq = seq
+                    self._deliver(user_id, {"id": event_id, "event": event_name, "data": data})
+
+                if time.monotonic() - last_prune > self.retention_seconds:
+                    conn.execute("DELETE FROM events WHERE created < ?", (time.time() - self.retention_seconds,))
+                    last_prune = time.monotonic()
+            except sqlite3.Error:
+                # ARQUIVO BLOQUEADO POR OUTRO PROCESSO; TENTA DE NOVO NO PRÓXIMO CICLO
+                continue
+
+    def close(self) -> None:
+        self._stop.set()
+        super().close()
+
+
+_brokers: dict[str, MemoryBroker] = {}
+_brokers_lock = threading.Lock()
+
+
+def create_broker(url: str, config: dict) -> MemoryBroker:
+    if url.startswith("memory://"):
+        return MemoryBroker()
+    if url.startswith("sqlite:///"):
+        return SQLiteBroker(
+            url[len("sqlite:///"):],
+            poll_interval=config.get("NOTIFICATION_BROKER_POLL_INTERVAL", 0.25),
+        )
+    raise ValueError(f"NOTIFICATION_BROKER_URL não suportada: {url}")
+
+
+def get_broker() -> MemoryBroker:
+    """RETORNA O BROKER CONFIGURADO PARA A APLICAÇÃO ATUAL (UM POR URL)."""
+    config = current_app.config
+    url = config.get("NOTIFICATION_BROKER_URL", "memory://")
+    with _brokers_lock:
+        broker = _brokers.get(url)
+        if broker is None:
+            broker = create_broker(url, config)
+            _brokers[url] = broker
+        return broker
+
+
+def publish_notifications(notifications) -> None:
+    """PUBLICA NOTIFICAÇÕES JÁ GRAVADAS PARA OS CLIENTES CONECTADOS DE CADA DESTINATÁRIO."""
+    broker = get_broker()
+    for notif in notifications:
+        try:
+            broker.publish(notif.user_id, build_event(notif))
+        except Exception:
+            # FALHA NA ENTREGA EM TEMPO REAL NÃO PODE DERRUBAR A ESCRITA; O CLIENTE RECUPERA DEPOIS
+            current_app.logger.exception("Falha ao publicar notificação %s", notif.id)
+
+
+# ========== PUBLICAÇÃO AUTOMÁTICA APÓS COMMIT ==========
+
+@event.listens_for(Session, "after_flush")
+def _collect_new_notifications(session, flush_context):
+    # OS EVENTOS SÃO MONTADOS AQUI (ATRIBUTOS AINDA CARREGADOS, ID JÁ ATRIBUÍDO)
+    # E SÓ SÃO PUBLICADOS SE A TRANSAÇÃO FOR CONFIRMADA
+    new_notifications = [obj for obj in session.new if isinstance(obj, Notification)]
+    if not new_notifications or not has_app_context():
+        return
+    pending = session.info.setdefault("notifications_to_publish", [])
+    pending.extend((notif.user_id, build_event(notif)) for notif in new_notifications)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_notifications(session):
+    pending = session.info.pop("notifications_to_publish", None)
+    if not pending or not has_app_context():
+        return
+    broker = get_broker()
+    for user_id, evt in pending:
+        try:
+            broker.publish(user_id, evt)
+        except Exception:
+            current_app.logger.exception("Falha ao publicar evento %s", evt["id"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_notifications(session):
+    session.info.pop("notifications_to_publish", None)
@@ -0,0 +1,154 @@
+"""
+HASH DE SENHAS FORA DAS THREADS DE REQUISIÇÃO.
+
+O CÁLCULO (scrypt/pbkdf2 DO WERKZEUG) RODA EM UM POOL DE PROCESSOS PEQUENO
+E LIMITADO. QUANDO HÁ MAIS PEDIDOS PENDENTES DO QUE PASSWORD_HASH_MAX_PENDING
+A CHAMADA FALHA RÁPIDO COM PasswordHashBusy EM VEZ DE ENFILEIRAR SEM LIMITE.
+COM PASSWORD_HASH_WORKERS = 0 O HASH É FEITO NA PRÓPRIA THREAD (TESTES/DEV).
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from threading import BoundedSemaphore, Lock
+from typing import TYPE_CHECKING, Callable, Optional
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+class PasswordHashBusy(Exception):
+    """O POOL DE HASH ESTÁ SATURADO; A REQUISIÇÃO DEVE SER TENTADA NOVAMENTE."""
+
+
+class PasswordHasher:
+    """POOL DE PROCESSOS LIMITADO PARA HASH E VERIFICAÇÃO DE SENHAS."""
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._slots = BoundedSemaphore(max_pending)
+        self._lock = Lock()
+        self._pending = 0
+        self.rejected_total = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """NÚMERO DE OPERAÇÕES DE HASH EM ANDAMENTO OU AGUARDANDO UM PROCESSO."""
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # RECRIAR O POOL APÓS FORK (EX.: WORKERS DO GUNICORN).
+        # "fork" EVITA REIMPORTAR O MÓDULO PRINCIPAL NOS FILHOS, QUE SÓ EXECUTAM
+        # AS FUNÇÕES DE HASH DO WERKZEUG. multiprocessing SÓ É IMPORTADO NO PRIMEIRO USO
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def run(self, func: Callable, *args):
+        """EXECUTA func NO POOL, RESPEITANDO O LIMITE DE PENDÊNCIAS."""
+        if self.workers <= 0:
+            return func(*args)
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected_total += 1
+            raise PasswordHashBusy("Servidor ocupado processando senhas. Tente novamente.")
+
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # A VAGA SÓ É DEVOLVIDA QUANDO O HASH TERMINA (OU É CANCELADO): APÓS UM TIMEOUT
+        # ELE CONTINUA NA FILA DO POOL E AINDA CONTA PARA PASSWORD_HASH_MAX_PENDING
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHashBusy("Tempo esgotado processando a senha. Tente novamente.")
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_hashers: dict[tuple, PasswordHasher] = {}
+_hashers_lock = Lock()
+
+
+def get_hasher() -> PasswordHasher:
+    """RETORNA O POOL CONFIGURADO PARA A APLICAÇÃO ATUAL (UM POR CONFIGURAÇÃO)."""
+    config = current_app.config
+    key = (
+        config.get("PASSWORD_HASH_WORKERS", 0),
+        config.get("PASSWORD_HASH_MAX_PENDING", 64),
+        config.get("PASSWORD_HASH_TIMEOUT", 10.0),
+    )
+    with _hashers_lock:
+        hasher = _hashers.get(key)
+        if hasher is None:
+            hasher = PasswordHasher(*key)
+            _hashers[key] = hasher
+        return hasher
+
+
+def hasher_stats() -> dict[str, int]:
+    """OPERAÇÕES PENDENTES E REJEITADAS SOMADAS EM TODOS OS POOLS DESTE PROCESSO (PARA /metrics)."""
+    with _hashers_lock:
+        hashers = list(_hashers.values())
+    return {
+        "queue_depth": sum(hasher.queue_depth for hasher in hashers),
+        "rejected_total": sum(hasher.rejected_total for hasher in hashers),
+    }
+
+
+@lru_cache(maxsize=None)
+def _full_hash_method(method: str) -> str:
+    """
+    PREFIXO COMPLETO QUE O WERKZEUG GRAVA PARA method (EX.: "scrypt" -> "scrypt:32768:8:1").
+    CALCULADO UMA VEZ POR PROCESSO A PARTIR DE UM HASH GERADO; MÉTODO INVÁLIDO LEVANTA ValueError.
+    """
+    return generate_password_hash("", method).split("$", 1)[0]
+
+
+def _hash_method() -> str:
+    return current_app.config.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
+
+def hash_password(password: str) -> str:
+    """GERA O HASH DA SENHA COM O MÉTODO CONFIGURADO."""
+    return get_hasher().run(generate_password_hash, password, _hash_method())
+
+
+def verify_password(pwhash: str, password: str) -> bool:
+    """VERIFICA A SENHA CONTRA O HASH ARMAZENADO."""
+    return get_hasher().run(check_password_hash, pwhash, password)
+
+
+def needs_rehash(pwhash: str) -> bool:
+    """INDICA SE O HASH FOI GERADO COM PARÂMETROS DIFERENTES DOS CONFIGURADOS."""
+    return pwhash.split("$", 1)[0] != _full_hash_method(_hash_method())
@@ -0,0 +1,184 @@
+"""
+PERFILAMENTO DE CPU SOB DEMANDA, UMA REQUISIÇÃO POR VEZ.
+
+COM PROFILING_ENABLED=true, UMA REQUISIÇÃO É PERFILADA QUANDO:
+- TRAZ O HEADER X-Profile E O TOKEN É DE UM ADMINISTRADOR; OU
+- O USUÁRIO DO TOKEN ESTÁ EM PROFILE_USER_IDS (PARA PEGAR O CASO LENTO DE UM
+  USUÁRIO ESPECÍFICO SEM PRECISAR REPRODUZIR OS DADOS DELE).
+
+MODOS (VALOR DO HEADER OU PROFILE_MODE):
+- cprofile: DETERMINÍSTICO, GRAVA UM .prof (ABRIR COM pstats, snakeviz ETC.)
+- sampling: AMOSTRA A PILHA DA THREAD A CADA PROFILE_SAMPLE_INTERVAL_MS E GRAVA
+  UM .collapsed NO FORMATO DE PILHAS COLAPSADAS (flamegraph.pl, speedscope).
+
+OS ARQUIVOS VÃO PARA PROFILE_DIR COMO <DATA>-<ENDPOINT>-<ID>, ONDE O ID É O
+X-Request-ID ENVIADO (OU UM UUID); A RESPOSTA TRAZ O ID EM X-Profile-Id.
+"""
+from __future__ import annotations
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+from flask import Flask, Response, current_app, g, request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+
+from .identity import CurrentUser
+from .models import ROLE_ADMIN
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_MODES = ("cprofile", "sampling")
+
+
+class SamplingProfiler:
+    """AMOSTRA A PILHA DE UMA THREAD EM INTERVALOS FIXOS E CONTA AS PILHAS COLAPSADAS."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+def _profile_mode() -> Optional[str]:
+    """MODO PEDIDO PARA ESTA REQUISIÇÃO, OU None SE ELA NÃO DEVE SER PERFILADA."""
+    config = current_app.config
+    header = request.headers.get(PROFILE_HEADER)
+    user_ids = config.get("PROFILE_USER_IDS") or ()
+    if header is None and not user_ids:
+        return None
+
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+        user_id = int(identity) if identity is not None else None
+    except Exception:
+        # TOKEN INVÁLIDO OU EXPIRADO: A PRÓPRIA ROTA RESPONDE O ERRO, SEM PERFILAMENTO
+        return None
+    if user_id is None:
+        return None
+
+    if header is not None:
+        user = CurrentUser(user_id, get_jwt())
+        g.current_user = user
+        if not user.has_role(ROLE_ADMIN):
+            return None
+    elif user_id not in user_ids:
+        return None
+
+    mode = (header or "").strip().lower()
+    return mode if mode in PROFILE_MODES else config.get("PROFILE_MODE", "cprofile")
+
+
+# ESTADO NO environ DA REQUISIÇÃO: O teardown DAS SUB-REQUISIÇÕES DE /batch NÃO PODE
+# ENCERRAR O PERFIL DA REQUISIÇÃO EXTERNA
+_STATE_KEY = "profiling.state"
+
+# UM PERFIL POR VEZ NO PROCESSO: REQUISIÇÕES CONCORRENTES SEGUEM SEM PERFILAMENTO
+_profile_lock = threading.Lock()
+
+
+def _start_profile() -> None:
+    mode = _profile_mode()
+    if mode is None or not _profile_lock.acquire(blocking=False):
+        return
+
+    if mode == "sampling":
+        interval = current_app.config.get("PROFILE_SAMPLE_INTERVAL_MS", 5) / 1000
+        profiler = SamplingProfiler(threading.get_ident(), interval)
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    request.environ[_STATE_KEY] = {
+        "id": request.headers.get("X-Request-ID") or uuid4().hex,
+        "mode": mode,
+        "profiler": profiler,
+        "start": time.perf_counter(),
+    }
+
+
+def _stop(profiler) -> None:
+    if isinstance(profiler, SamplingProfiler):
+        profiler.stop()
+    else:
+        profiler.disable()
+    _profile_lock.release()
+
+
+def _finish_profile(response: Response) -> Response:
+    state = request.environ.pop(_STATE_KEY, None)
+    if state is None:
+        return response
+
+    profiler = state["profiler"]
+    _stop(profiler)
+    elapsed_ms = (time.perf_counter() - state["start"]) * 1000
+
+    directory = current_app.config["PROFILE_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    safe_id = "".join(ch for ch in state["id"] if ch.isalnum() or ch in "-_")[:64] or uuid4().hex
+    base = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{request.endpoint or 'unmatched'}-{safe_id}"
+
+    if isinstance(profiler, SamplingProfiler):
+        filename = f"{base}.collapsed"
+        profiler.dump(os.path.join(directory, filename))
+    else:
+        filename = f"{base}.prof"
+        profiler.dump_stats(os.path.join(directory, filename))
+
+    current_app.logger.info(
+        "Perfil de %s %s (%s, %.1f ms) gravado em %s",
+        request.method, request.path, state["mode"], elapsed_ms, os.path.join(directory, filename),
+    )
+    response.headers["X-Profile-Id"] = safe_id
+    response.headers["X-Profile-File"] = filename
+    return response
+
+
+def _stop_profile_on_error(exc: Optional[BaseException]) -> None:
+    # SE O after_request NÃO RODOU (EXCEÇÃO NÃO TRATADA), NÃO DEIXAR O PROFILER LIGADO
+    state = request.environ.pop(_STATE_KEY, None)
+    if state is not None:
+        _stop(state["profiler"])
+
+
+def init_profiling(app: Flask) -> None:
+    """REGISTRA O PERFILAMENTO SOB DEMANDA SE PROFILING_ENABLED ESTIVER ATIVO."""
+    if not app.config.get("PROFILING_ENABLED", False):
+        return
+
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_stop_profile_on_error)
@@ -0,0 +1,213 @@
+"""
+LEITURAS EM RÉPLICA (BIND "replica").
+
+COM DATABASE_REPLICA_URL DEFINIDA, OS HANDLERS GET MARCADOS COM @replica_read
+CONSULTAM A RÉPLICA; TODO O RESTO (ESCRITAS, FLUSHES, UPDATE/INSERT/DELETE
+EXECUTADOS DIRETAMENTE E HANDLERS SEM O DECORATOR) CONTINUA NO PRIMÁRIO.
+
+POLÍTICA DE TOLERÂNCIA A ATRASO (DB_REPLICA_MAX_LAG_SECONDS):
+- LER O QUE ESCREVEU: DEPOIS DE UM COMMIT COM ESCRITAS, AS LEITURAS DO MESMO
+  USUÁRIO FICAM NO PRIMÁRIO DURANTE A JANELA. O MOMENTO DA ESCRITA FICA NA
+  TABELA replica_fences DO PRIMÁRIO, GRAVADO NA MESMA TRANSAÇÃO, ENTÃO VALE
+  PARA TODOS OS WORKERS E MÁQUINAS. A CERCA É LIDA UMA VEZ POR REQUISIÇÃO
+  (INCLUINDO AS SUB-REQUISIÇÕES DE /batch), SÓ QUANDO O HANDLER DE FATO CONSULTA
+  O BANCO; RESPOSTAS VINDAS DO CACHE NÃO TOCAM O PRIMÁRIO. CERCAS ATIVAS FICAM
+  NO CACHE DO PROCESSO ATÉ EXPIRAREM. TROCA ACEITA: UM GET NÃO CACHEADO DE QUEM
+  NÃO ESCREVEU NA JANELA AINDA CUSTA UMA LEITURA POR CHAVE PRIMÁRIA NO PRIMÁRIO.
+- O CACHE DE RESPOSTAS MONTADAS A PARTIR DA RÉPLICA EXPIRA NO MÁXIMO EM UMA
+  JANELA (replica_cache_ttl), PARA QUE UM DADO ATRASADO NÃO FIQUE 5 MINUTOS NO CACHE.
+- SE A RÉPLICA FALHAR (OperationalError), O HANDLER É REPETIDO NO PRIMÁRIO.
+
+ENDPOINTS EM QUE ATRASO CAUSA PERDA DE DADOS (GET /sync, QUE AVANÇA O TOKEN DO
+CLIENTE, E O STREAM DE NOTIFICAÇÕES) NÃO DEVEM USAR A RÉPLICA.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Callable
+
+from flask import current_app, g, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .cache import cache
+
+REPLICA_BIND = "replica"
+
+
+class RoutingSession(FlaskSession):
+    """SESSÃO QUE ENVIA AS LEITURAS PARA A RÉPLICA QUANDO session.info["use_replica"] ESTÁ ATIVO."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and self.info.get("use_replica")
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+        ):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None and self._replica_allowed():
+                if has_request_context():
+                    g.read_from_replica = True
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_allowed(self) -> bool:
+        # A CERCA SÓ É CONSULTADA NA PRIMEIRA LEITURA QUE DE FATO VAI AO BANCO:
+        # RESPOSTAS SERVIDAS DO CACHE NÃO CUSTAM NENHUMA IDA AO PRIMÁRIO
+        user_id = self.info.get("replica_user_id")
+        if user_id is None:
+            return True
+        memo = self.info.get("replica_fence")
+        if memo is None or memo[0] != user_id:
+            memo = self.info["replica_fence"] = (user_id, _fence_allows(self._db.engine, user_id))
+        return memo[1]
+
+
+def _replica_enabled() -> bool:
+    return REPLICA_BIND in (current_app.config.get("SQLALCHEMY_BINDS") or {})
+
+
+def _fence_key(user_id: int) -> str:
+    return f"replica_fence:{user_id}"
+
+
+def _fence_allows(engine, user_id: int) -> bool:
+    """
+    INDICA SE O USUÁRIO PODE LER DA RÉPLICA (NENHUMA ESCRITA DENTRO DA JANELA DE ATRASO).
+
+    UMA CERCA ATIVA FICA NO CACHE DO PROCESSO ATÉ EXPIRAR, JÁ QUE UMA ESCRITA MAIS
+    NOVA SÓ A PROLONGA. A AUSÊNCIA DE CERCA NÃO É GUARDADA: OUTRO WORKER PODE TER
+    ACABADO DE GRAVAR UMA, E ISSO QUEBRARIA O LER O QUE ESCREVEU.
+    """
+    if cache.get(_fence_key(user_id)):
+        return False
+    from .models import ReplicaFence
+
+    lag = current_app.config.get("DB_REPLICA_MAX_LAG_SECONDS", 5)
+    with engine.connect() as conn:
+        written_at = conn.execute(
+            select(ReplicaFence.written_at).where(ReplicaFence.user_id == user_id)
+        ).scalar()
+    remaining = (written_at + timedelta(seconds=lag) - datetime.utcnow()).total_seconds() if written_at else 0
+    if remaining <= 0:
+        return True
+    cache.set(_fence_key(user_id), True, ttl=remaining)
+    return False
+
+
+def replica_read(view: Callable) -> Callable:
+    """
+    EXECUTA O HANDLER (SOMENTE LEITURA) NA RÉPLICA, RESPEITANDO A POLÍTICA DE ATRASO.
+    USAR ABAIXO DE @jwt_required().
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _replica_enabled():
+            return view(*args, **kwargs)
+
+        from .extensions import db
+
+        identity = get_jwt_identity()
+        session = db.session()
+        session.info["use_replica"] = True
+        session.info["replica_user_id"] = int(identity) if identity is not None else None
+        g.read_from_replica = False
+        try:
+            return view(*args, **kwargs)
+        except OperationalError:
+            if not g.read_from_replica:
+                raise
+            current_app.logger.warning("Réplica indisponível em %s; repetindo no primário", view.__name__, exc_info=True)
+            session.rollback()
+            session.info.pop("use_replica", None)
+            g.read_from_replica = False
+            return view(*args, **kwargs)
+        finally:
+            session.info.pop("use_replica", None)
+            session.info.pop("replica_user_id", None)
+
+    return wrapper
+
+
+def replica_cache_ttl(ttl: int) -> int:
+    """TTL DO CACHE PARA A RESPOSTA ATUAL: LIMITADO À JANELA DE ATRASO SE ELA VEIO DA RÉPLICA."""
+    if has_request_context() and g.get("read_from_replica"):
+        return max(1, min(ttl, current_app.config.get("DB_REPLICA_MAX_LAG_SECONDS", 5)))
+    return ttl
+
+
+# ========== MARCADOR DE ESCRITA RECENTE (LER O QUE ESCREVEU) ==========
+
+@event.listens_for(Session, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_dml(orm_execute_state):
+    # UPDATE / INSERT / DELETE EXECUTADOS DIRETAMENTE NÃO PASSAM PELO FLUSH
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+def _upsert_fence(session, user_id: int, now: datetime) -> None:
+    from .models import ReplicaFence
+
+    dialect = session.get_bind(clause=select(ReplicaFence)).dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        stmt = mysql_insert(ReplicaFence).values(user_id=user_id, written_at=now)
+        stmt = stmt.on_duplicate_key_update(written_at=stmt.inserted.written_at)
+    elif dialect in ("sqlite", "postgresql"):
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        upsert = sqlite_insert if dialect == "sqlite" else pg_insert
+        stmt = upsert(ReplicaFence).values(user_id=user_id, written_at=now)
+        stmt = stmt.on_conflict_do_update(index_elements=[ReplicaFence.user_id], set_={"written_at": now})
+    else:
+        # SEM UPSERT NATIVO: ATUALIZA E SÓ INSERE SE AINDA NÃO EXISTIR
+        if session.execute(
+            update(ReplicaFence).where(ReplicaFence.user_id == user_id).values(written_at=now)
+        ).rowcount:
+            return
+        session.add(ReplicaFence(user_id=user_id, written_at=now))
+        return
+    session.execute(stmt)
+
+
+@event.listens_for(Session, "before_commit")
+def _mark_recent_writer(session):
+    # ANTES DO FLUSH DO COMMIT: ALTERAÇÕES PENDENTES AINDA ESTÃO EM new/dirty/deleted
+    has_writes = session.info.get("has_writes") or session.new or session.deleted or any(
+        session.is_modified(obj) for obj in session.dirty
+    )
+    if not has_writes or session.info.get("fence_written") or not has_request_context():
+        return
+    user = g.get("current_user")
+    if user is None or current_app.config.get("DB_REPLICA_MAX_LAG_SECONDS", 5) <= 0 or not _replica_enabled():
+        return
+    session.info["fence_written"] = True
+    _upsert_fence(session, user.id, datetime.utcnow())
+    # ESTE PROCESSO JÁ SABE DA CERCA: AS PRÓXIMAS LEITURAS DELE NÃO PRECISAM CONSULTÁ-LA
+    session.info["replica_fence"] = (user.id, False)
+    cache.set(_fence_key(user.id), True, ttl=current_app.config.get("DB_REPLICA_MAX_LAG_SECONDS", 5))
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_fence_flags(session):
+    session.info.pop("has_writes", None)
+    session.info.pop("fence_written", None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_write_flag(session):
+    session.info.pop("has_writes", None)
+    session.info.pop("fence_written", None)
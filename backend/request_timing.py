@@ -0,0 +1,217 @@
+"""
+TEMPO POR REQUISIÇÃO, CONTAGEM DE CONSULTAS SQL E LOG DE LENTIDÃO.
+
+PARA CADA REQUISIÇÃO SÃO MEDIDOS O TEMPO TOTAL, O TEMPO GASTO NO BANCO E O
+NÚMERO DE CONSULTAS (EVENTOS before/after_cursor_execute DO SQLALCHEMY). O
+RESULTADO VAI NO HEADER Server-Timing (VISÍVEL NO DEVTOOLS DO NAVEGADOR) E
+REQUISIÇÕES OU CONSULTAS ACIMA DE SLOW_REQUEST_MS / SLOW_QUERY_MS SÃO LOGADAS
+COM O ENDPOINT E OS PARÂMETROS.
+
+COM REQUEST_TIMING_MEMORY=true O tracemalloc É LIGADO E O PICO DE MEMÓRIA
+ALOCADA DURANTE A REQUISIÇÃO TAMBÉM É MEDIDO (O PICO DO tracemalloc É GLOBAL,
+ENTÃO REQUISIÇÕES CONCORRENTES NO MESMO PROCESSO SE SOMAM). CUSTA CARO: USAR
+APENAS DURANTE A INVESTIGAÇÃO.
+
+COM REQUEST_TIMING_ENABLED=false NADA É REGISTRADO: NEM HOOKS DO FLASK NEM
+EVENTOS DO SQLALCHEMY.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import tracemalloc
+from contextvars import ContextVar
+from typing import Optional
+
+from flask import Flask, Response, current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# PARÂMETROS DA QUERY STRING QUE NUNCA VÃO PARA O LOG (EX.: TOKEN DO STREAM SSE)
+REDACTED_ARGS = {"jwt", "token", "senha", "password"}
+
+# TAMANHO MÁXIMO DO SQL E DOS PARÂMETROS NO LOG DE CONSULTAS LENTAS
+MAX_LOGGED_CHARS = 1000
+
+
+class RequestStats:
+    """MEDIÇÕES DA REQUISIÇÃO ATUAL."""
+
+    __slots__ = ("endpoint", "start", "queries", "db_time", "mem_start")
+
+    def __init__(self, endpoint: Optional[str], track_memory: bool = False):
+        self.endpoint = endpoint
+        self.queries = 0
+        self.db_time = 0.0
+        self.mem_start: Optional[int] = None
+        if track_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.mem_start = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+
+    @property
+    def peak_memory(self) -> Optional[int]:
+        """BYTES ALOCADOS NO PICO ACIMA DO INÍCIO DA REQUISIÇÃO (None SEM REQUEST_TIMING_MEMORY)."""
+        if self.mem_start is None or not tracemalloc.is_tracing():
+            return None
+        return max(tracemalloc.get_traced_memory()[1] - self.mem_start, 0)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+# LIMITE DO LOG DE CONSULTAS LENTAS (SEGUNDOS); DEFINIDO EM init_request_timing
+_slow_query_seconds: Optional[float] = None
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """MEDIÇÕES DA REQUISIÇÃO EM ANDAMENTO (None FORA DE REQUISIÇÕES OU COM A MEDIÇÃO DESLIGADA)."""
+    return _current_stats.get()
+
+
+def _request_params() -> dict:
+    params = {key: ("***" if key in REDACTED_ARGS else value) for key, value in request.args.items()}
+    if request.view_args:
+        params.update(request.view_args)
+    return params
+
+
+def _truncate(value: object) -> str:
+    text = str(value)
+    return text if len(text) <= MAX_LOGGED_CHARS else f"{text[:MAX_LOGGED_CHARS]}..."
+
+
+# ========== EVENTOS DO SQLALCHEMY ==========
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        context._timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    start = getattr(context, "_timing_start", None)
+    if stats is None or start is None:
+        return
+    elapsed = time.perf_counter() - start
+    stats.queries += 1
+    stats.db_time += elapsed
+
+    if _slow_query_seconds is not None and elapsed >= _slow_query_seconds:
+        # PARÂMETROS DE CONSULTAS COM HASH DE SENHA NÃO VÃO PARA O LOG
+        logger.warning(
+            "Consulta lenta (%.1f ms) em %s: %s | parâmetros: %s",
+            elapsed * 1000,
+            stats.endpoint,
+            _truncate(" ".join(statement.split())),
+            "***" if "password_hash" in statement else _truncate(parameters),
+        )
+
+
+class QueryCounter:
+    """
+    CONTA OS COMANDOS SQL EXECUTADOS NO ENGINE ENQUANTO ATIVO. INDEPENDE DE
+    REQUEST_TIMING_ENABLED; USADO PELO ORÇAMENTO DE CONSULTAS (benchmarks/query_budget.py).
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+        self.statements: list[str] = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(" ".join(statement.split()))
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+_listeners_installed = False
+
+
+def _install_listeners() -> None:
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _listeners_installed = True
+
+
+# ========== HOOKS DO FLASK ==========
+
+# CHAVE NO environ DA REQUISIÇÃO. AS SUB-REQUISIÇÕES DE /batch NÃO RODAM before_request,
+# ENTÃO O teardown DELAS NÃO ENCERRA A MEDIÇÃO DA REQUISIÇÃO EXTERNA
+_TOKEN_KEY = "request_timing.token"
+
+
+def _start_timing() -> None:
+    track_memory = current_app.config.get("REQUEST_TIMING_MEMORY", False)
+    request.environ[_TOKEN_KEY] = _current_stats.set(RequestStats(request.endpoint, track_memory))
+
+
+def _finish_timing(response: Response) -> Response:
+    stats = _current_stats.get()
+    if stats is None:
+        return response
+
+    total_ms = stats.elapsed * 1000
+    db_ms = stats.db_time * 1000
+    peak_memory = stats.peak_memory
+    server_timing = (
+        f'db;dur={db_ms:.1f};desc="{stats.queries} queries", '
+        f"app;dur={total_ms - db_ms:.1f}, total;dur={total_ms:.1f}"
+    )
+    if peak_memory is not None:
+        server_timing += f', mem;desc="peak {peak_memory / 1024:.0f} KiB"'
+    response.headers["Server-Timing"] = server_timing
+
+    if total_ms >= current_app.config.get("SLOW_REQUEST_MS", 500):
+        logger.warning(
+            "Requisição lenta: %s %s (%s) status=%s total=%.1f ms db=%.1f ms consultas=%d%s parâmetros=%s",
+            request.method,
+            request.path,
+            stats.endpoint,
+            response.status_code,
+            total_ms,
+            db_ms,
+            stats.queries,
+            f" pico_mem={peak_memory / 1024:.0f} KiB" if peak_memory is not None else "",
+            _request_params(),
+        )
+    return response
+
+
+def _reset_timing(exc: Optional[BaseException]) -> None:
+    token = request.environ.pop(_TOKEN_KEY, None)
+    if token is not None:
+        _current_stats.set(None)
+
+
+def init_request_timing(app: Flask) -> None:
+    """REGISTRA A MEDIÇÃO SE REQUEST_TIMING_ENABLED ESTIVER ATIVO."""
+    global _slow_query_seconds
+    config = app.config
+    if not config.get("REQUEST_TIMING_ENABLED", True):
+        return
+
+    _slow_query_seconds = config.get("SLOW_QUERY_MS", 100) / 1000
+    _install_listeners()
+    if config.get("REQUEST_TIMING_MEMORY", False):
+        from .memory import start_tracing
+
+        start_tracing(config.get("MEMORY_TRACE_FRAMES", 1))
+
+    app.before_request(_start_timing)
+    app.after_request(_finish_timing)
+    app.teardown_request(_reset_timing)
@@ -1,33 +1,59 @@
 from __future__ import annotations
 
-import re
-from collections import Counter
+import time
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, g, jsonify, request
 from flask_jwt_extended import (
   create_access_token,
   create_refresh_token,
+  get_jwt,
   get_jwt_identity,
   jwt_required,
 )
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import inspect as sqlalchemy_inspect
+from sqlalchemy.orm import joinedload, selectinload
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+from sqlalchemy import and_, case, distinct, func, insert, or_
 
 from ..extensions import db
+from ..identity import CurrentUser, identity_claims
+from ..passwords import PasswordHashBusy
+from ..account_deletion import deletion_progress, request_account_deletion, start_account_deletion
 from ..models import (
+  ROLE_ADMIN,
+  ROLE_CUIDADOR,
+  ROLE_PESSOA_TEA,
+  ROLE_PROFISSIONAL,
+  AccountDeletion,
   Board,
   BoardItem,
   CareLink,
+  DeletionLog,
   Entry,
   Notification,
   Routine,
   RoutineStep,
   Share,
+  ShareRequest,
   User,
 )
 from ..cache import cache
+from ..compression import EncodedBody
+from ..db_pool import pool_status
+from .. import memory
+from ..metrics import record_notifications
+from ..notification_events import (
+  build_event,
+  format_sse,
+  get_broker,
+  notification_to_dict,
+  parse_event_id,
+  publish_notifications,
+)
+from ..read_replica import replica_cache_ttl, replica_read
 
 api_bp = Blueprint("api", __name__)
 
@@ -38,13 +64,25 @@ def _get_json():
   return request.get_json() or {}
 
 
-def _current_user() -> User:
+def _current_user() -> CurrentUser:
+  """
+  RETORNA O USUÁRIO DA REQUISIÇÃO A PARTIR DAS CLAIMS DO TOKEN.
+  O BANCO SÓ É CONSULTADO SE O HANDLER ACESSAR UM ATRIBUTO QUE NÃO ESTÁ NO TOKEN.
+  """
   identity = get_jwt_identity()
   try:
     user_id = int(identity)
   except (TypeError, ValueError):
     raise ValueError("Identidade de usuário inválida no token.")
-  return User.query.get_or_404(user_id)
+
+  # REAPROVEITAR O USUÁRIO JÁ CARREGADO NESTE CONTEXTO (EX.: SUB-REQUISIÇÕES DE /batch)
+  cached_user = g.get("current_user")
+  if cached_user is not None and cached_user.id == user_id:
+    return cached_user
+
+  user = CurrentUser(user_id, get_jwt())
+  g.current_user = user
+  return user
 
 
 def _is_profissional_or_admin(user: User) -> bool:
@@ -52,15 +90,56 @@ def _is_profissional_or_admin(user: User) -> bool:
   VERIFICA SE O USUÁRIO É PROFISSIONAL OU ADMINISTRADOR.
   ADMINISTRADOR TEM ACESSO A TODAS AS FUNCIONALIDADES DE PROFISSIONAL.
   """
-  if not user.perfil:
-    return False
-  perfil_lower = user.perfil.lower()
-  return "profissional" in perfil_lower or "administrador" in perfil_lower
+  return user.has_role(ROLE_PROFISSIONAL | ROLE_ADMIN)
 
 
 def _is_admin(user: User) -> bool:
   """VERIFICA SE O USUÁRIO É ADMINISTRADOR."""
-  return user.perfil and "administrador" in user.perfil.lower()
+  return user.has_role(ROLE_ADMIN)
+
+
+def _is_cuidador(user: User) -> bool:
+  """VERIFICA SE O USUÁRIO É CUIDADOR."""
+  return user.has_role(ROLE_CUIDADOR)
+
+
+def _is_pessoa_tea(user: User) -> bool:
+  """VERIFICA SE O USUÁRIO É PESSOA COM TEA."""
+  return user.has_role(ROLE_PESSOA_TEA)
+
+
+def _share_has_pending_request():
+  """
+  CONDIÇÃO SQL (EXISTS CORRELACIONADO COM Share) PARA SHARES QUE AINDA TÊM
+  NOTIFICAÇÃO share_request NÃO LIDA. USE COM ~ PARA MANTER APENAS OS ACEITOS.
+  """
+  return (
+    db.session.query(Notification.id)
+    .filter(
+      Notification.share_id == Share.id,
+      Notification.tipo == "share_request",
+      Notification.lida.is_(False),
+    )
+    .exists()
+  )
+
+
+def _can_edit_routine(user: User, routine: Routine) -> bool:
+  """
+  VERIFICA SE O USUÁRIO É DONO DA ROTINA OU TEM VÍNCULO ACEITO (EM QUALQUER DIREÇÃO) COM O DONO.
+  FAZ NO MÁXIMO UMA CONSULTA.
+  """
+  if routine.user_id == user.id:
+    return True
+
+  link = db.session.query(CareLink.id).filter(
+    CareLink.status == "accepted",
+    or_(
+      and_(CareLink.cuidador_id == user.id, CareLink.pessoa_tea_id == routine.user_id),
+      and_(CareLink.cuidador_id == routine.user_id, CareLink.pessoa_tea_id == user.id),
+    ),
+  ).first()
+  return link is not None
 
 
 def _parse_datetime(value: str | None, default: datetime | None = None) -> datetime | None:
@@ -73,7 +152,7 @@ def _parse_datetime(value: str | None, default: datetime | None = None) -> datet
 
 
 def _routine_to_dict(routine: Routine) -> dict:
-  user = User.query.get(routine.user_id)
+  user = routine.user
   return {
     "id": routine.id,
     "user_id": routine.user_id,
@@ -89,12 +168,12 @@ def _routine_to_dict(routine: Routine) -> dict:
       }
       for step in routine.steps
     ],
-    "created_at": routine.created_at.isoformat(),
+    "created_at": routine.created_at,
   }
 
 
 def _entry_to_dict(entry: Entry) -> dict:
-  user = User.query.get(entry.user_id)
+  user = entry.user
   return {
     "id": entry.id,
     "user_id": entry.user_id,
@@ -103,7 +182,7 @@ def _entry_to_dict(entry: Entry) -> dict:
     "texto": entry.texto,
     "midia_url": entry.midia_url,
     "tags": entry.tags_list(),
-    "timestamp": entry.timestamp.isoformat(),
+    "timestamp": entry.timestamp,
   }
 
 
@@ -112,7 +191,7 @@ def _board_to_dict(board: Board) -> dict:
     "id": board.id,
     "nome": board.nome,
     "items": [_board_item_to_dict(item) for item in board.items],
-    "created_at": board.created_at.isoformat(),
+    "created_at": board.created_at,
   }
 
 
@@ -132,6 +211,12 @@ def handle_value_error(exc: ValueError):
   return jsonify({"message": str(exc)}), 400
 
 
+@api_bp.errorhandler(PasswordHashBusy)
+def handle_password_hash_busy(exc: PasswordHashBusy):
+  db.session.rollback()
+  return jsonify({"message": str(exc)}), 503, {"Retry-After": "1"}
+
+
 @api_bp.errorhandler(IntegrityError)
 def handle_integrity_error(exc: IntegrityError):
   db.session.rollback()
@@ -168,7 +253,7 @@ def signup():
   db.session.add(user)
   db.session.commit()
 
-  access = create_access_token(identity=str(user.id))
+  access = create_access_token(identity=str(user.id), additional_claims=identity_claims(user))
   refresh = create_refresh_token(identity=str(user.id))
 
   return (
@@ -201,10 +286,19 @@ def login():
     return jsonify({"message": "Email e senha são obrigatórios."}), 400
 
   user = User.query.filter_by(email=email).first()
+  # DEVOLVER A CONEXÃO AO POOL ANTES DE ESPERAR O HASH: UMA RAJADA DE LOGINS NÃO ESGOTA O POOL
+  # DO BANCO. AS COLUNAS JÁ CARREGADAS CONTINUAM ACESSÍVEIS NO OBJETO DESANEXADO
+  db.session.close()
   if not user or not user.check_password(password):
     return jsonify({"message": "Credenciais inválidas."}), 401
 
-  access = create_access_token(identity=str(user.id))
+  # REFAZER O HASH SE OS PARÂMETROS CONFIGURADOS MUDARAM (CALCULADO AINDA SEM CONEXÃO)
+  if user.password_needs_rehash():
+    user.set_password(password)
+    db.session.add(user)
+    db.session.commit()
+
+  access = create_access_token(identity=str(user.id), additional_claims=identity_claims(user))
   refresh = create_refresh_token(identity=str(user.id))
 
   return jsonify(
@@ -247,8 +341,49 @@ def change_password():
   return jsonify({"message": "Senha alterada com sucesso."}), 200
 
 
+@api_bp.route("/auth/account", methods=["DELETE"])
+@jwt_required()
+def delete_account():
+  """
+  SOLICITA A EXCLUSÃO DA CONTA E DE TODOS OS DADOS DO USUÁRIO.
+  A REMOÇÃO RODA EM SEGUNDO PLANO; O PROGRESSO FICA EM GET /api/auth/account/deletion.
+  """
+  user = _current_user()
+  data = _get_json()
+  senha = data.get("senha")
+
+  if not senha:
+    return jsonify({"message": "Senha é obrigatória."}), 400
+
+  if not user.check_password(senha):
+    return jsonify({"message": "Senha incorreta."}), 401
+
+  job = request_account_deletion(user.id)
+  if job.status == "pending":
+    start_account_deletion(job)
+
+  return jsonify({"message": "Exclusão da conta iniciada.", **deletion_progress(job)}), 202
+
+
+@api_bp.route("/auth/account/deletion", methods=["GET"])
+@jwt_required()
+def account_deletion_status():
+  # O USUÁRIO PODE JÁ TER SIDO REMOVIDO: USAR APENAS O ID DO TOKEN
+  user_id = _current_user().id
+  job = (
+    AccountDeletion.query.filter_by(user_id=user_id)
+    .order_by(AccountDeletion.id.desc())
+    .first()
+  )
+  if job is None:
+    return jsonify({"message": "Nenhuma exclusão de conta solicitada."}), 404
+
+  return jsonify(deletion_progress(job)), 200
+
+
 @api_bp.route("/routines", methods=["GET"])
 @jwt_required()
+@replica_read
 def list_routines():
   user = _current_user()
   
@@ -256,99 +391,26 @@ def list_routines():
   cache_key = f"routines:user:{user.id}"
   cached_routines = cache.get(cache_key)
   if cached_routines is not None:
-    return jsonify(cached_routines)
-  
-  # INCLUIR ROTINAS DO PRÓPRIO USUÁRIO
-  routines = list(user.routines)
-  
-  # SE FOR CUIDADOR, INCLUIR ROTINAS DA PESSOA COM TEA VINCULADA
-  if user.perfil and "cuidador" in user.perfil.lower():
-    accepted_links = CareLink.query.filter_by(
-      cuidador_id=user.id,
-      status="accepted"
-    ).all()
-    
-    for link in accepted_links:
-      pessoa_tea = User.query.get(link.pessoa_tea_id)
-      if pessoa_tea:
-        routines.extend(pessoa_tea.routines)
-  
-  # SE FOR PESSOA COM TEA, INCLUIR ROTINAS DO CUIDADOR VINCULADO
-  if user.perfil and "tea" in user.perfil.lower():
-    accepted_links = CareLink.query.filter_by(
-      pessoa_tea_id=user.id,
-      status="accepted"
-    ).all()
-    
-    for link in accepted_links:
-      cuidador = User.query.get(link.cuidador_id)
-      if cuidador:
-        routines.extend(cuidador.routines)
-  
-  # SE FOR PROFISSIONAL OU ADMINISTRADOR, INCLUIR ROTINAS COMPARTILHADAS
-  if _is_profissional_or_admin(user):
-    shares = Share.query.filter_by(viewer_id=user.id).all()
-    for share in shares:
-      # VERIFICAR SE HÁ NOTIFICAÇÃO PENDENTE PARA ESTE SHARE
-      # SE HOUVER, NÃO INCLUIR ROTINAS (AINDA NÃO FOI ACEITO)
-      try:
-        inspector = sqlalchemy_inspect(Notification)
-        has_share_id = 'share_id' in [col.name for col in inspector.columns]
-        
-        if has_share_id:
-          pending_notification = Notification.query.filter_by(
-            share_id=share.id,
-            tipo="share_request",
-            lida=False
-          ).first()
-          
-          if pending_notification:
-            continue  # PULAR SHARES PENDENTES
-      except Exception:
-        pass
-      
-      owner = User.query.get(share.owner_id)
-      if owner:
-        # INCLUIR ROTINAS DO OWNER
-        routines.extend(owner.routines)
-        
-        # SE O OWNER FOR CUIDADOR, INCLUIR ROTINAS DA PESSOA COM TEA VINCULADA
-        if owner.perfil and "cuidador" in owner.perfil.lower():
-          accepted_links = CareLink.query.filter_by(
-            cuidador_id=owner.id,
-            status="accepted"
-          ).all()
-          for link in accepted_links:
-            pessoa_tea = User.query.get(link.pessoa_tea_id)
-            if pessoa_tea:
-              routines.extend(pessoa_tea.routines)
-        
-        # SE O OWNER FOR PESSOA COM TEA, INCLUIR ROTINAS DO CUIDADOR VINCULADO
-        if owner.perfil and "tea" in owner.perfil.lower():
-          accepted_links = CareLink.query.filter_by(
-            pessoa_tea_id=owner.id,
-            status="accepted"
-          ).all()
-          for link in accepted_links:
-            cuidador = User.query.get(link.cuidador_id)
-            if cuidador:
-              routines.extend(cuidador.routines)
-  
-  # REMOVER DUPLICATAS MANTENDO A ORDEM
-  seen = set()
-  unique_routines = []
-  for routine in routines:
-    if routine.id not in seen:
-      seen.add(routine.id)
-      unique_routines.append(routine)
+    return cached_routines.to_response()
+  
+  # ROTINAS VISÍVEIS: PRÓPRIAS, DE VÍNCULOS ACEITOS E (PARA PROFISSIONAIS) DE SHARES ACEITOS
+  # E SEUS VÍNCULOS. NÚMERO DE CONSULTAS CONSTANTE, INDEPENDENTE DA QUANTIDADE DE PACIENTES
+  owner_ids = _visible_owner_ids(user)
+  unique_routines = (
+    Routine.query.options(selectinload(Routine.steps), selectinload(Routine.user))
+    .filter(Routine.user_id.in_(owner_ids))
+    .order_by(case((Routine.user_id == user.id, 0), else_=1), Routine.id)
+    .all()
+  )
   
   # SERIALIZAR ROTINAS
   routines_data = [_routine_to_dict(routine) for routine in unique_routines]
   
-  # ARMAZENAR NO CACHE (5 MINUTOS)
-  cache.set(cache_key, routines_data, ttl=300)
+  # ARMAZENAR NO CACHE JÁ SERIALIZADO (5 MINUTOS) - A COMPRESSÃO É FEITA UMA VEZ POR PREENCHIMENTO
+  body = EncodedBody.from_json(routines_data)
+  cache.set(cache_key, body, ttl=replica_cache_ttl(300))
   
-  return jsonify(routines_data)
+  return body.to_response()
 
 
 @api_bp.route("/routines", methods=["POST"])
@@ -371,7 +433,7 @@ def create_routine():
   routine_owner = user
   
   # Se for cuidador e especificou pessoa_tea_id, verificar vínculo
-  if pessoa_tea_id and user.perfil and "cuidador" in user.perfil.lower():
+  if pessoa_tea_id and _is_cuidador(user):
     link = CareLink.query.filter_by(
       cuidador_id=user.id,
       pessoa_tea_id=pessoa_tea_id,
@@ -385,7 +447,7 @@ def create_routine():
     else:
       return jsonify({"message": "Vínculo não encontrado ou não aceito."}), 403
 
-  routine = Routine(user=routine_owner, titulo=titulo, lembrete=lembrete)
+  routine = Routine(user_id=routine_owner.id, titulo=titulo, lembrete=lembrete)
   db.session.add(routine)
   db.session.commit()
 
@@ -634,8 +696,79 @@ def delete_routine_step(routine_id: int, step_id: int):
   return "", 204
 
 
+@api_bp.route("/routines/<int:routine_id>/steps", methods=["PUT"])
+@jwt_required()
+def replace_routine_steps(routine_id: int):
+  """
+  SUBSTITUI A LISTA COMPLETA DE STEPS DA ROTINA EM UMA ÚNICA TRANSAÇÃO.
+  CORPO: {"steps": [{"id": 1, "descricao": "...", "duracao": 5}, {"descricao": "novo"}]}
+  A ORDEM DA LISTA DEFINE "ordem"; STEPS COM id SÃO ATUALIZADOS, SEM id SÃO CRIADOS
+  E OS QUE NÃO APARECEREM NA LISTA SÃO REMOVIDOS.
+  """
+  user = _current_user()
+  routine = Routine.query.get_or_404(routine_id)
+
+  if not _can_edit_routine(user, routine):
+    return jsonify({"message": "Você não tem permissão para editar steps desta rotina."}), 403
+
+  data = _get_json()
+  steps_data = data.get("steps")
+  if not isinstance(steps_data, list):
+    return jsonify({"message": "steps deve ser uma lista."}), 400
+
+  existing_steps = {step.id: step for step in routine.steps}
+
+  # VALIDAR TUDO ANTES DE ALTERAR QUALQUER REGISTRO
+  kept_ids = set()
+  for item in steps_data:
+    if not isinstance(item, dict):
+      return jsonify({"message": "Cada step deve ser um objeto."}), 400
+    step_id = item.get("id")
+    if step_id is not None:
+      if step_id not in existing_steps:
+        return jsonify({"message": f"Step {step_id} não pertence a esta rotina."}), 400
+      if step_id in kept_ids:
+        return jsonify({"message": f"Step {step_id} repetido na lista."}), 400
+      kept_ids.add(step_id)
+    if "descricao" in item or step_id is None:
+      if not (item.get("descricao") or "").strip():
+        return jsonify({"message": "Descrição é obrigatória."}), 400
+
+  for ordem, item in enumerate(steps_data):
+    step_id = item.get("id")
+    if step_id is None:
+      db.session.add(
+        RoutineStep(
+          routine=routine,
+          descricao=item["descricao"].strip(),
+          duracao=item.get("duracao"),
+          ordem=ordem,
+        )
+      )
+      continue
+
+    step = existing_steps[step_id]
+    if "descricao" in item:
+      step.descricao = item["descricao"].strip()
+    if "duracao" in item:
+      step.duracao = item.get("duracao")
+    step.ordem = ordem
+
+  for step_id, step in existing_steps.items():
+    if step_id not in kept_ids:
+      db.session.delete(step)
+
+  db.session.commit()
+
+  # INVALIDAR CACHE DE ROTINAS UMA ÚNICA VEZ
+  cache.invalidate_pattern(f"routines:user:{routine.user_id}")
+
+  return jsonify(_routine_to_dict(routine))
+
+
 @api_bp.route("/entries", methods=["GET"])
 @jwt_required()
+@replica_read
 def list_entries():
   user = _current_user()
   tipo = request.args.get("tipo")
@@ -646,10 +779,8 @@ def list_entries():
   from_date = _parse_datetime(from_str) if from_str else None
   to_date = _parse_datetime(to_str) if to_str else None
 
-  entries = []
-  
   # SE CUIDADOR ESPECIFICOU PESSOA_TEA_ID, BUSCAR ENTRIES DA PESSOA COM TEA
-  if pessoa_tea_id and user.perfil and "cuidador" in user.perfil.lower():
+  if pessoa_tea_id and _is_cuidador(user):
     link = CareLink.query.filter_by(
       cuidador_id=user.id,
       pessoa_tea_id=pessoa_tea_id,
@@ -664,89 +795,25 @@ def list_entries():
       return jsonify({"message": "Pessoa com TEA não encontrada."}), 404
     
     query = Entry.query.filter_by(user_id=pessoa_tea.id)
-    if tipo:
-      query = query.filter_by(tipo=tipo)
-    if from_date:
-      query = query.filter(Entry.timestamp >= from_date)
-    if to_date:
-      query = query.filter(Entry.timestamp <= to_date)
-    entries = query.order_by(Entry.timestamp.desc()).all()
-  
-  # SE FOR PROFISSIONAL OU ADMINISTRADOR, BUSCAR ENTRIES COMPARTILHADOS
+  
+  # SE FOR PROFISSIONAL OU ADMINISTRADOR, BUSCAR ENTRIES COMPARTILHADOS: DONOS DOS SHARES
+  # E SEUS VÍNCULOS ACEITOS, EM UMA ÚNICA CONSULTA (O AUTOR DE CADA ENTRY VEM NO JOIN)
   elif _is_profissional_or_admin(user):
-    shares = Share.query.filter_by(viewer_id=user.id).all()
-    owner_ids = [share.owner_id for share in shares]
-    
-    for owner_id in owner_ids:
-      owner = User.query.get(owner_id)
-      if owner:
-        query = Entry.query.filter_by(user_id=owner.id)
-        if tipo:
-          query = query.filter_by(tipo=tipo)
-        if from_date:
-          query = query.filter(Entry.timestamp >= from_date)
-        if to_date:
-          query = query.filter(Entry.timestamp <= to_date)
-        owner_entries = query.order_by(Entry.timestamp.desc()).all()
-        entries.extend(owner_entries)
-        
-        # SE O OWNER FOR CUIDADOR, INCLUIR ENTRIES DA PESSOA COM TEA VINCULADA
-        if owner.perfil and "cuidador" in owner.perfil.lower():
-          accepted_links = CareLink.query.filter_by(
-            cuidador_id=owner.id,
-            status="accepted"
-          ).all()
-          for link in accepted_links:
-            pessoa_tea = User.query.get(link.pessoa_tea_id)
-            if pessoa_tea:
-              query = Entry.query.filter_by(user_id=pessoa_tea.id)
-              if tipo:
-                query = query.filter_by(tipo=tipo)
-              if from_date:
-                query = query.filter(Entry.timestamp >= from_date)
-              if to_date:
-                query = query.filter(Entry.timestamp <= to_date)
-              tea_entries = query.order_by(Entry.timestamp.desc()).all()
-              entries.extend(tea_entries)
-        
-        # SE O OWNER FOR PESSOA COM TEA, INCLUIR ENTRIES DO CUIDADOR VINCULADO
-        if owner.perfil and "tea" in owner.perfil.lower():
-          accepted_links = CareLink.query.filter_by(
-            pessoa_tea_id=owner.id,
-            status="accepted"
-          ).all()
-          for link in accepted_links:
-            cuidador = User.query.get(link.cuidador_id)
-            if cuidador:
-              query = Entry.query.filter_by(user_id=cuidador.id)
-              if tipo:
-                query = query.filter_by(tipo=tipo)
-              if from_date:
-                query = query.filter(Entry.timestamp >= from_date)
-              if to_date:
-                query = query.filter(Entry.timestamp <= to_date)
-              cuidador_entries = query.order_by(Entry.timestamp.desc()).all()
-              entries.extend(cuidador_entries)
-    
-    # REMOVER DUPLICATAS E ORDENAR
-    seen = set()
-    unique_entries = []
-    for entry in entries:
-      if entry.id not in seen:
-        seen.add(entry.id)
-        unique_entries.append(entry)
-    entries = sorted(unique_entries, key=lambda e: e.timestamp, reverse=True)
+    query = Entry.query.options(joinedload(Entry.user)).filter(
+      Entry.user_id.in_(_shared_owner_ids(user))
+    )
   
   else:
     # USUÁRIO NORMAL (PESSOA COM TEA OU CUIDADOR VENDO PRÓPRIO RELATÓRIO)
     query = Entry.query.filter_by(user_id=user.id)
-    if tipo:
-      query = query.filter_by(tipo=tipo)
-    if from_date:
-      query = query.filter(Entry.timestamp >= from_date)
-    if to_date:
-      query = query.filter(Entry.timestamp <= to_date)
-    entries = query.order_by(Entry.timestamp.desc()).all()
+
+  if tipo:
+    query = query.filter_by(tipo=tipo)
+  if from_date:
+    query = query.filter(Entry.timestamp >= from_date)
+  if to_date:
+    query = query.filter(Entry.timestamp <= to_date)
+  entries = query.order_by(Entry.timestamp.desc(), Entry.id.desc()).all()
 
   return jsonify([_entry_to_dict(entry) for entry in entries])
 
@@ -764,7 +831,7 @@ def create_entry():
     return jsonify({"message": "Tipo e texto são obrigatórios."}), 400
 
   entry = Entry(
-    user=user,
+    user_id=user.id,
     tipo=tipo,
     texto=texto,
     midia_url=data.get("midia_url"),
@@ -788,9 +855,15 @@ def create_entry():
 
 @api_bp.route("/boards", methods=["GET"])
 @jwt_required()
+@replica_read
 def list_boards():
   user = _current_user()
-  boards = Board.query.filter_by(user_id=user.id).all()
+  # CARREGAR OS ITENS DE TODOS OS BOARDS EM UMA ÚNICA CONSULTA (EVITA N+1)
+  boards = (
+    Board.query.options(selectinload(Board.items))
+    .filter_by(user_id=user.id)
+    .all()
+  )
   return jsonify([_board_to_dict(board) for board in boards])
 
 
@@ -803,7 +876,7 @@ def create_board():
   if not nome:
     return jsonify({"message": "Nome é obrigatório."}), 400
 
-  board = Board(user=user, nome=nome)
+  board = Board(user_id=user.id, nome=nome)
   db.session.add(board)
   db.session.commit()
 
@@ -838,6 +911,50 @@ def add_board_item(board_id: int):
   return jsonify(_board_item_to_dict(item)), 201
 
 
+@api_bp.route("/boards/<int:board_id>/items/bulk", methods=["POST"])
+@jwt_required()
+def add_board_items_bulk(board_id: int):
+  """
+  ADICIONA VÁRIOS ITENS AO BOARD EM UMA ÚNICA TRANSAÇÃO.
+  CORPO: {"items": [{"texto": "...", "emoji": "...", "categoria": "..."}, ...]}
+  """
+  user = _current_user()
+  board = Board.query.filter_by(id=board_id, user_id=user.id).first_or_404()
+  data = _get_json()
+  items_data = data.get("items")
+
+  if not isinstance(items_data, list) or not items_data:
+    return jsonify({"message": "items deve ser uma lista não vazia."}), 400
+
+  max_items = current_app.config.get("BOARD_ITEMS_BULK_MAX", 200)
+  if len(items_data) > max_items:
+    return jsonify({"message": f"Máximo de {max_items} itens por requisição."}), 400
+
+  # VALIDAR TODOS OS ITENS ANTES DE INSERIR
+  for item_data in items_data:
+    if not isinstance(item_data, dict) or not (item_data.get("texto") or "").strip():
+      return jsonify({"message": "Texto é obrigatório em todos os itens."}), 400
+
+  items = [
+    BoardItem(
+      board=board,
+      texto=item_data["texto"].strip(),
+      img_url=item_data.get("img_url"),
+      audio_url=item_data.get("audio_url"),
+      emoji=item_data.get("emoji") or None,
+      categoria=item_data.get("categoria") or None,
+    )
+    for item_data in items_data
+  ]
+  db.session.add_all(items)
+  db.session.flush()
+  # SERIALIZAR ANTES DO COMMIT: O COMMIT EXPIRA OS ITENS E CADA UM SERIA RECARREGADO (N+1)
+  payload = [_board_item_to_dict(item) for item in items]
+  db.session.commit()
+
+  return jsonify(payload), 201
+
+
 @api_bp.route("/boards/<int:board_id>/items/<int:item_id>", methods=["PUT"])
 @jwt_required()
 def update_board_item(board_id: int, item_id: int):
@@ -882,6 +999,7 @@ def delete_board_item(board_id: int, item_id: int):
 
 @api_bp.route("/reports/weekly", methods=["GET"])
 @jwt_required()
+@replica_read
 def weekly_report():
   user = _current_user()
   from_str = request.args.get("from")
@@ -898,7 +1016,7 @@ def weekly_report():
   report_user = user
   
   # SE FOR CUIDADOR E ESPECIFICOU PESSOA_TEA_ID, VERIFICAR VÍNCULO
-  if pessoa_tea_id and user.perfil and "cuidador" in user.perfil.lower():
+  if pessoa_tea_id and _is_cuidador(user):
     link = CareLink.query.filter_by(
       cuidador_id=user.id,
       pessoa_tea_id=pessoa_tea_id,
@@ -912,24 +1030,29 @@ def weekly_report():
     else:
       return jsonify({"message": "Vínculo não encontrado ou não aceito."}), 403
 
-  entries = (
-    Entry.query.filter_by(user_id=report_user.id)
-    .filter(Entry.timestamp >= start, Entry.timestamp <= end)
+  # SÓ AS CONTAGENS SÃO USADAS: AGREGAR NO BANCO EM VEZ DE CARREGAR OS REGISTROS E OS PASSOS
+  entry_counter = dict(
+    db.session.query(Entry.tipo, func.count(Entry.id))
+    .filter(Entry.user_id == report_user.id, Entry.timestamp >= start, Entry.timestamp <= end)
+    .group_by(Entry.tipo)
     .all()
   )
-
-  routines = Routine.query.filter_by(user_id=report_user.id).all()
-
-  entry_counter = Counter(entry.tipo for entry in entries)
+  routines_total, steps_total = (
+    db.session.query(func.count(distinct(Routine.id)), func.count(RoutineStep.id))
+    .select_from(Routine)
+    .outerjoin(RoutineStep, RoutineStep.routine_id == Routine.id)
+    .filter(Routine.user_id == report_user.id)
+    .one()
+  )
 
   payload = {
     "user_id": report_user.id,
     "user_name": report_user.nome_completo,
-    "interval": {"from": start.isoformat(), "to": end.isoformat()},
-    "entries_total": len(entries),
-    "entries_by_type": dict(entry_counter),
-    "routines_total": len(routines),
-    "steps_total": sum(len(routine.steps) for routine in routines),
+    "interval": {"from": start, "to": end},
+    "entries_total": sum(entry_counter.values()),
+    "entries_by_type": entry_counter,
+    "routines_total": routines_total,
+    "steps_total": steps_total,
   }
   return jsonify(payload)
 
@@ -968,7 +1091,7 @@ def create_share():
     return jsonify({"message": "Email não encontrado."}), 404
 
   # VERIFICAR SE O VIEWER É UM PROFISSIONAL OU ADMINISTRADOR
-  if not viewer.perfil or (not _is_profissional_or_admin(viewer)):
+  if not _is_profissional_or_admin(viewer):
     return jsonify({"message": "O email informado não pertence a um profissional ou administrador."}), 400
 
   # VERIFICAR SE JÁ EXISTE UM SHARE ATIVO
@@ -981,7 +1104,7 @@ def create_share():
     return jsonify({"message": "Compartilhamento já existe para este profissional."}), 400
 
   share = Share(
-    owner=owner,
+    owner_id=owner.id,
     viewer=viewer,
     viewer_email=viewer_email,
     escopo=escopo,
@@ -1001,13 +1124,14 @@ def create_share():
       "viewer_email": share.viewer_email,
       "viewer_id": share.viewer_id,
       "escopo": share.escopo,
-      "expira_em": share.expira_em.isoformat() if share.expira_em else None,
+      "expira_em": share.expira_em,
     }
   ), 201
 
 
 @api_bp.route("/shares", methods=["GET"])
 @jwt_required()
+@replica_read
 def list_shares():
   user = _current_user()
   
@@ -1015,26 +1139,20 @@ def list_shares():
   cache_key = f"shares:user:{user.id}"
   cached_shares = cache.get(cache_key)
   if cached_shares is not None:
-    return jsonify(cached_shares), 200
+    return cached_shares.to_response()
   
   # SE FOR PROFISSIONAL OU ADMINISTRADOR, RETORNAR SHARES RECEBIDOS (ONDE É VIEWER)
   # SE FOR CUIDADOR OU PESSOA COM TEA, RETORNAR SHARES CRIADOS (ONDE É OWNER)
   if _is_profissional_or_admin(user):
-    shares = Share.query.filter_by(viewer_id=user.id).all()
+    # SHARES PENDENTES (COM NOTIFICAÇÃO share_request NÃO LIDA) SÃO FILTRADOS NO BANCO
+    shares = (
+      Share.query.options(joinedload(Share.owner))
+      .filter(Share.viewer_id == user.id, ~_share_has_pending_request())
+      .all()
+    )
     result = []
     for share in shares:
-      # VERIFICAR SE HÁ NOTIFICAÇÃO PENDENTE PARA ESTE SHARE
-      # SE HOUVER, NÃO RETORNAR (AINDA NÃO FOI ACEITO)
-      pending_notification = Notification.query.filter_by(
-        share_id=share.id,
-        tipo="share_request",
-        lida=False
-      ).first()
-      
-      if pending_notification:
-        continue  # PULAR SHARES PENDENTES
-      
-      owner = User.query.get(share.owner_id)
+      owner = share.owner
       result.append({
         "id": share.id,
         "owner_id": share.owner_id,
@@ -1042,28 +1160,33 @@ def list_shares():
         "owner_email": owner.email if owner else None,
         "owner_perfil": owner.perfil if owner else None,
         "escopo": share.escopo,
-        "expira_em": share.expira_em.isoformat() if share.expira_em else None,
-        "created_at": share.created_at.isoformat(),
+        "expira_em": share.expira_em,
+        "created_at": share.created_at,
       })
   else:
-    shares = Share.query.filter_by(owner_id=user.id).all()
+    shares = (
+      Share.query.options(joinedload(Share.viewer))
+      .filter_by(owner_id=user.id)
+      .all()
+    )
     result = []
     for share in shares:
-      viewer = User.query.get(share.viewer_id) if share.viewer_id else None
+      viewer = share.viewer
       result.append({
         "id": share.id,
         "viewer_id": share.viewer_id,
         "viewer_email": share.viewer_email,
         "viewer_nome": viewer.nome_completo if viewer else None,
         "escopo": share.escopo,
-        "expira_em": share.expira_em.isoformat() if share.expira_em else None,
-        "created_at": share.created_at.isoformat(),
+        "expira_em": share.expira_em,
+        "created_at": share.created_at,
       })
   
-  # ARMAZENAR NO CACHE (5 MINUTOS)
-  cache.set(cache_key, result, ttl=300)
+  # ARMAZENAR NO CACHE JÁ SERIALIZADO (5 MINUTOS)
+  body = EncodedBody.from_json(result)
+  cache.set(cache_key, body, ttl=replica_cache_ttl(300))
   
-  return jsonify(result), 200
+  return body.to_response()
 
 
 @api_bp.route("/shares/request", methods=["POST"])
@@ -1080,7 +1203,7 @@ def request_share():
       return jsonify({"message": "owner_email é obrigatório."}), 400
     
     # VERIFICAR SE O USUÁRIO É UM PROFISSIONAL OU ADMINISTRADOR
-    if not viewer.perfil or (not _is_profissional_or_admin(viewer)):
+    if not _is_profissional_or_admin(viewer):
       return jsonify({"message": "Apenas profissionais podem solicitar acesso."}), 403
     
     # BUSCAR O OWNER PELO EMAIL
@@ -1089,8 +1212,7 @@ def request_share():
       return jsonify({"message": "Email não encontrado."}), 404
     
     # VERIFICAR SE O OWNER É CUIDADOR OU PESSOA COM TEA
-    owner_perfil = owner.perfil.lower() if owner.perfil else ""
-    if "cuidador" not in owner_perfil and "tea" not in owner_perfil:
+    if not (_is_cuidador(owner) or _is_pessoa_tea(owner)):
       return jsonify({"message": "O email informado não pertence a um cuidador ou pessoa com TEA."}), 400
     
     # VERIFICAR SE JÁ EXISTE UM SHARE ATIVO (JÁ ACEITO)
@@ -1103,47 +1225,35 @@ def request_share():
       # SHARE JÁ EXISTE, SIGNIFICA QUE JÁ FOI ACEITO
       return jsonify({"message": "Você já tem acesso aos relatórios e rotinas desta conta."}), 400
     
-    # VERIFICAR SE JÁ EXISTE UMA NOTIFICAÇÃO PENDENTE
-    existing_notification = Notification.query.filter_by(
-      user_id=owner.id,
-      tipo="share_request",
-      lida=False
-    ).all()
+    # VERIFICAR SE JÁ EXISTE UMA SOLICITAÇÃO PENDENTE (CONSULTA PELO ÍNDICE ÚNICO owner_id + viewer_id)
+    share_request = ShareRequest.query.filter_by(
+      owner_id=owner.id,
+      viewer_id=viewer.id
+    ).first()
     
-    # VERIFICAR SE ALGUMA NOTIFICAÇÃO PENDENTE É PARA ESTE PROFISSIONAL
-    for notif in existing_notification:
-      mensagem = notif.mensagem or ""
-      viewer_match = re.search(r'\|\|\|VIEWER_ID:(\d+)', mensagem)
-      if viewer_match and int(viewer_match.group(1)) == viewer.id:
-        return jsonify({"message": "Já existe uma solicitação pendente para este acesso."}), 400
-      # TAMBÉM VERIFICAR POR EMAIL
-      if viewer.email in mensagem:
-        return jsonify({"message": "Já existe uma solicitação pendente para este acesso."}), 400
+    if share_request and share_request.status == "pending":
+      return jsonify({"message": "Já existe uma solicitação pendente para este acesso."}), 400
     
     # NÃO CRIAR O SHARE AINDA - SÓ CRIAR QUANDO FOR ACEITO
-    # CRIAR APENAS A NOTIFICAÇÃO PARA O OWNER
-    # ARMAZENAR viewer_id E owner_id EM UM CAMPO SEPARADO (data JSON) OU NA MENSAGEM MAS OCULTO
-    # VAMOS USAR UM FORMATO QUE PODE SER EXTRAÍDO MAS NÃO É VISÍVEL NA UI
-    mensagem_visivel = f"{viewer.nome_completo} ({viewer.email}) deseja acessar seus relatórios e rotinas."
-    # ARMAZENAR IDs NO FINAL DA MENSAGEM COM UM SEPARADOR ESPECIAL QUE SERÁ REMOVIDO NA UI
-    mensagem_completa = f"{mensagem_visivel}|||VIEWER_ID:{viewer.id}|||OWNER_ID:{owner.id}"
-    
-    notification_data = {
-      "user_id": owner.id,
-      "tipo": "share_request",
-      "titulo": "Solicitação de acesso",
-      "mensagem": mensagem_completa,
-    }
+    # CRIAR A NOTIFICAÇÃO PARA O OWNER E REGISTRAR A SOLICITAÇÃO PENDENTE
+    notification = Notification(
+      user_id=owner.id,
+      tipo="share_request",
+      titulo="Solicitação de acesso",
+      mensagem=f"{viewer.nome_completo} ({viewer.email}) deseja acessar seus relatórios e rotinas.",
+    )
+    db.session.add(notification)
+    db.session.flush()
     
-    notification = Notification(**notification_data)
+    # UMA SOLICITAÇÃO REJEITADA ANTERIORMENTE É REAPROVEITADA (UMA LINHA POR PAR)
+    if share_request is None:
+      share_request = ShareRequest(owner_id=owner.id, viewer_id=viewer.id)
+      db.session.add(share_request)
+    share_request.status = "pending"
+    share_request.notification_id = notification.id
     
-    db.session.add(notification)
     db.session.commit()
     
-    # ARMAZENAR INFORMAÇÕES DO SHARE PENDENTE EM UM DICIONÁRIO TEMPORÁRIO
-    # OU MELHOR: CRIAR UMA TABELA DE SHARES PENDENTES OU USAR A MENSAGEM
-    # POR ENQUANTO, VAMOS ARMAZENAR viewer_id E owner_id NA MENSAGEM DE FORMA ESTRUTURADA
-    
     # INVALIDAR CACHE
     cache.invalidate_pattern(f"notifications:user:{owner.id}")
     
@@ -1153,6 +1263,10 @@ def request_share():
       "viewer_id": viewer.id,
       "owner_id": owner.id
     }), 201
+  except IntegrityError:
+    # OUTRA REQUISIÇÃO CRIOU A MESMA SOLICITAÇÃO AO MESMO TEMPO
+    db.session.rollback()
+    return jsonify({"message": "Já existe uma solicitação pendente para este acesso."}), 400
   except Exception as e:
     db.session.rollback()
     import traceback
@@ -1173,9 +1287,8 @@ def respond_share(share_id: int):
     data = _get_json()
     accept = data.get("accept", False)
     
-    # share_id AGORA É O ID DA NOTIFICAÇÃO, NÃO DO SHARE
+    # share_id É O ID DA NOTIFICAÇÃO, NÃO DO SHARE
     # O SHARE SÓ SERÁ CRIADO SE FOR ACEITO
-    # BUSCAR A NOTIFICAÇÃO PELO ID (QUE FOI PASSADO COMO share_id)
     notification = Notification.query.get(share_id)
     
     if not notification:
@@ -1189,161 +1302,89 @@ def respond_share(share_id: int):
     if notification.tipo != "share_request":
       return jsonify({"message": "Esta notificação não é uma solicitação de acesso."}), 400
     
-    # VERIFICAR SE JÁ FOI RESPONDIDA (VERIFICANDO SE EXISTE SHARE)
-    # EXTRAIR viewer_id DA MENSAGEM PARA VERIFICAR SE JÁ EXISTE SHARE
-    mensagem = notification.mensagem or ""
-    viewer_match = re.search(r'\|\|\|VIEWER_ID:(\d+)', mensagem)
-    viewer_id_from_notif = None
+    # BUSCAR A SOLICITAÇÃO ESTRUTURADA PELA NOTIFICAÇÃO (CONSULTA INDEXADA)
+    share_request = ShareRequest.query.filter_by(notification_id=notification.id).first()
+    if share_request is None:
+      return jsonify({"message": "Não foi possível identificar o profissional na solicitação."}), 400
     
-    if viewer_match:
-      viewer_id_from_notif = int(viewer_match.group(1))
-      # VERIFICAR SE JÁ EXISTE UM SHARE (FOI ACEITA)
-      existing_share = Share.query.filter_by(
-        owner_id=user.id,
-        viewer_id=viewer_id_from_notif
-      ).first()
-      if existing_share:
-        # SE EXISTE SHARE, SIGNIFICA QUE JÁ FOI ACEITA
-        # MARCAR NOTIFICAÇÃO COMO LIDA SE AINDA NÃO ESTIVER
-        if not notification.lida:
-          notification.lida = True
-          db.session.commit()
+    if share_request.status != "pending":
+      # JÁ RESPONDIDA: APENAS GARANTIR QUE A NOTIFICAÇÃO FIQUE COMO LIDA
+      if not notification.lida:
+        notification.lida = True
+        db.session.commit()
+      if share_request.status == "accepted":
         return jsonify({"message": "Esta solicitação já foi aceita anteriormente."}), 400
+      return jsonify({"message": "Esta solicitação já foi respondida."}), 400
     
+    viewer_id = share_request.viewer_id
+    owner_id = user.id
     
     if accept:
-      # ACEITAR: CRIAR O SHARE AGORA (NÃO EXISTIA ANTES)
-      # USAR O viewer_id JÁ EXTRAÍDO ANTERIORMENTE
-      viewer_id = viewer_id_from_notif
-      owner_id = user.id
-      
-      # SE NÃO CONSEGUIMOS EXTRAIR ANTES, TENTAR NOVAMENTE
-      if not viewer_id:
-        # FORMATO: "[VIEWER_ID:123][OWNER_ID:456]"
-        viewer_match = re.search(r'\[VIEWER_ID:(\d+)\]', mensagem)
-        if viewer_match:
-          viewer_id = int(viewer_match.group(1))
-        else:
-          # TENTAR BUSCAR POR EMAIL NA MENSAGEM
-          # A MENSAGEM TEM O FORMATO: "{nome} ({email}) deseja acessar..."
-          email_match = re.search(r'\(([^)]+@[^)]+)\)', mensagem)
-          if email_match:
-            viewer_email = email_match.group(1)
-            viewer_user = User.query.filter_by(email=viewer_email).first()
-            if viewer_user:
-              viewer_id = viewer_user.id
-      
-      if not viewer_id:
-        return jsonify({"message": "Não foi possível identificar o profissional na solicitação."}), 400
-      
-      # VERIFICAR SE JÁ EXISTE UM SHARE
-      existing_share = Share.query.filter_by(
+      # ACEITAR: CRIAR O SHARE AGORA (SE AINDA NÃO EXISTIR)
+      share = Share.query.filter_by(
         owner_id=owner_id,
         viewer_id=viewer_id
       ).first()
       
-      if existing_share:
-        # SHARE JÁ EXISTE, APENAS MARCAR NOTIFICAÇÃO COMO LIDA
-        notification.lida = True
-        db.session.commit()
-      else:
-        # CRIAR O SHARE AGORA QUE FOI ACEITO
+      if share is None:
         viewer_user = User.query.get(viewer_id)
         if not viewer_user:
           return jsonify({"message": "Profissional não encontrado."}), 404
         
-        new_share = Share(
+        share = Share(
           owner_id=owner_id,
           viewer_id=viewer_id,
           viewer_email=viewer_user.email,
           escopo="read",
           expira_em=None,
         )
-        db.session.add(new_share)
+        db.session.add(share)
         db.session.flush()
-        
-        # MARCAR NOTIFICAÇÃO COMO LIDA E VINCULAR AO SHARE
-        notification.lida = True
-        try:
-          inspector = sqlalchemy_inspect(Notification)
-          has_share_id = 'share_id' in [col.name for col in inspector.columns]
-          if has_share_id:
-            notification.share_id = new_share.id
-        except Exception:
-          pass
-        
-        db.session.commit()
-        
-        # CRIAR NOTIFICAÇÃO PARA O PROFISSIONAL
-        notification_data = {
-          "user_id": viewer_id,
-          "tipo": "share_accepted",
-          "titulo": "Acesso concedido",
-          "mensagem": f"{user.nome_completo} aceitou sua solicitação de acesso aos relatórios e rotinas.",
-        }
-        
-        try:
-          inspector = sqlalchemy_inspect(Notification)
-          has_share_id = 'share_id' in [col.name for col in inspector.columns]
-          if has_share_id:
-            notification_data["share_id"] = new_share.id
-        except Exception:
-          pass
-        
-        accept_notification = Notification(**notification_data)
-        db.session.add(accept_notification)
-        db.session.commit()
-        
-        # INVALIDAR CACHE
-        cache.invalidate_pattern(f"shares:user:{owner_id}")
-        cache.invalidate_pattern(f"shares:user:{viewer_id}")
-        cache.invalidate_pattern(f"notifications:user:{viewer_id}")
-        
-        return jsonify({
-          "message": "Solicitação aceita com sucesso. O profissional agora tem acesso aos seus relatórios e rotinas.",
-          "status": "accepted",
-          "share_id": new_share.id
-        }), 200
-    else:
-      # REJEITAR: APENAS MARCAR NOTIFICAÇÃO COMO LIDA (NÃO CRIAR SHARE)
-      # USAR O viewer_id JÁ EXTRAÍDO ANTERIORMENTE
-      viewer_id = viewer_id_from_notif
-      
-      # SE NÃO CONSEGUIMOS EXTRAIR ANTES, TENTAR NOVAMENTE
-      if not viewer_id:
-        viewer_match = re.search(r'\[VIEWER_ID:(\d+)\]', mensagem)
-        if viewer_match:
-          viewer_id = int(viewer_match.group(1))
-        else:
-          # TENTAR EXTRAIR EMAIL
-          email_match = re.search(r'\(([^)]+@[^)]+)\)', mensagem)
-          if email_match:
-            viewer_email = email_match.group(1)
-            viewer_user = User.query.filter_by(email=viewer_email).first()
-            if viewer_user:
-              viewer_id = viewer_user.id
       
+      # MARCAR NOTIFICAÇÃO COMO LIDA E VINCULAR AO SHARE
+      share_request.status = "accepted"
       notification.lida = True
-      db.session.commit()
+      notification.share_id = share.id
       
       # CRIAR NOTIFICAÇÃO PARA O PROFISSIONAL
-      if viewer_id:
-        reject_notification = Notification(
-          user_id=viewer_id,
-          tipo="share_rejected",
-          titulo="Acesso negado",
-          mensagem=f"{user.nome_completo} rejeitou sua solicitação de acesso aos relatórios e rotinas.",
-        )
-        db.session.add(reject_notification)
-        db.session.commit()
-        
-        # INVALIDAR CACHE
-        cache.invalidate_pattern(f"notifications:user:{viewer_id}")
+      db.session.add(Notification(
+        user_id=viewer_id,
+        tipo="share_accepted",
+        titulo="Acesso concedido",
+        mensagem=f"{user.nome_completo} aceitou sua solicitação de acesso aos relatórios e rotinas.",
+        share_id=share.id,
+      ))
+      db.session.commit()
+      
+      # INVALIDAR CACHE
+      cache.invalidate_pattern(f"shares:user:{owner_id}")
+      cache.invalidate_pattern(f"shares:user:{viewer_id}")
+      cache.invalidate_pattern(f"notifications:user:{viewer_id}")
       
       return jsonify({
-        "message": "Solicitação rejeitada.",
-        "status": "rejected"
+        "message": "Solicitação aceita com sucesso. O profissional agora tem acesso aos seus relatórios e rotinas.",
+        "status": "accepted",
+        "share_id": share.id
       }), 200
+    
+    # REJEITAR: APENAS MARCAR COMO LIDA (NÃO CRIAR SHARE) E AVISAR O PROFISSIONAL
+    share_request.status = "rejected"
+    notification.lida = True
+    db.session.add(Notification(
+      user_id=viewer_id,
+      tipo="share_rejected",
+      titulo="Acesso negado",
+      mensagem=f"{user.nome_completo} rejeitou sua solicitação de acesso aos relatórios e rotinas.",
+    ))
+    db.session.commit()
+    
+    # INVALIDAR CACHE
+    cache.invalidate_pattern(f"notifications:user:{viewer_id}")
+    
+    return jsonify({
+      "message": "Solicitação rejeitada.",
+      "status": "rejected"
+    }), 200
   except Exception as e:
     db.session.rollback()
     import traceback
@@ -1384,7 +1425,7 @@ def request_care_link():
   cuidador = _current_user()
   
   # VERIFICAR SE É CUIDADOR
-  if not cuidador.perfil or "cuidador" not in cuidador.perfil.lower():
+  if not _is_cuidador(cuidador):
     return jsonify({"message": "Apenas cuidadores podem solicitar vínculo."}), 403
   
   data = _get_json()
@@ -1399,7 +1440,7 @@ def request_care_link():
     return jsonify({"message": "Email não encontrado."}), 404
   
   # VERIFICAR SE É REALMENTE PESSOA COM TEA
-  if not pessoa_tea.perfil or "tea" not in pessoa_tea.perfil.lower():
+  if not _is_pessoa_tea(pessoa_tea):
     return jsonify({"message": "O email informado não pertence a uma Pessoa com TEA."}), 400
   
   # VERIFICAR SE JÁ EXISTE VÍNCULO
@@ -1544,6 +1585,7 @@ def delete_care_link(care_link_id: int):
 
 @api_bp.route("/care-links", methods=["GET"])
 @jwt_required()
+@replica_read
 def list_care_links():
   user = _current_user()
   
@@ -1551,66 +1593,58 @@ def list_care_links():
   cache_key = f"care_links:user:{user.id}"
   cached_links = cache.get(cache_key)
   if cached_links is not None:
-    return jsonify(cached_links), 200
+    return cached_links.to_response()
   
   # SE FOR CUIDADOR, RETORNAR VÍNCULOS ONDE É CUIDADOR
   # SE FOR PESSOA COM TEA, RETORNAR VÍNCULOS ONDE É PESSOA COM TEA
-  if user.perfil and "cuidador" in user.perfil.lower():
-    links = CareLink.query.filter_by(cuidador_id=user.id).all()
-  elif user.perfil and "tea" in user.perfil.lower():
-    links = CareLink.query.filter_by(pessoa_tea_id=user.id).all()
+  # O OUTRO LADO DE CADA VÍNCULO VEM NO JOIN (EVITA N+1)
+  if _is_cuidador(user):
+    links = CareLink.query.options(joinedload(CareLink.pessoa_tea)).filter_by(cuidador_id=user.id).all()
+  elif _is_pessoa_tea(user):
+    links = CareLink.query.options(joinedload(CareLink.cuidador)).filter_by(pessoa_tea_id=user.id).all()
   else:
     links = []
   
   result = []
   for link in links:
-    if user.perfil and "cuidador" in user.perfil.lower():
-      pessoa_tea = User.query.get(link.pessoa_tea_id)
+    if _is_cuidador(user):
+      pessoa_tea = link.pessoa_tea
       result.append({
         "id": link.id,
         "pessoa_tea_id": link.pessoa_tea_id,
         "pessoa_tea_nome": pessoa_tea.nome_completo if pessoa_tea else None,
         "pessoa_tea_email": pessoa_tea.email if pessoa_tea else None,
         "status": link.status,
-        "created_at": link.created_at.isoformat(),
+        "created_at": link.created_at,
       })
     else:
-      cuidador = User.query.get(link.cuidador_id)
+      cuidador = link.cuidador
       result.append({
         "id": link.id,
         "cuidador_id": link.cuidador_id,
         "cuidador_nome": cuidador.nome_completo if cuidador else None,
         "cuidador_email": cuidador.email if cuidador else None,
         "status": link.status,
-        "created_at": link.created_at.isoformat(),
+        "created_at": link.created_at,
       })
   
-  # ARMAZENAR NO CACHE (5 MINUTOS)
-  cache.set(cache_key, result, ttl=300)
+  # ARMAZENAR NO CACHE JÁ SERIALIZADO (5 MINUTOS)
+  body = EncodedBody.from_json(result)
+  cache.set(cache_key, body, ttl=replica_cache_ttl(300))
   
-  return jsonify(result), 200
+  return body.to_response()
 
 
 # ========== NOTIFICAÇÕES ==========
 
 @api_bp.route("/notifications", methods=["GET"])
 @jwt_required()
+@replica_read
 def list_notifications():
   user = _current_user()
   notifications = Notification.query.filter_by(user_id=user.id).order_by(Notification.created_at.desc()).all()
   
-  result = []
-  for notif in notifications:
-    result.append({
-      "id": notif.id,
-      "tipo": notif.tipo,
-      "titulo": notif.titulo,
-      "mensagem": notif.mensagem,
-      "lida": notif.lida,
-      "care_link_id": notif.care_link_id,
-      "share_id": notif.share_id,
-      "created_at": notif.created_at.isoformat(),
-    })
+  result = [notification_to_dict(notif) for notif in notifications]
   
   return jsonify(result), 200
 
@@ -1630,6 +1664,106 @@ def mark_notification_read(notification_id: int):
   return jsonify({"message": "Notificação marcada como lida."}), 200
 
 
+@api_bp.route("/notifications/read", methods=["PUT"])
+@jwt_required()
+def mark_notifications_read():
+  """
+  MARCA VÁRIAS NOTIFICAÇÕES COMO LIDAS EM UM ÚNICO UPDATE.
+  CORPO: {"ids": [1, 2, 3]} OU {"up_to_id": 42} (TODAS AS NOTIFICAÇÕES ATÉ ESSE ID).
+  """
+  user = _current_user()
+  data = _get_json()
+  ids = data.get("ids")
+  up_to_id = data.get("up_to_id")
+  
+  query = Notification.query.filter(
+    Notification.user_id == user.id,
+    Notification.lida.is_(False),
+  )
+  if ids is not None:
+    max_ids = current_app.config.get("NOTIFICATION_READ_MAX_IDS", 500)
+    # type() E NÃO isinstance(): bool É SUBCLASSE DE int E true MARCARIA A NOTIFICAÇÃO 1
+    if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+      return jsonify({"message": "ids deve ser uma lista de inteiros."}), 400
+    if len(ids) > max_ids:
+      return jsonify({"message": f"Máximo de {max_ids} ids por requisição."}), 400
+    query = query.filter(Notification.id.in_(ids))
+  elif up_to_id is not None:
+    if type(up_to_id) is not int:
+      return jsonify({"message": "up_to_id deve ser um inteiro."}), 400
+    query = query.filter(Notification.id <= up_to_id)
+  else:
+    return jsonify({"message": "Informe ids ou up_to_id."}), 400
+  
+  updated = query.update(
+    {Notification.lida: True, Notification.updated_at: datetime.utcnow()},
+    synchronize_session=False,
+  )
+  db.session.commit()
+  
+  return jsonify({"message": "Notificações marcadas como lidas.", "updated": updated}), 200
+
+
+@api_bp.route("/notifications/stream", methods=["GET"])
+@jwt_required(locations=["headers", "query_string"])
+def stream_notifications():
+  """
+  ENTREGA NOVAS NOTIFICAÇÕES EM TEMPO REAL (SERVER-SENT EVENTS).
+  EventSource NÃO ENVIA CABEÇALHOS, ENTÃO O TOKEN TAMBÉM É ACEITO EM ?jwt=.
+  AO RECONECTAR, O NAVEGADOR ENVIA Last-Event-ID E O QUE FOI PERDIDO VEM DO BANCO.
+  A CONEXÃO É ENCERRADA APÓS NOTIFICATION_STREAM_MAX_SECONDS E O CLIENTE RECONECTA.
+  """
+  user = _current_user()
+  config = current_app.config
+  heartbeat = config.get("NOTIFICATION_STREAM_HEARTBEAT", 15)
+  max_seconds = config.get("NOTIFICATION_STREAM_MAX_SECONDS", 300)
+  retry_ms = config.get("NOTIFICATION_STREAM_RETRY_MS", 3000)
+  
+  # ASSINAR ANTES DE LER O HISTÓRICO PARA NÃO PERDER EVENTOS ENTRE AS DUAS ETAPAS
+  subscription = get_broker().subscribe(user.id)
+  
+  backlog = []
+  cursor = parse_event_id(request.headers.get("Last-Event-ID") or request.args.get("last_event_id"))
+  if cursor is not None:
+    # O CURSOR SÓ TEM PRECISÃO DE SEGUNDO E O BANCO PODE TER ARREDONDADO updated_at PARA CIMA:
+    # REENVIAR TODO O SEGUNDO DO CURSOR (O CLIENTE ATUALIZA PELO ID) EM VEZ DE ARRISCAR PERDER
+    # NOTIFICAÇÕES GRAVADAS NELE
+    cursor_second, _ = cursor
+    missed = Notification.query.filter(
+      Notification.user_id == user.id,
+      Notification.updated_at >= cursor_second,
+    ).order_by(Notification.updated_at, Notification.id).limit(
+      config.get("NOTIFICATION_STREAM_RESUME_LIMIT", 100)
+    ).all()
+    backlog = [build_event(notif) for notif in missed]
+  
+  def generate():
+    # RODA DEPOIS QUE O CONTEXTO DA REQUISIÇÃO JÁ FOI ENCERRADO: NÃO SEGURA CONEXÃO COM O BANCO
+    try:
+      yield f"retry: {retry_ms}\n\n"
+      sent_ids = set()
+      for evt in backlog:
+        sent_ids.add(evt["id"])
+        yield format_sse(evt)
+      
+      deadline = time.monotonic() + max_seconds
+      while time.monotonic() < deadline:
+        evt = subscription.get(timeout=min(heartbeat, max(deadline - time.monotonic(), 0.01)))
+        if evt is None:
+          # COMENTÁRIO SSE: MANTÉM PROXIES E O CLIENTE CIENTES DE QUE A CONEXÃO ESTÁ VIVA
+          yield ": heartbeat\n\n"
+        elif evt["id"] not in sent_ids:
+          yield format_sse(evt)
+    finally:
+      subscription.close()
+  
+  return current_app.response_class(
+    generate(),
+    mimetype="text/event-stream",
+    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+  )
+
+
 @api_bp.route("/help-request", methods=["POST"])
 @jwt_required()
 def request_help():
@@ -1638,51 +1772,497 @@ def request_help():
   data = _get_json()
   
   # VERIFICAR SE O USUÁRIO É UMA PESSOA COM TEA
-  if not user.perfil or "tea" not in user.perfil.lower():
+  if not _is_pessoa_tea(user):
     return jsonify({"message": "Esta funcionalidade é apenas para Pessoa com TEA."}), 403
   
-  # BUSCAR CUIDADORES VINCULADOS (CARE LINKS ACEITOS)
-  care_links = CareLink.query.filter_by(
-    pessoa_tea_id=user.id,
-    status="accepted"
-  ).all()
-  
-  # BUSCAR PROFISSIONAIS VINCULADOS (SHARES ONDE O USUÁRIO É OWNER)
-  shares = Share.query.filter_by(owner_id=user.id).all()
-  
-  notifications_created = 0
-  
-  # CRIAR NOTIFICAÇÕES PARA CUIDADORES
-  for link in care_links:
-    cuidador = User.query.get(link.cuidador_id)
-    if cuidador:
-      notification = Notification(
-        user_id=cuidador.id,
-        tipo="help_request",
-        titulo=f"{user.nome_completo} precisa de ajuda",
-        mensagem=f"{user.nome_completo} está usando o botão de calma rápida e pode precisar de seu apoio.",
-      )
-      db.session.add(notification)
-      notifications_created += 1
-  
-  # CRIAR NOTIFICAÇÕES PARA PROFISSIONAIS
-  for share in shares:
-    if share.viewer_id:
-      profissional = User.query.get(share.viewer_id)
-      if profissional:
-        notification = Notification(
-          user_id=profissional.id,
-          tipo="help_request",
-          titulo=f"{user.nome_completo} precisa de ajuda",
-          mensagem=f"{user.nome_completo} está usando o botão de calma rápida e pode precisar de seu apoio.",
-        )
-        db.session.add(notification)
-        notifications_created += 1
+  # DESTINATÁRIOS EM UMA ÚNICA CONSULTA: CUIDADORES VINCULADOS (CARE LINKS ACEITOS)
+  # E PROFISSIONAIS VINCULADOS (SHARES ONDE O USUÁRIO É OWNER)
+  recipients_query = db.session.query(CareLink.cuidador_id.label("recipient_id")).filter(
+    CareLink.pessoa_tea_id == user.id,
+    CareLink.status == "accepted",
+  ).union(
+    db.session.query(Share.viewer_id).filter(
+      Share.owner_id == user.id,
+      Share.viewer_id.isnot(None),
+    )
+  )
+  recipient_ids = {row[0] for row in recipients_query}
+  
+  if not recipient_ids:
+    return jsonify({
+      "message": "Notificações enviadas com sucesso.",
+      "notifications_sent": 0,
+      "coalesced": 0,
+    }), 201
+  
+  # AGRUPAR TOQUES REPETIDOS: SE O DESTINATÁRIO AINDA TEM UM PEDIDO NÃO LIDO DESTE USUÁRIO
+  # DENTRO DA JANELA, APENAS INCREMENTAR O CONTADOR
+  now = datetime.utcnow()
+  window = timedelta(seconds=current_app.config.get("HELP_REQUEST_COALESCE_SECONDS", 120))
+  recent_filter = (
+    Notification.tipo == "help_request",
+    Notification.remetente_id == user.id,
+    Notification.lida.is_(False),
+    Notification.created_at >= now - window,
+    Notification.user_id.in_(recipient_ids),
+  )
+  coalesced_ids = {
+    row.user_id for row in db.session.query(Notification.user_id).filter(*recent_filter)
+  }
+  if coalesced_ids:
+    Notification.query.filter(*recent_filter).update(
+      {Notification.contador: Notification.contador + 1, Notification.updated_at: now},
+      synchronize_session=False,
+    )
+  
+  # CRIAR AS DEMAIS NOTIFICAÇÕES COM UM ÚNICO INSERT EM LOTE
+  new_recipient_ids = recipient_ids - coalesced_ids
+  if new_recipient_ids:
+    titulo = f"{user.nome_completo} precisa de ajuda"
+    mensagem = f"{user.nome_completo} está usando o botão de calma rápida e pode precisar de seu apoio."
+    db.session.execute(
+      insert(Notification),
+      [
+        {
+          "user_id": recipient_id,
+          "remetente_id": user.id,
+          "tipo": "help_request",
+          "titulo": titulo,
+          "mensagem": mensagem,
+          "created_at": now,
+          "updated_at": now,
+        }
+        for recipient_id in new_recipient_ids
+      ],
+    )
   
   db.session.commit()
   
+  # INSERT/UPDATE EM LOTE NÃO PASSAM PELO ORM: PUBLICAR EXPLICITAMENTE PARA O STREAM
+  # (O MESMO FILTRO DO AGRUPAMENTO COBRE AS LINHAS ATUALIZADAS E AS RECÉM-INSERIDAS, SEM DEPENDER
+  # DA PRECISÃO DE updated_at NO BANCO)
+  publish_notifications(Notification.query.filter(*recent_filter))
+  record_notifications("help_request", created=len(new_recipient_ids), coalesced=len(coalesced_ids))
+  
   return jsonify({
     "message": "Notificações enviadas com sucesso.",
-    "notifications_sent": notifications_created,
+    "notifications_sent": len(recipient_ids),
+    "coalesced": len(coalesced_ids),
   }), 201
 
+
+# ========== SINCRONIZAÇÃO INCREMENTAL ==========
+
+def _visible_owner_sets(user: User) -> tuple[set[int], set[int]]:
+  """
+  (DONOS DAS ROTINAS VISÍVEIS, DONOS DAS ENTRIES VISÍVEIS) PARA O USUÁRIO.
+  ROTINAS: ELE PRÓPRIO, VÍNCULOS ACEITOS NOS DOIS SENTIDOS E (PARA PROFISSIONAIS) OS DONOS
+  DE SHARES ACEITOS E SEUS VÍNCULOS. ENTRIES SEGUEM list_entries: O CUIDADOR VÊ O DIÁRIO
+  DAS PESSOAS COM TEA VINCULADAS, MAS A PESSOA COM TEA NÃO VÊ O DIÁRIO DO CUIDADOR.
+  """
+  routine_owner_ids = {user.id}
+  entry_owner_ids = {user.id}
+
+  if _is_cuidador(user):
+    pessoa_tea_ids = {
+      link.pessoa_tea_id
+      for link in CareLink.query.filter_by(cuidador_id=user.id, status="accepted").all()
+    }
+    routine_owner_ids.update(pessoa_tea_ids)
+    entry_owner_ids.update(pessoa_tea_ids)
+
+  if _is_pessoa_tea(user):
+    routine_owner_ids.update(
+      link.cuidador_id
+      for link in CareLink.query.filter_by(pessoa_tea_id=user.id, status="accepted").all()
+    )
+
+  if _is_profissional_or_admin(user):
+    shared_owner_ids = _shared_owner_ids(user)
+    routine_owner_ids.update(shared_owner_ids)
+    entry_owner_ids.update(shared_owner_ids)
+
+  return routine_owner_ids, entry_owner_ids
+
+
+def _visible_owner_ids(user: User) -> set[int]:
+  """RETORNA OS IDS DOS USUÁRIOS CUJAS ROTINAS SÃO VISÍVEIS PARA O USUÁRIO (VER _visible_owner_sets)."""
+  return _visible_owner_sets(user)[0]
+
+
+def _shared_owner_ids(user: User) -> set[int]:
+  """DONOS DOS SHARES ACEITOS RECEBIDOS PELO PROFISSIONAL MAIS OS VÍNCULOS ACEITOS DE CADA UM."""
+  share_owner_ids = {
+    row.owner_id
+    for row in db.session.query(Share.owner_id).filter(
+      Share.viewer_id == user.id,
+      ~_share_has_pending_request(),
+    )
+  }
+  return _with_linked_owner_ids(share_owner_ids)
+
+
+def _with_linked_owner_ids(share_owner_ids: set[int]) -> set[int]:
+  """
+  DONOS DE SHARES MAIS OS VÍNCULOS ACEITOS DE CADA UM (PESSOA COM TEA DO CUIDADOR
+  E CUIDADOR DA PESSOA COM TEA). DUAS CONSULTAS, INDEPENDENTE DO NÚMERO DE DONOS.
+  """
+  owner_ids = set(share_owner_ids)
+  if not share_owner_ids:
+    return owner_ids
+
+  # FILTRAR OS DONOS POR PAPEL DIRETO NO BANCO
+  cuidador_owner_ids = db.session.query(User.id).filter(
+    User.id.in_(share_owner_ids), User.has_role(ROLE_CUIDADOR)
+  )
+  tea_owner_ids = db.session.query(User.id).filter(
+    User.id.in_(share_owner_ids), User.has_role(ROLE_PESSOA_TEA)
+  )
+  owner_ids.update(
+    row.pessoa_tea_id
+    for row in db.session.query(CareLink.pessoa_tea_id).filter(
+      CareLink.cuidador_id.in_(cuidador_owner_ids),
+      CareLink.status == "accepted",
+    )
+  )
+  owner_ids.update(
+    row.cuidador_id
+    for row in db.session.query(CareLink.cuidador_id).filter(
+      CareLink.pessoa_tea_id.in_(tea_owner_ids),
+      CareLink.status == "accepted",
+    )
+  )
+  return owner_ids
+
+
+def _visible_owners_changed(user: User, owner_ids: set[int], since: datetime) -> bool:
+  """
+  INDICA SE OS CONJUNTOS DE _visible_owner_sets PODEM TER MUDADO DESDE since (UMA CONSULTA):
+  VÍNCULO RESPONDIDO OU REMOVIDO ENVOLVENDO UM DONO VISÍVEL, OU SHARE RECEBIDO CRIADO,
+  REMOVIDO OU COM A SOLICITAÇÃO DE ACESSO RESPONDIDA.
+  """
+  links_changed = db.session.query(CareLink.id).filter(
+    CareLink.updated_at >= since,
+    CareLink.status != "pending",
+    or_(CareLink.cuidador_id.in_(owner_ids), CareLink.pessoa_tea_id.in_(owner_ids)),
+  ).exists()
+  shares_changed = db.session.query(Share.id).filter(
+    Share.viewer_id == user.id,
+    Share.updated_at >= since,
+  ).exists()
+  share_requests_answered = db.session.query(Notification.id).join(
+    Share, Notification.share_id == Share.id
+  ).filter(
+    Share.viewer_id == user.id,
+    Notification.tipo == "share_request",
+    Notification.updated_at >= since,
+  ).exists()
+  # TOMBSTONES DE VÍNCULOS TÊM OS DOIS PARTICIPANTES; DE SHARES, O VIEWER (QUEM PERDE ACESSO)
+  removed = db.session.query(DeletionLog.id).filter(
+    DeletionLog.created_at >= since,
+    or_(
+      and_(DeletionLog.table_name == "care_links", DeletionLog.user_id.in_(owner_ids)),
+      and_(DeletionLog.table_name == "shares", DeletionLog.user_id == user.id),
+    ),
+  ).exists()
+  return db.session.query(or_(links_changed, shares_changed, share_requests_answered, removed)).scalar()
+
+
+@api_bp.route("/sync", methods=["GET"])
+@jwt_required()
+def sync_changes():
+  """
+  RETORNA APENAS O QUE MUDOU DESDE O TOKEN INFORMADO (?since=<token>).
+  SEM TOKEN, RETORNA O ESTADO COMPLETO. O CLIENTE DEVE ENVIAR O NOVO TOKEN NA PRÓXIMA CHAMADA.
+  O TOKEN TEM UMA MARGEM DE SEGURANÇA, ENTÃO REGISTROS PODEM SE REPETIR ENTRE CHAMADAS (UPSERT NO CLIENTE).
+  SEMPRE NO PRIMÁRIO: NA RÉPLICA, ESCRITAS AINDA NÃO REPLICADAS FICARIAM ANTES DO NOVO TOKEN E SE PERDERIAM.
+  """
+  user = _current_user()
+  since = _parse_datetime(request.args.get("since"))
+
+  # O NOVO TOKEN É CALCULADO ANTES DAS CONSULTAS PARA NÃO PERDER ESCRITAS CONCORRENTES
+  overlap = timedelta(seconds=current_app.config.get("SYNC_OVERLAP_SECONDS", 5))
+  next_token = (datetime.utcnow() - overlap).isoformat()
+
+  # TOKEN ANTERIOR AOS TOMBSTONES MAIS ANTIGOS AINDA GUARDADOS: EXCLUSÕES PODEM TER SIDO PERDIDAS,
+  # ENTÃO O CLIENTE RECEBE O ESTADO COMPLETO (since = null)
+  retention = timedelta(days=current_app.config.get("SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+  if since is not None and since < datetime.utcnow() - retention:
+    since = None
+
+  owner_ids, entry_owner_ids = _visible_owner_sets(user)
+
+  # VÍNCULO OU SHARE CRIADO, RESPONDIDO OU REMOVIDO: DONOS PODEM TER ENTRADO OU SAÍDO DO
+  # CONJUNTO VISÍVEL, E O DELTA NÃO TRARIA OS DADOS ANTIGOS DELES NEM AS REMOÇÕES. ESTADO COMPLETO
+  if since is not None and _visible_owners_changed(user, owner_ids, since):
+    since = None
+
+  def _changed(query, model):
+    if since is not None:
+      query = query.filter(model.updated_at >= since)
+    return query.all()
+
+  routines = _changed(Routine.query.filter(Routine.user_id.in_(owner_ids)), Routine)
+  steps = _changed(
+    RoutineStep.query.join(Routine).filter(Routine.user_id.in_(owner_ids)),
+    RoutineStep,
+  )
+  boards = _changed(Board.query.filter_by(user_id=user.id), Board)
+  board_items = _changed(BoardItem.query.join(Board).filter(Board.user_id == user.id), BoardItem)
+  entries = _changed(Entry.query.filter(Entry.user_id.in_(entry_owner_ids)), Entry)
+  notifications = _changed(Notification.query.filter_by(user_id=user.id), Notification)
+
+  user_names = {
+    u.id: u.nome_completo
+    for u in User.query.filter(User.id.in_(owner_ids)).all()
+  }
+
+  deleted = {
+    "routines": [],
+    "routine_steps": [],
+    "boards": [],
+    "board_items": [],
+    "entries": [],
+    "notifications": [],
+  }
+  if since is not None:
+    own_tables = ("boards", "board_items", "notifications")
+    tombstones = DeletionLog.query.filter(
+      DeletionLog.user_id.in_(owner_ids),
+      DeletionLog.created_at >= since,
+    ).all()
+    for tombstone in tombstones:
+      if tombstone.table_name not in deleted:
+        continue
+      if tombstone.table_name in own_tables and tombstone.user_id != user.id:
+        continue
+      if tombstone.table_name == "entries" and tombstone.user_id not in entry_owner_ids:
+        continue
+      deleted[tombstone.table_name].append(tombstone.record_id)
+
+  return jsonify({
+    "since": since,
+    "token": next_token,
+    "changes": {
+      "routines": [
+        {
+          "id": routine.id,
+          "user_id": routine.user_id,
+          "user_name": user_names.get(routine.user_id),
+          "titulo": routine.titulo,
+          "lembrete": routine.lembrete,
+          "created_at": routine.created_at,
+          "updated_at": routine.updated_at,
+        }
+        for routine in routines
+      ],
+      "routine_steps": [
+        {
+          "id": step.id,
+          "routine_id": step.routine_id,
+          "descricao": step.descricao,
+          "duracao": step.duracao,
+          "ordem": step.ordem,
+          "updated_at": step.updated_at,
+        }
+        for step in steps
+      ],
+      "boards": [
+        {
+          "id": board.id,
+          "nome": board.nome,
+          "created_at": board.created_at,
+          "updated_at": board.updated_at,
+        }
+        for board in boards
+      ],
+      "board_items": [
+        {**_board_item_to_dict(item), "board_id": item.board_id, "updated_at": item.updated_at}
+        for item in board_items
+      ],
+      "entries": [
+        {
+          "id": entry.id,
+          "user_id": entry.user_id,
+          "user_name": user_names.get(entry.user_id),
+          "tipo": entry.tipo,
+          "texto": entry.texto,
+          "midia_url": entry.midia_url,
+          "tags": entry.tags_list(),
+          "timestamp": entry.timestamp,
+          "updated_at": entry.updated_at,
+        }
+        for entry in entries
+      ],
+      "notifications": [
+        {**notification_to_dict(notif), "updated_at": notif.updated_at}
+        for notif in notifications
+      ],
+    },
+    "deleted": deleted,
+  }), 200
+
+
+# ========== REQUISIÇÕES EM LOTE ==========
+
+# ROTAS QUE NÃO PODEM SER ANINHADAS (RECURSÃO OU RESPOSTA EM STREAMING)
+_BATCH_EXCLUDED_PATHS = {"/api/batch", "/api/notifications/stream"}
+
+def _dispatch_batch_get(path: str, headers: dict) -> tuple[int, bytes]:
+  """
+  EXECUTA UM GET INTERNO NO MESMO CONTEXTO DE APLICAÇÃO (MESMO g E MESMA SESSÃO DO BANCO).
+  RETORNA O STATUS E O CORPO JSON JÁ SERIALIZADO.
+  """
+  app = current_app._get_current_object()
+  environ = EnvironBuilder(path=path, method="GET", headers=headers).get_environ()
+
+  with app.request_context(environ):
+    try:
+      response = app.make_response(app.dispatch_request())
+    except HTTPException as exc:
+      return exc.code or 500, app.json.dumps({"message": exc.description}).encode("utf-8")
+    except Exception as exc:
+      try:
+        response = app.make_response(app.handle_user_exception(exc))
+      except Exception:
+        db.session.rollback()
+        current_app.logger.exception("ERRO em sub-requisição de /batch: %s", path)
+        return 500, app.json.dumps({"message": "Erro interno."}).encode("utf-8")
+
+    if response.status_code == 204 or not response.get_data():
+      return response.status_code, b"null"
+    if not response.is_json:
+      return response.status_code, app.json.dumps(response.get_data(as_text=True)).encode("utf-8")
+    return response.status_code, response.get_data().strip()
+
+
+@api_bp.route("/batch", methods=["POST"])
+@jwt_required()
+def batch_requests():
+  """
+  EXECUTA VÁRIOS GETs DA API EM UMA ÚNICA CHAMADA HTTP.
+  CORPO: {"requests": [{"path": "/api/routines"}, {"path": "/api/boards"}]}
+  RESPOSTA: [{"path": ..., "status": ..., "body": ...}] NA MESMA ORDEM.
+  """
+  data = _get_json()
+  sub_requests = data.get("requests")
+
+  if not isinstance(sub_requests, list) or not sub_requests:
+    return jsonify({"message": "requests deve ser uma lista não vazia."}), 400
+
+  max_requests = current_app.config.get("BATCH_MAX_REQUESTS", 20)
+  if len(sub_requests) > max_requests:
+    return jsonify({"message": f"Máximo de {max_requests} requisições por lote."}), 400
+
+  # RESOLVER O USUÁRIO UMA ÚNICA VEZ; AS SUB-REQUISIÇÕES REUTILIZAM VIA g
+  _current_user()
+
+  headers = {"Authorization": request.headers.get("Authorization", "")}
+  parts = []
+  for item in sub_requests:
+    path = item.get("path") if isinstance(item, dict) else None
+    method = (item.get("method") or "GET").upper() if isinstance(item, dict) else "GET"
+
+    if not isinstance(path, str) or not path.startswith("/api/") or path.split("?", 1)[0].rstrip("/") in _BATCH_EXCLUDED_PATHS:
+      status, body = 400, current_app.json.dumps({"message": "path inválido."}).encode("utf-8")
+    elif method != "GET":
+      status, body = 405, current_app.json.dumps({"message": "Apenas GET é permitido em lote."}).encode("utf-8")
+    else:
+      status, body = _dispatch_batch_get(path, headers)
+
+    # MONTAR O ITEM SEM DESSERIALIZAR O CORPO JÁ CODIFICADO
+    prefix = current_app.json.dumps({"path": path, "status": status})[:-1]
+    parts.append(prefix.encode("utf-8") + b',"body":' + body + b"}")
+
+  return current_app.response_class(b"[" + b",".join(parts) + b"]\n", mimetype="application/json")
+
+
+# ========== ADMINISTRAÇÃO ==========
+
+@api_bp.route("/admin/db-pool", methods=["GET"])
+@jwt_required()
+def admin_db_pool():
+  """ESTADO DO POOL DE CONEXÕES DESTE WORKER (EM USO, LIVRES, OVERFLOW E ESPERA NO CHECKOUT)."""
+  if not _is_admin(_current_user()):
+    return jsonify({"message": "Apenas administradores."}), 403
+
+  return jsonify(pool_status(db.engine)), 200
+
+
+def _memory_report_args() -> tuple[int, str]:
+  top = min(request.args.get("top", 20, type=int) or 20, 100)
+  group_by = request.args.get("group_by", "lineno")
+  if group_by not in ("lineno", "filename", "traceback"):
+    raise ValueError("group_by deve ser lineno, filename ou traceback.")
+  return top, group_by
+
+
+@api_bp.route("/admin/memory", methods=["GET"])
+@jwt_required()
+def admin_memory_status():
+  """RSS, MEMÓRIA RASTREADA PELO tracemalloc, SNAPSHOTS GUARDADOS E CACHE POR NAMESPACE DESTE WORKER."""
+  if not _is_admin(_current_user()):
+    return jsonify({"message": "Apenas administradores."}), 403
+
+  return jsonify(memory.memory_status()), 200
+
+
+@api_bp.route("/admin/memory/snapshots", methods=["POST"])
+@jwt_required()
+def admin_memory_snapshot():
+  """TIRA UM SNAPSHOT (LIGANDO O tracemalloc NA PRIMEIRA VEZ) E RETORNA OS LOCAIS QUE MAIS ALOCARAM."""
+  if not _is_admin(_current_user()):
+    return jsonify({"message": "Apenas administradores."}), 403
+
+  top, group_by = _memory_report_args()
+  config = current_app.config
+  started = memory.start_tracing(config.get("MEMORY_TRACE_FRAMES", 1))
+  snapshot_id = memory.take_snapshot(config.get("MEMORY_SNAPSHOT_LIMIT", 5))
+  return jsonify({
+    "id": snapshot_id,
+    # COM O tracemalloc RECÉM-LIGADO, SÓ AS ALOCAÇÕES FEITAS A PARTIR DE AGORA APARECEM
+    "tracing_started": started,
+    "top": memory.top_sites(memory.get_snapshot(snapshot_id), top, group_by),
+    **memory.memory_status(),
+  }), 201
+
+
+@api_bp.route("/admin/memory/diff", methods=["GET"])
+@jwt_required()
+def admin_memory_diff():
+  """
+  CRESCIMENTO ENTRE DOIS SNAPSHOTS: ?from=<id>&to=<id>.
+  SEM "to", UM NOVO SNAPSHOT É TIRADO AGORA E COMPARADO COM "from".
+  """
+  if not _is_admin(_current_user()):
+    return jsonify({"message": "Apenas administradores."}), 403
+
+  top, group_by = _memory_report_args()
+  from_id = request.args.get("from", type=int)
+  to_id = request.args.get("to", type=int)
+  older = memory.get_snapshot(from_id) if from_id is not None else None
+  if older is None:
+    return jsonify({"message": "Snapshot inicial (from) não encontrado."}), 404
+  if to_id is None:
+    to_id = memory.take_snapshot(current_app.config.get("MEMORY_SNAPSHOT_LIMIT", 5))
+  newer = memory.get_snapshot(to_id)
+  if newer is None:
+    return jsonify({"message": "Snapshot final (to) não encontrado."}), 404
+
+  return jsonify({
+    "from": from_id,
+    "to": to_id,
+    "diff": memory.diff_sites(older, newer, top, group_by),
+    **memory.memory_status(),
+  }), 200
+
+
+@api_bp.route("/admin/memory/snapshots", methods=["DELETE"])
+@jwt_required()
+def admin_memory_stop():
+  """DESLIGA O tracemalloc E DESCARTA OS SNAPSHOTS DESTE WORKER."""
+  if not _is_admin(_current_user()):
+    return jsonify({"message": "Apenas administradores."}), 403
+
+  memory.stop_tracing()
+  return jsonify(memory.memory_status()), 200
@@ -1,6 +1,7 @@
 """
 SEED PARA CRIAR DADOS INICIAIS NO BANCO DE DADOS.
-CRIA O USUÁRIO ADMIN AUTOMATICAMENTE SE NÃO EXISTIR.
+CRIA O USUÁRIO ADMIN SE NÃO EXISTIR. EXECUTADO POR `flask seed` E `flask init-db`
+(VER backend/commands.py), NUNCA NA SUBIDA DA APLICAÇÃO.
 """
 from .extensions import db
 from .models import User
@@ -36,14 +37,3 @@ def seed_admin_user() -> None:
     else:
         print(f"ℹ️  USUÁRIO ADMIN JÁ EXISTE: {admin_email}")
 
-
-def init_seed(app) -> None:
-    """
-    INICIALIZA OS SEEDS DO BANCO DE DADOS.
-    DEVE SER CHAMADO APÓS O APP SER CRIADO E AS TABELAS ESTAREM PRONTAS.
-    """
-    try:
-        seed_admin_user()
-    except Exception as e:
-        print(f"❌ ERRO AO EXECUTAR SEED: {e}")
-
@@ -0,0 +1,382 @@
+"""
+GERADOR DE DADOS SINTÉTICOS PARA TESTES DE CARGA E DE ESCALA (flask seed-synthetic).
+
+CRIA PESSOAS COM TEA, CUIDADORES E PROFISSIONAIS COM VÍNCULOS, SHARES, ROTINAS,
+PRANCHAS, ANOS DE REGISTROS DE DIÁRIO E NOTIFICAÇÕES. A SAÍDA É DETERMINÍSTICA
+PARA A MESMA SEMENTE, OS MESMOS PARÂMETROS E A MESMA DATA FINAL.
+
+AS LINHAS SÃO GRAVADAS COM INSERT EM LOTE DO CORE (executemany), UMA TRANSAÇÃO
+POR LOTE, E COM IDS EXPLÍCITOS A PARTIR DO MAIOR ID DE CADA TABELA, ENTÃO NÃO É
+PRECISO RELER OS IDS GERADOS. NÃO RODAR COM A APLICAÇÃO ESCREVENDO NO MESMO BANCO.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import func, select
+
+from .extensions import db
+from .models import (
+    Board,
+    BoardItem,
+    CareLink,
+    Entry,
+    Notification,
+    Routine,
+    RoutineStep,
+    Share,
+    ShareRequest,
+    User,
+    role_flags_from_perfil,
+)
+from .passwords import hash_password
+
+PERFIL_PESSOA_TEA = "Pessoa com TEA"
+PERFIL_CUIDADOR = "Cuidador"
+PERFIL_PROFISSIONAL = "Profissional"
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Heitor", "Isabela", "João",
+    "Larissa", "Miguel", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Valentina", "Yuri",
+)
+LAST_NAMES = (
+    "Almeida", "Barbosa", "Cardoso", "Dias", "Esteves", "Ferreira", "Gomes", "Lima", "Martins", "Nunes",
+    "Oliveira", "Pereira", "Ribeiro", "Santos", "Teixeira", "Vieira",
+)
+
+# MESMAS OPÇÕES DA TELA DE DIÁRIO DO APLICATIVO
+MOODS = ("Muito feliz", "Feliz", "Neutro", "Triste", "Muito triste")
+SLEEP = ("Excelente", "Bom", "Regular", "Ruim")
+MEALS = ("Comeu bem", "Recusou o almoço", "Lanchou pouco", "Experimentou comida nova")
+
+ROUTINE_TITLES = ("Rotina da manhã", "Hora do banho", "Ir para a escola", "Hora de dormir", "Terapia", "Lição de casa")
+STEP_DESCRIPTIONS = (
+    "Escovar os dentes", "Trocar de roupa", "Tomar café", "Arrumar a mochila", "Calçar os sapatos",
+    "Lavar as mãos", "Guardar os brinquedos", "Vestir o pijama", "Ler uma história", "Apagar a luz",
+)
+BOARD_NAMES = ("Comunicação básica", "Sentimentos", "Comidas", "Escola", "Lugares")
+BOARD_ITEMS = (
+    ("Água", "💧", "necessidades"), ("Banheiro", "🚽", "necessidades"), ("Comer", "🍽️", "necessidades"),
+    ("Feliz", "😊", "sentimentos"), ("Triste", "😔", "sentimentos"), ("Bravo", "😠", "sentimentos"),
+    ("Brincar", "🧸", "atividades"), ("Desenhar", "🖍️", "atividades"), ("Parque", "🌳", "lugares"),
+    ("Casa", "🏠", "lugares"), ("Sim", "👍", "respostas"), ("Não", "👎", "respostas"),
+)
+
+
+def _next_id(model) -> int:
+    return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _spread(rng: random.Random, mean: float) -> int:
+    """QUANTIDADE ALEATÓRIA ENTRE 0 E 2 x mean (MÉDIA mean)."""
+    if mean <= 0:
+        return 0
+    whole = int(mean)
+    return rng.randint(0, 2 * whole) if whole else int(rng.random() < mean)
+
+
+def _fan_out(rng: random.Random, mean: float) -> int:
+    """COMO _spread, MAS COM PELO MENOS 1."""
+    return max(1, _spread(rng, mean))
+
+
+class _BulkWriter:
+    """GRAVA LINHAS EM LOTES DE batch_size, UM COMMIT POR LOTE."""
+
+    def __init__(self, batch_size: int, progress: Optional[Callable[[str, int], None]] = None):
+        self.batch_size = batch_size
+        self.progress = progress
+        self.counts: dict[str, int] = {}
+
+    def write(self, model, rows: Iterable[dict[str, Any]]) -> int:
+        table = model.__table__
+        written = 0
+        batch: list[dict[str, Any]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                written += self._flush(table, batch)
+                batch = []
+        if batch:
+            written += self._flush(table, batch)
+        self.counts.setdefault(table.name, 0)
+        return written
+
+    def _flush(self, table, batch: list[dict[str, Any]]) -> int:
+        db.session.execute(table.insert(), batch)
+        db.session.commit()
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(batch)
+        if self.progress is not None:
+            self.progress(table.name, self.counts[table.name])
+        return len(batch)
+
+
+def generate_synthetic_dataset(
+    *,
+    seed: int = 42,
+    pessoas_tea: int = 1000,
+    cuidadores: int = 1000,
+    profissionais: int = 100,
+    cuidadores_por_pessoa: float = 2,
+    pacientes_por_profissional: float = 20,
+    rotinas_por_pessoa: float = 3,
+    passos_por_rotina: float = 5,
+    pranchas_por_pessoa: float = 2,
+    itens_por_prancha: float = 8,
+    dias: int = 730,
+    entradas_por_dia: float = 1.0,
+    notificacoes_por_usuario: float = 20,
+    end_date: Optional[datetime] = None,
+    email_domain: str = "synthetic.local",
+    password: str = "123456",
+    batch_size: int = 5000,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> dict[str, int]:
+    """
+    GERA A POPULAÇÃO E RETORNA O NÚMERO DE LINHAS INSERIDAS POR TABELA.
+    LANÇA ValueError SE JÁ EXISTIREM USUÁRIOS COM O DOMÍNIO INFORMADO.
+    """
+    suffix = f"@{email_domain}"
+    if db.session.query(User.id).filter(User.email.like(f"%{suffix}")).first() is not None:
+        raise ValueError(f"Já existem usuários {suffix}; use outro --email-domain ou um banco vazio.")
+
+    rng = random.Random(seed)
+    end = end_date or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=dias)
+    writer = _BulkWriter(batch_size, progress)
+
+    def random_moment(earliest: datetime = start) -> datetime:
+        span = max((end - earliest).total_seconds(), 1)
+        return earliest + timedelta(seconds=rng.uniform(0, span))
+
+    # ========== USUÁRIOS ==========
+    # UM ÚNICO HASH PARA TODOS: O CUSTO DO scrypt POR USUÁRIO DOMINARIA O TEMPO TOTAL
+    password_hash = hash_password(password)
+    first_user_id = _next_id(User)
+    pessoa_ids = list(range(first_user_id, first_user_id + pessoas_tea))
+    cuidador_start = first_user_id + pessoas_tea
+    cuidador_ids = list(range(cuidador_start, cuidador_start + cuidadores))
+    profissional_start = cuidador_start + cuidadores
+    profissional_ids = list(range(profissional_start, profissional_start + profissionais))
+    user_created: dict[int, datetime] = {}
+
+    def user_rows() -> Iterator[dict[str, Any]]:
+        groups = (
+            (pessoa_ids, PERFIL_PESSOA_TEA, "pessoa_tea"),
+            (cuidador_ids, PERFIL_CUIDADOR, "cuidador"),
+            (profissional_ids, PERFIL_PROFISSIONAL, "profissional"),
+        )
+        for ids, perfil, prefix in groups:
+            flags = role_flags_from_perfil(perfil)
+            for number, user_id in enumerate(ids, start=1):
+                # CONTAS CRIADAS ATÉ UM ANO ANTES DO PERÍODO: TODOS TÊM O HISTÓRICO COMPLETO
+                created = start - timedelta(seconds=rng.uniform(0, 365 * 86400))
+                user_created[user_id] = created
+                yield {
+                    "id": user_id,
+                    "email": f"{prefix}.{number}{suffix}",
+                    "password_hash": password_hash,
+                    "role": "viewer",
+                    "nome_completo": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    "perfil": perfil,
+                    "role_flags": flags,
+                    "preferencias_sensoriais": None,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+
+    writer.write(User, user_rows())
+
+    # ========== VÍNCULOS CUIDADOR <-> PESSOA COM TEA ==========
+    care_link_start = _next_id(CareLink)
+    care_links: list[dict[str, Any]] = []
+    if cuidador_ids:
+        for pessoa_id in pessoa_ids:
+            count = min(_fan_out(rng, cuidadores_por_pessoa), len(cuidador_ids))
+            for cuidador_id in rng.sample(cuidador_ids, count):
+                created = random_moment(max(user_created[pessoa_id], user_created[cuidador_id]))
+                care_links.append({
+                    "id": care_link_start + len(care_links),
+                    "cuidador_id": cuidador_id,
+                    "pessoa_tea_id": pessoa_id,
+                    "status": "accepted" if rng.random() < 0.9 else "pending",
+                    "created_at": created,
+                    "updated_at": created,
+                })
+    writer.write(CareLink, care_links)
+
+    # ========== SHARES (PROFISSIONAL ACOMPANHANDO PACIENTES) ==========
+    share_start = _next_id(Share)
+    request_start = _next_id(ShareRequest)
+    owner_pool = pessoa_ids + cuidador_ids
+    shares: list[dict[str, Any]] = []
+    share_requests: list[dict[str, Any]] = []
+    for number, viewer_id in enumerate(profissional_ids, start=1):
+        count = min(_fan_out(rng, pacientes_por_profissional), len(owner_pool))
+        for owner_id in rng.sample(owner_pool, count):
+            created = random_moment(max(user_created[owner_id], user_created[viewer_id]))
+            shares.append({
+                "id": share_start + len(shares),
+                "owner_id": owner_id,
+                "viewer_id": viewer_id,
+                "viewer_email": f"profissional.{number}{suffix}",
+                "escopo": "read",
+                "expira_em": None,
+                "created_at": created,
+                "updated_at": created,
+            })
+            share_requests.append({
+                "id": request_start + len(share_requests),
+                "owner_id": owner_id,
+                "viewer_id": viewer_id,
+                "status": "accepted",
+                "notification_id": None,
+                "created_at": created,
+                "updated_at": created,
+            })
+    writer.write(Share, shares)
+    writer.write(ShareRequest, share_requests)
+
+    # ========== ROTINAS E PASSOS ==========
+    routine_start = _next_id(Routine)
+    step_start = _next_id(RoutineStep)
+    routines: list[dict[str, Any]] = []
+    steps: list[dict[str, Any]] = []
+    for pessoa_id in pessoa_ids:
+        for titulo in rng.sample(ROUTINE_TITLES, min(_spread(rng, rotinas_por_pessoa), len(ROUTINE_TITLES))):
+            routine_id = routine_start + len(routines)
+            created = random_moment(user_created[pessoa_id])
+            routines.append({
+                "id": routine_id,
+                "user_id": pessoa_id,
+                "titulo": titulo,
+                "lembrete": f"{rng.randint(6, 21):02d}:{rng.choice((0, 15, 30, 45)):02d}",
+                "created_at": created,
+                "updated_at": created,
+            })
+            for ordem in range(_fan_out(rng, passos_por_rotina)):
+                steps.append({
+                    "id": step_start + len(steps),
+                    "routine_id": routine_id,
+                    "descricao": rng.choice(STEP_DESCRIPTIONS),
+                    "duracao": rng.choice((2, 5, 10, 15, 20, 30)),
+                    "ordem": ordem,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+    writer.write(Routine, routines)
+    writer.write(RoutineStep, steps)
+
+    # ========== PRANCHAS DE COMUNICAÇÃO ==========
+    board_start = _next_id(Board)
+    item_start = _next_id(BoardItem)
+    boards: list[dict[str, Any]] = []
+    items: list[dict[str, Any]] = []
+    for pessoa_id in pessoa_ids:
+        for nome in rng.sample(BOARD_NAMES, min(_spread(rng, pranchas_por_pessoa), len(BOARD_NAMES))):
+            board_id = board_start + len(boards)
+            created = random_moment(user_created[pessoa_id])
+            boards.append({"id": board_id, "user_id": pessoa_id, "nome": nome, "created_at": created, "updated_at": created})
+            for texto, emoji, categoria in rng.sample(BOARD_ITEMS, min(_fan_out(rng, itens_por_prancha), len(BOARD_ITEMS))):
+                items.append({
+                    "id": item_start + len(items),
+                    "board_id": board_id,
+                    "texto": texto,
+                    "img_url": None,
+                    "audio_url": None,
+                    "emoji": emoji,
+                    "categoria": categoria,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+    writer.write(Board, boards)
+    writer.write(BoardItem, items)
+
+    # ========== REGISTROS DO DIÁRIO (O GROSSO DOS DADOS; GERADOS SOB DEMANDA) ==========
+    entry_start = _next_id(Entry)
+
+    def entry_rows() -> Iterator[dict[str, Any]]:
+        next_id = entry_start
+        # PESSOAS COM TEA ESCREVEM NA TAXA INFORMADA; CUIDADORES NA METADE
+        authors = [(user_id, entradas_por_dia, False) for user_id in pessoa_ids]
+        authors += [(user_id, entradas_por_dia / 2, True) for user_id in cuidador_ids]
+        for user_id, rate, is_cuidador in authors:
+            day = start
+            while day < end:
+                for _ in range(_spread(rng, rate)):
+                    timestamp = day + timedelta(seconds=rng.randint(7 * 3600, 22 * 3600))
+                    humor, sono = rng.choice(MOODS), rng.choice(SLEEP)
+                    tags = {humor, sono}
+                    if rng.random() < 0.05:
+                        tags.add("crise")
+                    if is_cuidador:
+                        tags.add("cuidador")
+                    yield {
+                        "id": next_id,
+                        "user_id": user_id,
+                        "tipo": "diario",
+                        "texto": f"Humor: {humor}\nSono: {sono}\nAlimentação: {rng.choice(MEALS)}",
+                        "midia_url": None,
+                        "tags": ",".join(sorted(tags)),
+                        "timestamp": timestamp,
+                        "created_at": timestamp,
+                        "updated_at": timestamp,
+                    }
+                    next_id += 1
+                day += timedelta(days=1)
+
+    writer.write(Entry, entry_rows())
+
+    # ========== NOTIFICAÇÕES ==========
+    notification_start = _next_id(Notification)
+    links_by_cuidador: dict[int, list[dict[str, Any]]] = {}
+    for link in care_links:
+        links_by_cuidador.setdefault(link["cuidador_id"], []).append(link)
+    shares_by_viewer: dict[int, list[dict[str, Any]]] = {}
+    for share in shares:
+        shares_by_viewer.setdefault(share["viewer_id"], []).append(share)
+
+    def notification_rows() -> Iterator[dict[str, Any]]:
+        next_id = notification_start
+        for user_id in cuidador_ids + profissional_ids:
+            links = links_by_cuidador.get(user_id, [])
+            user_shares = shares_by_viewer.get(user_id, [])
+            for _ in range(_spread(rng, notificacoes_por_usuario)):
+                row = {
+                    "id": next_id,
+                    "user_id": user_id,
+                    "lida": rng.random() < 0.85,
+                    "care_link_id": None,
+                    "share_id": None,
+                    "remetente_id": None,
+                    "contador": 1,
+                }
+                if links:
+                    link = rng.choice(links)
+                    row.update(
+                        tipo="help_request",
+                        titulo="Pedido de ajuda",
+                        mensagem="Está usando o botão de calma rápida e pode precisar de seu apoio.",
+                        remetente_id=link["pessoa_tea_id"],
+                        contador=rng.choice((1, 1, 1, 2, 3)),
+                    )
+                    created = random_moment(link["created_at"])
+                elif user_shares:
+                    share = rng.choice(user_shares)
+                    row.update(
+                        tipo="share_accepted",
+                        titulo="Acesso aceito",
+                        mensagem="Sua solicitação de acesso foi aceita.",
+                        share_id=share["id"],
+                    )
+                    created = random_moment(share["created_at"])
+                else:
+                    continue
+                row["created_at"] = row["updated_at"] = created
+                yield row
+                next_id += 1
+
+    writer.write(Notification, notification_rows())
+    return writer.counts
@@ -0,0 +1 @@
+"""TESTES DO BACKEND. EXECUTE COM `python -m pytest backend/tests` NA RAIZ DO REPOSITÓRIO."""
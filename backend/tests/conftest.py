@@ -0,0 +1,44 @@
+import os
+
+# Config LÊ AS VARIÁVEIS OBRIGATÓRIAS NA IMPORTAÇÃO; OS TESTES USAM TestConfig
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-testing-only")
+
+import pytest  # noqa: E402
+
+from backend.app import create_app  # noqa: E402
+from backend.cache import cache  # noqa: E402
+from backend.config import TestConfig  # noqa: E402
+from backend.extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+    cache.clear()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def signup(client):
+    """CRIA UM USUÁRIO PELA API E RETORNA OS HEADERS DE AUTENTICAÇÃO DELE."""
+
+    def _signup(email: str, perfil: str, nome: str | None = None) -> dict:
+        response = client.post(
+            "/api/auth/signup",
+            json={"email": email, "senha": "123456", "nomeCompleto": nome or email.split("@")[0], "quemE": perfil},
+        )
+        assert response.status_code == 201, response.get_json()
+        return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+    return _signup
@@ -0,0 +1,148 @@
+"""EXCLUSÃO DE CONTA EM LOTES (backend/account_deletion.py)."""
+import pytest
+from sqlalchemy import func, or_, select
+
+from backend import account_deletion
+from backend.account_deletion import request_account_deletion, run_account_deletion
+from backend.extensions import db
+from backend.models import (
+    AccountDeletion,
+    Board,
+    BoardItem,
+    CareLink,
+    DeletionLog,
+    Entry,
+    Notification,
+    Routine,
+    RoutineStep,
+    Share,
+    ShareRequest,
+    User,
+)
+
+BATCH_SIZE = 2
+
+
+def _owned_counts(user_id: int) -> dict[str, int]:
+    """LINHAS QUE AINDA PERTENCEM AO USUÁRIO OU O ENVOLVEM, POR TABELA."""
+    routine_ids = select(Routine.id).where(Routine.user_id == user_id)
+    board_ids = select(Board.id).where(Board.user_id == user_id)
+    criteria = {
+        "routine_steps": (RoutineStep, RoutineStep.routine_id.in_(routine_ids)),
+        "routines": (Routine, Routine.user_id == user_id),
+        "board_items": (BoardItem, BoardItem.board_id.in_(board_ids)),
+        "boards": (Board, Board.user_id == user_id),
+        "entries": (Entry, Entry.user_id == user_id),
+        "notifications": (Notification, Notification.user_id == user_id),
+        "share_requests": (ShareRequest, or_(ShareRequest.owner_id == user_id, ShareRequest.viewer_id == user_id)),
+        "shares": (Share, or_(Share.owner_id == user_id, Share.viewer_id == user_id)),
+        "care_links": (CareLink, or_(CareLink.cuidador_id == user_id, CareLink.pessoa_tea_id == user_id)),
+    }
+    return {
+        table: db.session.execute(select(func.count()).select_from(model).where(criterion)).scalar_one()
+        for table, (model, criterion) in criteria.items()
+    }
+
+
+@pytest.fixture
+def account(app, client, signup):
+    """PESSOA COM TEA COM DADOS EM TODAS AS TABELAS, VINCULADA A UM CUIDADOR E A PROFISSIONAIS."""
+    tea = signup("tea@example.com", "Pessoa com TEA")
+    cuidador = signup("cuidador@example.com", "Cuidador")
+    signup("prof@example.com", "Profissional")
+    solicitante = signup("prof2@example.com", "Profissional")
+
+    response = client.post("/api/care-links/request", json={"pessoa_tea_email": "tea@example.com"}, headers=cuidador)
+    client.post(f"/api/care-links/{response.get_json()['care_link_id']}/respond", json={"accept": True}, headers=tea)
+    assert client.post("/api/shares", json={"viewer_email": "prof@example.com"}, headers=tea).status_code == 201
+    client.post("/api/shares/request", json={"owner_email": "tea@example.com"}, headers=solicitante)
+
+    for i in range(3):
+        routine_id = client.post("/api/routines", json={"titulo": f"rotina {i}"}, headers=tea).get_json()["id"]
+        for passo in ("a", "b"):
+            client.post(f"/api/routines/{routine_id}/steps", json={"descricao": passo}, headers=tea)
+    board_id = client.post("/api/boards", json={"nome": "prancha"}, headers=tea).get_json()["id"]
+    client.post(f"/api/boards/{board_id}/items/bulk", json={"items": [{"texto": f"item {i}"} for i in range(3)]}, headers=tea)
+    for i in range(5):
+        client.post("/api/entries", json={"tipo": "diario", "texto": f"entrada {i}"}, headers=tea)
+
+    with app.app_context():
+        users = {user.email: user.id for user in User.query.all()}
+        counts = _owned_counts(users["tea@example.com"])
+        assert all(counts.values()), counts
+        job_id = request_account_deletion(users["tea@example.com"]).id
+    return {"users": users, "counts": counts, "job_id": job_id}
+
+
+def _assert_account_removed(account):
+    users = account["users"]
+    tea_id = users["tea@example.com"]
+    job = db.session.get(AccountDeletion, account["job_id"])
+    assert (job.status, job.etapa, job.erro) == ("done", None, None)
+    assert job.total == sum(account["counts"].values()) + 1
+    assert job.removidos == job.total
+
+    assert db.session.get(User, tea_id) is None
+    assert set(_owned_counts(tea_id).values()) == {0}
+
+    tombstones = {
+        (row.table_name, row.user_id)
+        for row in DeletionLog.query.filter(DeletionLog.user_id != tea_id).all()
+    }
+    # OS VINCULADOS RECEBEM O TOMBSTONE DO VÍNCULO; DO SHARE, SÓ O VIEWER
+    assert ("care_links", users["cuidador@example.com"]) in tombstones
+    assert ("shares", users["prof@example.com"]) in tombstones
+    own = {
+        table: DeletionLog.query.filter_by(table_name=table, user_id=tea_id).count()
+        for table in ("routines", "routine_steps", "boards", "board_items", "entries")
+    }
+    assert own == {table: account["counts"][table] for table in own}
+
+
+def test_batched_deletion_removes_every_owned_row(app, account):
+    with app.app_context():
+        job = run_account_deletion(account["job_id"], batch_size=BATCH_SIZE)
+        assert job.status == "done"
+        _assert_account_removed(account)
+
+
+def test_failed_batch_keeps_progress_and_running_job_resumes(app, account, monkeypatch):
+    tombstones = account_deletion._tombstones
+    calls = []
+
+    def failing_tombstones(*args):
+        calls.append(args[0])
+        if len(calls) == 3:
+            raise RuntimeError("falha simulada")
+        return tombstones(*args)
+
+    monkeypatch.setattr(account_deletion, "_tombstones", failing_tombstones)
+    with app.app_context():
+        job = run_account_deletion(account["job_id"], batch_size=BATCH_SIZE)
+        assert job.status == "failed"
+        assert "falha simulada" in job.erro
+
+        # DOIS LOTES FORAM CONFIRMADOS; O TERCEIRO FOI DESFEITO POR INTEIRO
+        tea_id = account["users"]["tea@example.com"]
+        remaining = sum(_owned_counts(tea_id).values())
+        assert job.removidos == 2 * BATCH_SIZE
+        assert job.removidos == sum(account["counts"].values()) - remaining
+        assert db.session.get(User, tea_id) is not None
+
+        # UM JOB QUE FICOU running (EX.: PROCESSO REINICIADO) É RETOMADO DE ONDE PAROU
+        total = job.total
+        job.status = "running"
+        db.session.commit()
+        monkeypatch.setattr(account_deletion, "_tombstones", tombstones)
+        job = run_account_deletion(account["job_id"], batch_size=BATCH_SIZE)
+        assert job.total == total
+        _assert_account_removed(account)
+
+
+def test_finished_job_is_not_run_again(app, account):
+    with app.app_context():
+        run_account_deletion(account["job_id"], batch_size=BATCH_SIZE)
+        before = DeletionLog.query.count()
+        job = run_account_deletion(account["job_id"], batch_size=BATCH_SIZE)
+        assert job.status == "done"
+        assert DeletionLog.query.count() == before
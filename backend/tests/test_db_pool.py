@@ -0,0 +1,63 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import exc
+
+from backend.db_pool import InstrumentedQueuePool, pool_stats
+
+
+def _pool(**kwargs) -> InstrumentedQueuePool:
+    return InstrumentedQueuePool(lambda: sqlite3.connect(":memory:", check_same_thread=False), **kwargs)
+
+
+def test_concurrent_checkouts_count_each_overflow_connection_once():
+    pool = _pool(pool_size=2, max_overflow=6, timeout=5)
+    threads = 8
+    start = threading.Barrier(threads)
+    hold = threading.Event()
+    connections = []
+    lock = threading.Lock()
+
+    def checkout():
+        start.wait()
+        connection = pool.connect()
+        with lock:
+            connections.append(connection)
+        hold.wait()
+
+    pool_stats.reset()
+    workers = [threading.Thread(target=checkout) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    deadline = time.monotonic() + 5
+    while len(connections) < threads and time.monotonic() < deadline:
+        time.sleep(0.01)
+    snapshot = pool_stats.snapshot()
+    hold.set()
+    for worker in workers:
+        worker.join()
+    for connection in connections:
+        connection.close()
+
+    assert snapshot["checkouts"] == threads
+    assert snapshot["overflow_events"] == threads - 2
+
+
+def test_reused_connection_is_not_overflow():
+    pool = _pool(pool_size=1, max_overflow=1)
+    pool_stats.reset()
+    pool.connect().close()
+    pool.connect().close()
+    assert pool_stats.snapshot()["overflow_events"] == 0
+
+
+def test_timeout_is_recorded():
+    pool = _pool(pool_size=1, max_overflow=0, timeout=0.01)
+    pool_stats.reset()
+    held = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    held.close()
+    assert pool_stats.snapshot()["timeouts"] == 1
@@ -0,0 +1,29 @@
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app import create_app
+from backend.config import TestConfig
+from backend.metrics import _count_created_notifications, init_metrics
+
+
+def test_metrics_disabled_without_configuration():
+    app = Flask(__name__)
+    init_metrics(app)
+    assert app.test_client().get("/metrics").status_code == 404
+
+
+def test_metrics_token_and_session_listeners():
+    class MetricsConfig(TestConfig):
+        METRICS_ENABLED = True
+        METRICS_TOKEN = "segredo"
+
+    client = create_app(MetricsConfig).test_client()
+    create_app(MetricsConfig)
+    assert event.contains(Session, "after_commit", _count_created_notifications)
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer errado"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer segredo"})
+    assert response.status_code == 200
+    assert "# TYPE http_requests_total counter" in response.get_data(as_text=True)
@@ -0,0 +1,25 @@
+import pytest
+
+
+@pytest.fixture
+def tea_with_notification(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA")
+    cuidador = signup("cuidador@example.com", "Cuidador")
+    client.post("/api/care-links/request", json={"pessoa_tea_email": "tea@example.com"}, headers=cuidador)
+    notifications = client.get("/api/notifications", headers=tea).get_json()
+    assert len(notifications) == 1
+    return tea, notifications[0]["id"]
+
+
+@pytest.mark.parametrize("body", [{"ids": [True]}, {"ids": [1, False]}, {"ids": ["1"]}, {"up_to_id": True}, {"up_to_id": 1.0}])
+def test_mark_read_rejects_non_integer_ids(client, tea_with_notification, body):
+    tea, _ = tea_with_notification
+    response = client.put("/api/notifications/read", json=body, headers=tea)
+    assert response.status_code == 400
+    assert [n["lida"] for n in client.get("/api/notifications", headers=tea).get_json()] == [False]
+
+
+def test_mark_read_by_ids(client, tea_with_notification):
+    tea, notification_id = tea_with_notification
+    response = client.put("/api/notifications/read", json={"ids": [notification_id]}, headers=tea)
+    assert response.get_json()["updated"] == 1
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from backend import models
+from backend.app import create_app
+from backend.config import TestConfig
+from backend.extensions import db
+from backend.models import User
+from backend.passwords import PasswordHashBusy, PasswordHasher, get_hasher, needs_rehash
+
+
+@pytest.mark.parametrize("method", ["scrypt", "scrypt:32768:8:1", "pbkdf2", "pbkdf2:sha256:600000"])
+def test_needs_rehash_accepts_short_method_names(method):
+    class Config(TestConfig):
+        PASSWORD_HASH_METHOD = method
+
+    with create_app(Config).app_context():
+        assert not needs_rehash(generate_password_hash("senha", method))
+        assert needs_rehash(generate_password_hash("senha", "scrypt:16384:8:1"))
+
+
+def test_timed_out_hash_keeps_its_slot_until_it_finishes():
+    hasher = PasswordHasher(workers=1, max_pending=1, timeout=0.05)
+    try:
+        with pytest.raises(PasswordHashBusy):
+            hasher.run(time.sleep, 0.5)
+        # O TRABALHO AINDA ESTÁ NO POOL: A VAGA NÃO PODE TER SIDO DEVOLVIDA
+        assert hasher.queue_depth == 1
+        with pytest.raises(PasswordHashBusy):
+            hasher.run(time.sleep, 0)
+
+        deadline = time.monotonic() + 5
+        while hasher.queue_depth and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert hasher.queue_depth == 0
+        assert hasher.run(len, "abc") == 3
+    finally:
+        hasher.shutdown()
+
+
+def test_login_releases_the_session_before_hashing(app, client, signup, monkeypatch):
+    signup("tea@example.com", "Pessoa com TEA")
+    seen = []
+
+    def verify(pwhash, password):
+        seen.append(db.session().in_transaction())
+        return check_password_hash(pwhash, password)
+
+    monkeypatch.setattr(models, "verify_password", verify)
+    app.config["PASSWORD_HASH_METHOD"] = "scrypt:16384:8:1"
+    response = client.post("/api/auth/login", json={"email": "tea@example.com", "senha": "123456"})
+    assert response.status_code == 200
+    assert response.get_json()["user"]["email"] == "tea@example.com"
+    assert seen == [False]
+
+    # O HASH REFEITO COM O NOVO MÉTODO FOI GRAVADO
+    with app.app_context():
+        stored = User.query.filter_by(email="tea@example.com").one().password_hash
+    assert stored.startswith("scrypt:16384:8:1$")
+
+
+def test_hasher_stats_are_published_in_metrics():
+    class MetricsConfig(TestConfig):
+        METRICS_ENABLED = True
+        PASSWORD_HASH_WORKERS = 1
+        PASSWORD_HASH_MAX_PENDING = 1
+
+    app = create_app(MetricsConfig)
+    with app.app_context():
+        hasher = get_hasher()
+    hasher.rejected_total = 0
+    hasher._pending = 0
+    assert hasher._slots.acquire(blocking=False)
+    try:
+        with pytest.raises(PasswordHashBusy):
+            hasher.run(len, "abc")
+        hasher._pending = 1
+        text = app.test_client().get("/metrics").get_data(as_text=True)
+    finally:
+        hasher._pending = 0
+        hasher._slots.release()
+        hasher.shutdown()
+    assert "# TYPE password_hash_queue_depth gauge" in text
+    assert "password_hash_queue_depth 1" in text
+    assert "# TYPE password_hash_rejected_total counter" in text
+    assert "password_hash_rejected_total 1" in text
@@ -0,0 +1,38 @@
+"""ORÇAMENTO DE CONSULTAS SQL POR ENDPOINT (VER backend/benchmarks/query_budget.py)."""
+import pytest
+
+from backend.benchmarks.query_budget import BUDGETS, measure_all
+from backend.extensions import db
+from backend.request_timing import QueryCounter
+
+
+@pytest.fixture(scope="module")
+def measurements(tmp_path_factory):
+    # OS DOIS BANCOS SINTÉTICOS SÃO MONTADOS E MEDIDOS UMA ÚNICA VEZ PARA O MÓDULO
+    return measure_all(str(tmp_path_factory.mktemp("query_budget")), seed=42)
+
+
+def test_every_measured_endpoint_has_a_budget(measurements):
+    measured = set(measurements["pequeno"]) | set(measurements["grande"])
+    assert measured - set(BUDGETS) == set()
+
+
+@pytest.mark.parametrize("endpoint", sorted(BUDGETS))
+def test_query_budget(measurements, endpoint):
+    small, large = measurements["pequeno"], measurements["grande"]
+    assert endpoint in small and endpoint in large, f"{endpoint} não foi exercitado"
+
+    large_count, email, statements = large[endpoint]
+    detail = f"{endpoint} em nome de {email}:\n" + "\n".join(statements)
+    assert large_count <= small[endpoint][0], f"o número de consultas cresce com os dados\n{detail}"
+    assert large_count <= BUDGETS[endpoint], f"acima do orçamento de {BUDGETS[endpoint]}\n{detail}"
+
+
+def test_query_counter_counts_only_while_active(app):
+    with app.app_context():
+        with QueryCounter(db.engine) as counter:
+            db.session.execute(db.text("SELECT 1"))
+            db.session.execute(db.text("SELECT  2"))
+        db.session.execute(db.text("SELECT 3"))
+    assert counter.count == 2
+    assert counter.statements == ["SELECT 1", "SELECT 2"]
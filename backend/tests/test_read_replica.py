@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app import create_app
+from backend.cache import cache
+from backend.config import TestConfig
+from backend.extensions import db
+from backend.models import ReplicaFence
+from backend.request_timing import QueryCounter
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    class ReplicaConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_BINDS = {"replica": f"sqlite:///{tmp_path / 'replica.db'}"}
+        DB_REPLICA_MAX_LAG_SECONDS = 60
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        # O MESMO ESQUEMA NOS DOIS BANCOS, COMO NUMA RÉPLICA DE VERDADE
+        for engine in db.engines.values():
+            db.metadata.create_all(engine)
+    cache.clear()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    # init_app REGISTRA UM METADATA POR BIND NO db COMPARTILHADO; SEM REMOVÊ-LO O
+    # create_all() DOS TESTES SEGUINTES (SEM O BIND "replica") FALHA
+    db.metadatas.pop("replica", None)
+
+
+def _counters(app):
+    with app.app_context():
+        return QueryCounter(db.engines[None]), QueryCounter(db.engines["replica"])
+
+
+def _fence_queries(counter) -> int:
+    return sum("replica_fences" in statement for statement in counter.statements)
+
+
+def _age_fences(app):
+    with app.app_context():
+        db.session.execute(db.update(ReplicaFence).values(written_at=datetime.utcnow() - timedelta(hours=1)))
+        db.session.commit()
+    cache.clear()
+
+
+def test_recent_writer_reads_primary_without_querying_the_fence(replica_app):
+    client = replica_app.test_client()
+    response = client.post(
+        "/api/auth/signup",
+        json={"email": "a@a.com", "senha": "123456", "nomeCompleto": "A", "quemE": "Pessoa com TEA"},
+    )
+    headers = {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+    assert client.post("/api/entries", json={"tipo": "diario", "texto": "oi"}, headers=headers).status_code == 201
+
+    primary, replica = _counters(replica_app)
+    with primary, replica:
+        assert len(client.get("/api/entries", headers=headers).get_json()) == 1
+    # A CERCA GRAVADA POR ESTE PROCESSO ESTÁ NO CACHE: NENHUMA CONSULTA A replica_fences
+    assert _fence_queries(primary) == 0
+    assert replica.count == 0
+
+    # OUTRO WORKER (CACHE VAZIO) CONSULTA A CERCA UMA VEZ E PASSA A LEMBRAR DELA
+    cache.clear()
+    primary, replica = _counters(replica_app)
+    with primary, replica:
+        client.get("/api/entries", headers=headers)
+        client.get("/api/entries", headers=headers)
+    assert _fence_queries(primary) == 1
+    assert replica.count == 0
+
+
+def test_cached_replica_reads_do_not_touch_the_primary(replica_app):
+    client = replica_app.test_client()
+    response = client.post(
+        "/api/auth/signup",
+        json={"email": "a@a.com", "senha": "123456", "nomeCompleto": "A", "quemE": "Pessoa com TEA"},
+    )
+    headers = {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+    _age_fences(replica_app)
+
+    primary, replica = _counters(replica_app)
+    with primary, replica:
+        assert client.get("/api/routines", headers=headers).status_code == 200
+    assert _fence_queries(primary) == 1
+    assert replica.count > 0
+
+    primary, replica = _counters(replica_app)
+    with primary, replica:
+        assert client.get("/api/routines", headers=headers).status_code == 200
+    assert primary.count == 0
+    assert replica.count == 0
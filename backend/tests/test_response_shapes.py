@@ -0,0 +1,116 @@
+"""FORMATO DAS RESPOSTAS DE LISTAGEM/RELATÓRIO REESCRITAS PARA O ORÇAMENTO DE CONSULTAS."""
+
+
+def _create_entry(client, headers, tipo, texto, timestamp, tags=None):
+    response = client.post(
+        "/api/entries",
+        json={"tipo": tipo, "texto": texto, "timestamp": timestamp, "tags": tags or []},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.get_json()["id"]
+
+
+def _create_routine(client, headers, titulo, passos):
+    response = client.post("/api/routines", json={"titulo": titulo}, headers=headers)
+    assert response.status_code == 201
+    routine_id = response.get_json()["id"]
+    for descricao in passos:
+        response = client.post(f"/api/routines/{routine_id}/steps", json={"descricao": descricao}, headers=headers)
+        assert response.status_code == 201
+
+
+def _link(client, cuidador, pessoa_tea, pessoa_tea_email):
+    response = client.post("/api/care-links/request", json={"pessoa_tea_email": pessoa_tea_email}, headers=cuidador)
+    link_id = response.get_json()["care_link_id"]
+    response = client.post(f"/api/care-links/{link_id}/respond", json={"accept": True}, headers=pessoa_tea)
+    assert response.status_code == 200
+
+
+def test_weekly_report_shape(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA", "Ana")
+    cuidador = signup("cuidador@example.com", "Cuidador", "Bruno")
+    _link(client, cuidador, tea, "tea@example.com")
+
+    _create_entry(client, tea, "diario", "a", "2026-01-02T10:00:00")
+    _create_entry(client, tea, "diario", "b", "2026-01-03T10:00:00")
+    _create_entry(client, tea, "humor", "c", "2026-01-04T10:00:00")
+    _create_entry(client, tea, "humor", "fora do intervalo", "2025-12-01T10:00:00")
+    _create_routine(client, tea, "manhã", ["acordar", "escovar", "vestir"])
+    _create_routine(client, tea, "noite", ["jantar"])
+    _create_routine(client, tea, "vazia", [])
+
+    interval = "from=2026-01-01T00:00:00&to=2026-01-08T00:00:00"
+    own = client.get(f"/api/reports/weekly?{interval}", headers=tea)
+    assert own.status_code == 200
+    tea_id = own.get_json()["user_id"]
+    expected = {
+        "user_id": tea_id,
+        "user_name": "Ana",
+        "interval": {"from": "2026-01-01T00:00:00", "to": "2026-01-08T00:00:00"},
+        "entries_total": 3,
+        "entries_by_type": {"diario": 2, "humor": 1},
+        "routines_total": 3,
+        "steps_total": 4,
+    }
+    assert own.get_json() == expected
+
+    linked = client.get(f"/api/reports/weekly?{interval}&pessoa_tea_id={tea_id}", headers=cuidador)
+    assert linked.status_code == 200
+    assert linked.get_json() == expected
+
+
+def test_weekly_report_without_data(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA", "Ana")
+    body = client.get("/api/reports/weekly", headers=tea).get_json()
+    assert body["entries_total"] == 0
+    assert body["entries_by_type"] == {}
+    assert body["routines_total"] == 0
+    assert body["steps_total"] == 0
+    assert set(body["interval"]) == {"from", "to"}
+
+
+def test_list_entries_shape_and_order(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA", "Ana")
+    older = _create_entry(client, tea, "diario", "antes", "2026-01-02T10:00:00", ["a", "b"])
+    newer = _create_entry(client, tea, "humor", "depois", "2026-01-03T10:00:00")
+    same_time = _create_entry(client, tea, "diario", "mesmo horário", "2026-01-03T10:00:00")
+
+    response = client.get("/api/entries", headers=tea)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [entry["id"] for entry in body] == [same_time, newer, older]
+    assert body[-1] == {
+        "id": older,
+        "user_id": body[-1]["user_id"],
+        "user_name": "Ana",
+        "tipo": "diario",
+        "texto": "antes",
+        "midia_url": None,
+        "tags": ["a", "b"],
+        "timestamp": "2026-01-02T10:00:00",
+    }
+
+    filtered = client.get("/api/entries?tipo=humor", headers=tea).get_json()
+    assert [entry["id"] for entry in filtered] == [newer]
+
+
+def test_list_entries_for_profissional_includes_shared_and_linked_owners(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA", "Ana")
+    cuidador = signup("cuidador@example.com", "Cuidador", "Bruno")
+    outro = signup("outro@example.com", "Pessoa com TEA", "Carla")
+    profissional = signup("prof@example.com", "Profissional", "Dora")
+    _link(client, cuidador, tea, "tea@example.com")
+    response = client.post("/api/shares", json={"viewer_email": "prof@example.com"}, headers=tea)
+    assert response.status_code == 201
+
+    from_tea = _create_entry(client, tea, "diario", "da pessoa", "2026-01-02T10:00:00")
+    from_cuidador = _create_entry(client, cuidador, "diario", "do cuidador", "2026-01-03T10:00:00")
+    _create_entry(client, outro, "diario", "não compartilhado", "2026-01-04T10:00:00")
+    _create_entry(client, profissional, "diario", "do profissional", "2026-01-05T10:00:00")
+
+    body = client.get("/api/entries", headers=profissional).get_json()
+    assert [(entry["id"], entry["user_name"]) for entry in body] == [(from_cuidador, "Bruno"), (from_tea, "Ana")]
+
+    since = client.get("/api/entries?from=2026-01-03T00:00:00", headers=profissional).get_json()
+    assert [entry["id"] for entry in since] == [from_cuidador]
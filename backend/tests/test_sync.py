@@ -0,0 +1,114 @@
+"""SYNC INCREMENTAL QUANDO O CONJUNTO DE DONOS VISÍVEIS MUDA."""
+from datetime import datetime, timedelta
+
+from backend.extensions import db
+from backend.models import DeletionLog, Entry
+
+
+def _now_token() -> str:
+    # ANTES DE QUALQUER ESCRITA DO TESTE, COMO O TOKEN DE UM SYNC ANTERIOR
+    return (datetime.utcnow() - timedelta(milliseconds=1)).isoformat()
+
+
+def _sync(client, headers, since):
+    response = client.get("/api/sync", query_string={"since": since}, headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _link(client, cuidador, pessoa_tea, pessoa_tea_email):
+    response = client.post("/api/care-links/request", json={"pessoa_tea_email": pessoa_tea_email}, headers=cuidador)
+    link_id = response.get_json()["care_link_id"]
+    client.post(f"/api/care-links/{link_id}/respond", json={"accept": True}, headers=pessoa_tea)
+    return link_id
+
+
+def test_unchanged_visibility_keeps_incremental_sync(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA")
+    cuidador = signup("cuidador@example.com", "Cuidador")
+    _link(client, cuidador, tea, "tea@example.com")
+
+    since = _now_token()
+    client.post("/api/entries", json={"tipo": "diario", "texto": "nova"}, headers=tea)
+
+    body = _sync(client, cuidador, since)
+    assert body["since"] is not None
+    assert [entry["texto"] for entry in body["changes"]["entries"]] == ["nova"]
+
+
+def test_accepted_care_link_forces_full_sync(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA")
+    cuidador = signup("cuidador@example.com", "Cuidador")
+    client.post("/api/entries", json={"tipo": "diario", "texto": "antiga"}, headers=tea)
+
+    since = _now_token()
+    _link(client, cuidador, tea, "tea@example.com")
+
+    body = _sync(client, cuidador, since)
+    assert body["since"] is None
+    assert [entry["texto"] for entry in body["changes"]["entries"]] == ["antiga"]
+
+
+def test_removed_care_link_forces_full_sync_for_both_sides(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA")
+    cuidador = signup("cuidador@example.com", "Cuidador")
+    link_id = _link(client, cuidador, tea, "tea@example.com")
+    client.post("/api/entries", json={"tipo": "diario", "texto": "da pessoa"}, headers=tea)
+
+    since = _now_token()
+    assert client.delete(f"/api/care-links/{link_id}", headers=cuidador).status_code in (200, 204)
+
+    body = _sync(client, cuidador, since)
+    assert body["since"] is None
+    assert body["changes"]["entries"] == []
+    assert _sync(client, tea, since)["since"] is None
+
+
+def test_share_changes_force_full_sync_for_viewer(client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA")
+    profissional = signup("prof@example.com", "Profissional")
+    client.post("/api/entries", json={"tipo": "diario", "texto": "compartilhada"}, headers=tea)
+
+    since = _now_token()
+    response = client.post("/api/shares", json={"viewer_email": "prof@example.com"}, headers=tea)
+    share_id = response.get_json()["id"]
+    body = _sync(client, profissional, since)
+    assert body["since"] is None
+    assert [entry["texto"] for entry in body["changes"]["entries"]] == ["compartilhada"]
+
+    since = _now_token()
+    assert client.delete(f"/api/shares/{share_id}", headers=tea).status_code == 204
+    body = _sync(client, profissional, since)
+    assert body["since"] is None
+    assert body["changes"]["entries"] == []
+    # O DONO CONTINUA VENDO OS MESMOS DADOS: SEGUE INCREMENTAL
+    assert _sync(client, tea, since)["since"] is not None
+
+
+def test_pessoa_tea_never_receives_cuidador_entries(app, client, signup):
+    tea = signup("tea@example.com", "Pessoa com TEA")
+    cuidador = signup("cuidador@example.com", "Cuidador")
+    _link(client, cuidador, tea, "tea@example.com")
+    since = _now_token()
+    response = client.post("/api/entries", json={"tipo": "diario", "texto": "privado do cuidador"}, headers=cuidador)
+    entry_id = response.get_json()["id"]
+    client.post("/api/routines", json={"titulo": "rotina do cuidador"}, headers=cuidador)
+
+    assert client.get("/api/entries", headers=tea).get_json() == []
+    for token in (None, since):
+        body = _sync(client, tea, token)
+        assert body["changes"]["entries"] == []
+        # ROTINAS CONTINUAM COMPARTILHADAS NOS DOIS SENTIDOS
+        assert [routine["titulo"] for routine in body["changes"]["routines"]] == ["rotina do cuidador"]
+
+    # ENTRIES SÓ SÃO REMOVIDAS COM A CONTA; O TOMBSTONE DO CUIDADOR NÃO VAI PARA A PESSOA COM TEA
+    with app.app_context():
+        cuidador_id = db.session.get(Entry, entry_id).user_id
+        db.session.add(DeletionLog(table_name="entries", record_id=entry_id, user_id=cuidador_id))
+        db.session.commit()
+    assert _sync(client, tea, since)["deleted"]["entries"] == []
+    assert _sync(client, cuidador, since)["deleted"]["entries"] == [entry_id]
+    # O CUIDADOR CONTINUA RECEBENDO O DIÁRIO DA PESSOA COM TEA VINCULADA
+    client.post("/api/entries", json={"tipo": "diario", "texto": "da pessoa"}, headers=tea)
+    entries = _sync(client, cuidador, since)["changes"]["entries"]
+    assert {entry["texto"] for entry in entries} == {"da pessoa", "privado do cuidador"}
@@ -0,0 +1,18 @@
+"""
+PONTO DE ENTRADA WSGI PARA PRODUÇÃO:
+
+    gunicorn -k gthread --workers 2 --threads 16 'backend.wsgi:app'
+
+USE WORKERS COM THREADS (gthread) OU ASSÍNCRONOS (gevent): CADA CONEXÃO DE
+GET /api/notifications/stream OCUPA UMA THREAD POR ATÉ NOTIFICATION_STREAM_MAX_SECONDS.
+COM O WORKER sync PADRÃO DO GUNICORN, POUCAS ABAS ABERTAS BLOQUEIAM A API INTEIRA.
+AS THREADS PRECISAM CABER NO POOL DO BANCO (DB_POOL_SIZE + DB_MAX_OVERFLOW POR WORKER),
+O QUE NÃO É PROBLEMA PARA O STREAM: ELE SÓ USA O BANCO AO RECONECTAR.
+
+SÓ CRIA A APLICAÇÃO (VER create_app): O SCHEMA E O USUÁRIO ADMIN SÃO CRIADOS UMA VEZ
+POR DEPLOY COM `flask db upgrade` E `flask seed` (OU `flask init-db` EM AMBIENTES SEM
+MIGRAÇÕES, EX.: DEV/SQLITE), NUNCA EM CADA WORKER.
+"""
+from .app import create_app
+
+app = create_app()